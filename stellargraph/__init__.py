@@ -16,6 +16,7 @@
 
 
 __all__ = [
+    "analytics",
     "data",
     "datasets",
     "calibration",
@@ -37,6 +38,7 @@ from .version import __version__
 
 # Import modules
 from stellargraph import (
+    analytics,
     data,
     calibration,
     datasets,
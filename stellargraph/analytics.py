@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Graph analytics, like PageRank and clustering coefficients, computed with vectorized NumPy and
+SciPy sparse operations directly on a :class:`.StellarGraph`.
+
+Each function returns a NumPy array with one element per node, in the order of the :ref:`node
+ilocs <iloc-explanation>`, so that the results can be used as node features (for instance, with
+:func:`as_node_features`).
+"""
+
+__all__ = [
+    "pagerank",
+    "core_number",
+    "triangles",
+    "clustering",
+    "bfs_distances",
+    "weighted_degree",
+    "as_node_features",
+]
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sps
+
+from .core.graph import StellarGraph
+
+# the number of rows of the adjacency matrix to multiply at once when counting triangles, to bound
+# the memory used for the intermediate product
+_TRIANGLE_CHUNK_ROWS = 4096
+
+
+def _check_graph(graph):
+    if not isinstance(graph, StellarGraph):
+        raise TypeError(f"graph: expected StellarGraph, found {type(graph).__name__}")
+
+
+def _simple_undirected(graph):
+    # the adjacency matrix of the graph ignoring direction, multiple edges, weights and self loops,
+    # as used for the structural measures (as in NetworkX)
+    adj = graph._adjacency_matrix()
+    if graph.is_directed():
+        adj = adj + adj.T
+
+    coo = adj.tocoo()
+    keep = coo.row != coo.col
+    return sps.csr_matrix(
+        (np.ones(keep.sum(), dtype=np.int64), (coo.row[keep], coo.col[keep])),
+        shape=adj.shape,
+    )
+
+
+def _neighbours(adj, nodes):
+    # the (concatenated) neighbours of each of `nodes` in the CSR matrix `adj`
+    starts = adj.indptr[nodes]
+    counts = adj.indptr[nodes + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    return adj.indices[np.arange(counts.sum()) + np.repeat(starts - offsets, counts)]
+
+
+def pagerank(graph, damping=0.85, weighted=False, tol=1e-6, max_iter=100):
+    """
+    Compute the PageRank of each node, by power iteration.
+
+    This matches :func:`networkx.pagerank`: the edges of directed graphs are followed from source
+    to target, and the rank of nodes without any outgoing edges is spread uniformly over every
+    node.
+
+    Args:
+        graph (StellarGraph): the graph
+        damping (float): the probability of following an edge, rather than jumping to a random
+            node
+        weighted (bool): if True, follow edges in proportion to their weights
+        tol (float): the convergence tolerance, per node
+        max_iter (int): the maximum number of iterations
+
+    Returns:
+        A NumPy array of the PageRank of each node, that sums to 1.
+    """
+    _check_graph(graph)
+    if not 0 <= damping <= 1:
+        raise ValueError(f"damping: expected a value in [0, 1], found {damping}")
+
+    num_nodes = graph.number_of_nodes()
+    if num_nodes == 0:
+        return np.array([], dtype=np.float64)
+
+    adj = graph._adjacency_matrix(weighted=weighted).astype(np.float64)
+    out_weight = np.asarray(adj.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+
+    # the transition matrix, transposed so that one step is a matrix-vector product
+    inv_out_weight = np.divide(
+        1.0, out_weight, out=np.zeros_like(out_weight), where=~dangling
+    )
+    transition = (sps.diags(inv_out_weight) @ adj).T.tocsr()
+
+    ranks = np.full(num_nodes, 1 / num_nodes)
+    for _ in range(max_iter):
+        previous = ranks
+        ranks = damping * (transition @ previous + previous[dangling].sum() / num_nodes)
+        ranks += (1 - damping) / num_nodes
+
+        if np.abs(ranks - previous).sum() < num_nodes * tol:
+            break
+
+    return ranks
+
+
+def core_number(graph):
+    """
+    Compute the core number of each node: the largest ``k`` such that the node is in the
+    ``k``-core, the largest subgraph where every node has degree at least ``k``.
+
+    Edges are treated as undirected, and multiple edges and self loops are ignored.
+
+    Args:
+        graph (StellarGraph): the graph
+
+    Returns:
+        A NumPy array of the core number of each node.
+    """
+    _check_graph(graph)
+    adj = _simple_undirected(graph)
+    num_nodes = adj.shape[0]
+
+    degrees = np.diff(adj.indptr)
+    cores = np.zeros(num_nodes, dtype=np.int64)
+    remaining = np.ones(num_nodes, dtype=bool)
+
+    k = 0
+    while remaining.any():
+        k = max(k, degrees[remaining].min())
+
+        # repeatedly remove every node with at most k remaining neighbours, only rechecking the
+        # neighbours of the removed nodes
+        peel = np.flatnonzero(remaining & (degrees <= k))
+        while len(peel) > 0:
+            cores[peel] = k
+            remaining[peel] = False
+
+            neighbours, counts = np.unique(_neighbours(adj, peel), return_counts=True)
+            degrees[neighbours] -= counts
+
+            peel = neighbours[remaining[neighbours] & (degrees[neighbours] <= k)]
+
+    return cores
+
+
+def triangles(graph):
+    """
+    Compute the number of triangles that include each node.
+
+    Edges are treated as undirected, and multiple edges and self loops are ignored.
+
+    Args:
+        graph (StellarGraph): the graph
+
+    Returns:
+        A NumPy array of the number of triangles including each node.
+    """
+    _check_graph(graph)
+    return _triangles(_simple_undirected(graph))
+
+
+def _triangles(adj):
+    num_nodes = adj.shape[0]
+
+    # the number of paths of length 2 between two neighbours (i.e. (A @ A) * A), summed for each
+    # node, counts each triangle twice
+    counts = np.zeros(num_nodes, dtype=np.int64)
+    for start in range(0, num_nodes, _TRIANGLE_CHUNK_ROWS):
+        rows = adj[start : start + _TRIANGLE_CHUNK_ROWS]
+        closed = (rows @ adj).multiply(rows)
+        counts[start : start + _TRIANGLE_CHUNK_ROWS] = np.asarray(
+            closed.sum(axis=1)
+        ).ravel()
+
+    return counts // 2
+
+
+def clustering(graph):
+    """
+    Compute the local clustering coefficient of each node: the fraction of the pairs of its
+    neighbours that are connected.
+
+    Edges are treated as undirected, and multiple edges and self loops are ignored. Nodes with
+    fewer than 2 neighbours have a coefficient of 0.
+
+    Args:
+        graph (StellarGraph): the graph
+
+    Returns:
+        A NumPy array of the clustering coefficient of each node.
+    """
+    _check_graph(graph)
+    adj = _simple_undirected(graph)
+    tris = _triangles(adj)
+    degrees = np.diff(adj.indptr)
+    pairs = degrees * (degrees - 1) / 2
+    return np.divide(tris, pairs, out=np.zeros(len(tris)), where=pairs > 0)
+
+
+def bfs_distances(graph, sources, use_ilocs=False):
+    """
+    Compute the number of edges on the shortest path from each of some source nodes to every node.
+
+    Edges of directed graphs are followed from source to target.
+
+    Args:
+        graph (StellarGraph): the graph
+        sources (iterable): the IDs of the nodes to start from
+        use_ilocs (bool): if True, ``sources`` are :ref:`node ilocs <iloc-explanation>`
+
+    Returns:
+        A NumPy array of shape ``(len(sources), number_of_nodes)``, where element ``[i, j]`` is the
+        distance from ``sources[i]`` to the node with iloc ``j``, or ``inf`` if it is unreachable.
+    """
+    _check_graph(graph)
+    if use_ilocs:
+        source_ilocs = np.asarray(sources)
+    else:
+        source_ilocs = graph.node_ids_to_ilocs(sources)
+
+    # scipy's graph algorithms require writeable arrays, unlike the shared cached matrix
+    adj = graph._adjacency_matrix().copy()
+    return sps.csgraph.shortest_path(
+        adj,
+        method="D",
+        directed=graph.is_directed(),
+        unweighted=True,
+        indices=source_ilocs,
+    ).reshape(len(source_ilocs), adj.shape[0])
+
+
+def weighted_degree(graph, direction="both"):
+    """
+    Compute the total weight of the edges of each node.
+
+    Args:
+        graph (StellarGraph): the graph
+        direction (str): for directed graphs, which edges to include: ``"in"``, ``"out"`` or
+            ``"both"``
+
+    Returns:
+        A NumPy array of the weighted degree of each node.
+    """
+    _check_graph(graph)
+    return graph.node_degree_array(direction=direction, weighted=True)
+
+
+def as_node_features(graph, **columns):
+    """
+    Collect some per-node values (such as those computed by the other functions in this module)
+    into a DataFrame indexed by node ID, suitable for use as node features in a
+    :class:`.StellarGraph`.
+
+    Args:
+        graph (StellarGraph): the graph that the values were computed on
+        columns: a NumPy array for each column, with one element per node in the order of the
+            :ref:`node ilocs <iloc-explanation>`
+
+    Returns:
+        A Pandas DataFrame with one row per node and one column per keyword argument.
+    """
+    _check_graph(graph)
+    num_nodes = graph.number_of_nodes()
+    for name, values in columns.items():
+        if len(values) != num_nodes:
+            raise ValueError(
+                f"{name}: expected one value per node ({num_nodes}), found {len(values)}"
+            )
+
+    return pd.DataFrame(columns, index=graph.nodes())
@@ -19,5 +19,6 @@ This contains the core objects used by the StellarGraph library.
 
 """
 
+from .feature_store import *
 from .graph import *
 from .schema import *
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A memory-bounded cache of the (possibly normalized) adjacency matrices of a graph.
+"""
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import scipy.sparse as sps
+
+from .utils import normalize_adj
+
+# the default maximum total size of the matrices stored in each cache
+DEFAULT_MAX_BYTES = 2 ** 30
+
+AdjacencyCacheInfo = namedtuple(
+    "AdjacencyCacheInfo", ["hits", "misses", "keys", "nbytes", "max_bytes"]
+)
+AdjacencyCacheInfo.__doc__ = """
+Statistics about an adjacency matrix cache.
+
+Attributes:
+    hits (int): the number of requests for a matrix that was already stored
+    misses (int): the number of requests for a matrix that had to be computed
+    keys (list of tuple): the ``(weighted, edge_type, normalization)`` keys of the stored
+        matrices, from least to most recently used
+    nbytes (int): the total size of the stored matrices, in bytes
+    max_bytes (int): the maximum total size of the stored matrices, in bytes
+"""
+
+
+def _add_self_loops(adj):
+    # this ensures every node has exactly one self loop, with weight 1
+    return adj + sps.diags(np.ones(adj.shape[0]) - adj.diagonal())
+
+
+# the normalizations that can be applied to a cached adjacency matrix, keyed by name
+NORMALIZATIONS = {
+    "self_loops": _add_self_loops,
+    "left": lambda adj: normalize_adj(adj, symmetric=False),
+    "symmetric": lambda adj: normalize_adj(adj, symmetric=True),
+    "left_self_loops": lambda adj: normalize_adj(
+        adj, symmetric=False, add_self_loops=True
+    ),
+    "symmetric_self_loops": lambda adj: normalize_adj(
+        adj, symmetric=True, add_self_loops=True
+    ),
+}
+
+
+def _nbytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def _freeze(matrix):
+    matrix = matrix.tocsr()
+    # scipy sorts the indices of a matrix in place if they aren't already sorted, which would fail
+    # for read-only arrays
+    matrix.sort_indices()
+    for array in [matrix.data, matrix.indices, matrix.indptr]:
+        array.flags.writeable = False
+    return matrix
+
+
+class AdjacencyCache:
+    """
+    A least-recently-used cache of read-only adjacency matrices, bounded by their total size.
+
+    Args:
+        max_bytes (int): the maximum total size of the matrices to store
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._matrices = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, compute):
+        """
+        Retrieve the matrix for ``key``, computing it with ``compute()`` if it isn't stored.
+
+        Matrices that are larger than ``max_bytes`` are returned without being stored.
+
+        Returns:
+            A SciPy CSR matrix, where the underlying arrays are read-only.
+        """
+        matrix = self._matrices.get(key)
+        if matrix is not None:
+            self._hits += 1
+            self._matrices.move_to_end(key)
+            return matrix
+
+        self._misses += 1
+        matrix = _freeze(compute())
+
+        size = _nbytes(matrix)
+        if size <= self.max_bytes:
+            while self._nbytes + size > self.max_bytes:
+                _, evicted = self._matrices.popitem(last=False)
+                self._nbytes -= _nbytes(evicted)
+
+            self._matrices[key] = matrix
+            self._nbytes += size
+
+        return matrix
+
+    def info(self) -> AdjacencyCacheInfo:
+        return AdjacencyCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            keys=list(self._matrices),
+            nbytes=self._nbytes,
+            max_bytes=self.max_bytes,
+        )
+
+    def clear(self):
+        self._matrices.clear()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
@@ -17,13 +17,16 @@
 from collections import defaultdict, namedtuple
 from typing import Iterable
 
+import os
 import warnings
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sps
 
 from ..globalvar import SOURCE, TARGET, WEIGHT, TYPE_ATTR_NAME
 from .element_data import NodeData, EdgeData
+from .feature_store import FeatureStore
 from .validation import comma_sep, require_dataframe_has_columns
 from .utils import is_real_iterable
 
@@ -197,6 +200,11 @@ class ColumnarConverter:
         return (shared, type_starts, features)
 
 
+def _ids_and_columns(shared):
+    # the element_data.py types store the columns as raw numpy arrays
+    return shared.index, {name: data.to_numpy() for name, data in shared.items()}
+
+
 def convert_nodes(data, *, name, default_type, dtype) -> NodeData:
     converter = ColumnarConverter(
         name,
@@ -209,12 +217,45 @@ def convert_nodes(data, *, name, default_type, dtype) -> NodeData:
         dtype=dtype,
     )
     nodes, type_starts, node_features = converter.convert(data)
-    return NodeData(nodes, type_starts, node_features)
+    ids, columns = _ids_and_columns(nodes)
+    return NodeData(ids, columns, type_starts, node_features)
 
 
 DEFAULT_WEIGHT = np.float32(1)
 
 
+def _require_numeric_dtype(name, dtype):
+    if dtype is None:
+        return None
+
+    dtype = np.dtype(dtype)
+    if not np.issubdtype(dtype, np.number):
+        raise TypeError(f"{name}: expected a numeric data-type, found '{dtype}'")
+    return dtype
+
+
+def _weights_with_dtype(weights, weight_dtype):
+    # the weights keep the type they were given if no type is specified
+    if weight_dtype is None:
+        return weights
+    return weights.astype(weight_dtype, copy=False)
+
+
+def _node_ids_to_ilocs(nodes, node_ids, *, name):
+    try:
+        return nodes.ids.to_iloc(node_ids, strict=True)
+    except KeyError as e:
+        missing_values = e.args[0]
+        if not is_real_iterable(missing_values):
+            missing_values = [missing_values]
+        missing_values = pd.unique(missing_values)
+
+        raise ValueError(
+            f"{name}: expected all source and target node IDs to be contained in `nodes`, "
+            f"found some missing: {comma_sep(missing_values)}"
+        )
+
+
 def convert_edges(
     data,
     *,
@@ -225,20 +266,12 @@ def convert_edges(
     weight_column,
     type_column,
     nodes,
+    weight_dtype=None,
 ):
-    def _node_ids_to_iloc(node_ids):
-        try:
-            return nodes.ids.to_iloc(node_ids, strict=True)
-        except KeyError as e:
-            missing_values = e.args[0]
-            if not is_real_iterable(missing_values):
-                missing_values = [missing_values]
-            missing_values = pd.unique(missing_values)
+    weight_dtype = _require_numeric_dtype("weight_dtype", weight_dtype)
 
-            raise ValueError(
-                f"edges: expected all source and target node IDs to be contained in `nodes`, "
-                f"found some missing: {comma_sep(missing_values)}"
-            )
+    def _node_ids_to_iloc(node_ids):
+        return _node_ids_to_ilocs(nodes, node_ids, name="edges")
 
     selected = {
         source_column: SOURCE,
@@ -272,7 +305,657 @@ def convert_edges(
             f"{converter.name()}: expected weight column {weight_column!r} to be numeric, found dtype '{weight_col.dtype}'"
         )
 
-    return EdgeData(edges, type_starts)
+    ids, columns = _ids_and_columns(edges)
+    columns[WEIGHT] = _weights_with_dtype(columns[WEIGHT], weight_dtype)
+    return EdgeData(ids, columns, type_starts)
+
+
+def _require_1d(name, array):
+    array = np.asarray(array)
+    if array.ndim != 1:
+        raise ValueError(f"{name}: expected a 1D array, found {array.ndim} dimensions")
+    return array
+
+
+def convert_node_arrays(node_ids, node_features, *, default_type, dtype) -> NodeData:
+    """
+    Convert the IDs and features of nodes, as arrays, into a ``NodeData``.
+
+    The arrays are used directly (without copying) where possible: the features of each type are
+    only copied if they are not a C-contiguous array of type ``dtype``, and the IDs are only copied
+    if there are multiple types (to concatenate them).
+
+    Args:
+        node_ids (array or dict of hashable to array): the IDs of the nodes, either as a single 1D
+            array (all with type ``default_type``), or a 1D array for each type
+        node_features (array, FeatureStore or dict of hashable to array or FeatureStore, optional):
+            the feature matrices of the nodes, with rows in the same order as ``node_ids``. Types
+            that don't appear have no features.
+        default_type (hashable): the type of the nodes, if ``node_ids`` is not a dict
+        dtype (numpy dtype): the data type to use for dense feature matrices
+    """
+    if not isinstance(node_ids, dict):
+        node_ids = {default_type: node_ids}
+        if node_features is not None and not isinstance(node_features, dict):
+            node_features = {default_type: node_features}
+
+    if node_features is None:
+        node_features = {}
+    elif not isinstance(node_features, dict):
+        raise TypeError(
+            f"node_features: expected dict when node_ids is a dict, found {type(node_features).__name__}"
+        )
+
+    unknown_types = set(node_features.keys()) - set(node_ids.keys())
+    if unknown_types:
+        raise ValueError(
+            f"node_features: expected feature types to be a subset of the node types ({comma_sep(list(node_ids.keys()))}), found some unknown: {comma_sep(list(unknown_types))}"
+        )
+
+    rows_so_far = 0
+    type_starts = []
+    type_ids = []
+    features = {}
+
+    for type_name in sorted(node_ids.keys()):
+        ids = _require_1d(f"node_ids[{type_name!r}]", node_ids[type_name])
+        type_starts.append((type_name, rows_so_far))
+        type_ids.append(ids)
+        rows_so_far += len(ids)
+
+        type_features = node_features.get(type_name)
+        if type_features is None:
+            type_features = np.empty((len(ids), 0), dtype=dtype)
+        elif not isinstance(type_features, (FeatureStore, sps.spmatrix)):
+            type_features = np.ascontiguousarray(type_features, dtype=dtype)
+
+        features[type_name] = type_features
+
+    if len(type_ids) == 1:
+        ids = type_ids[0]
+    else:
+        # Index.append keeps IDs of different types (like integers and strings) separate, rather
+        # than converting them all to strings like np.concatenate
+        ids = pd.Index([]).append([pd.Index(ids) for ids in type_ids])
+
+    return NodeData(ids, {}, type_starts, features)
+
+
+def convert_edge_arrays(
+    sources,
+    targets,
+    weights,
+    edge_types,
+    edge_ids,
+    *,
+    nodes: NodeData,
+    default_type,
+    use_ilocs,
+    weight_dtype=None,
+) -> EdgeData:
+    """
+    Convert the sources, targets, weights and types of edges, as arrays, into an ``EdgeData``.
+
+    The arrays are used directly (without copying) where possible: if ``edge_types`` is not
+    specified or is already sorted, ``weights`` and ``edge_ids`` are not copied, and neither are
+    ``sources`` and ``targets`` if ``use_ilocs`` is True and they have the smallest integer type
+    that holds every node iloc.
+
+    Args:
+        sources (array): the source node of each edge
+        targets (array): the target node of each edge
+        weights (array, optional): the weight of each edge, defaulting to 1
+        edge_types (array, optional): the type of each edge, defaulting to ``default_type``
+        edge_ids (array, optional): the ID of each edge, defaulting to ``0, 1, ...``
+        nodes (NodeData): the nodes of the graph
+        default_type (hashable): the type of the edges, if ``edge_types`` is not specified
+        use_ilocs (bool): if True, ``sources`` and ``targets`` are the ilocs of nodes in ``nodes``,
+            otherwise they are node IDs
+        weight_dtype (numpy dtype, optional): the data type to use for the weights, defaulting to
+            the type of ``weights``
+    """
+    weight_dtype = _require_numeric_dtype("weight_dtype", weight_dtype)
+    sources = _require_1d("sources", sources)
+    num_edges = len(sources)
+
+    def require_length(name, array):
+        array = _require_1d(name, array)
+        if len(array) != num_edges:
+            raise ValueError(
+                f"{name}: expected one value per edge, found {num_edges} edges and {len(array)} values"
+            )
+        return array
+
+    targets = require_length("targets", targets)
+
+    if weights is None:
+        weights = np.full(num_edges, DEFAULT_WEIGHT)
+    else:
+        weights = require_length("weights", weights)
+        if not pd.api.types.is_numeric_dtype(weights.dtype):
+            raise TypeError(
+                f"weights: expected a numeric array, found dtype '{weights.dtype}'"
+            )
+    weights = _weights_with_dtype(weights, weight_dtype)
+
+    if use_ilocs:
+        iloc_dtype = np.min_scalar_type(len(nodes))
+
+        def convert_endpoints(name, ilocs):
+            if not pd.api.types.is_integer_dtype(ilocs.dtype):
+                raise TypeError(
+                    f"{name}: expected an integer array of ilocs, found dtype '{ilocs.dtype}'"
+                )
+            if len(ilocs) > 0 and (ilocs.min() < 0 or ilocs.max() >= len(nodes)):
+                raise ValueError(
+                    f"{name}: expected ilocs in the range [0, {len(nodes)}), found some outside it"
+                )
+            return ilocs.astype(iloc_dtype, copy=False)
+
+    else:
+
+        def convert_endpoints(name, ids):
+            return _node_ids_to_ilocs(nodes, ids, name=name)
+
+    sources = convert_endpoints("sources", sources)
+    targets = convert_endpoints("targets", targets)
+
+    if edge_ids is not None:
+        edge_ids = require_length("edge_ids", edge_ids)
+
+    if edge_types is None:
+        types = [default_type]
+        type_codes = None
+    else:
+        edge_types = require_length("edge_types", edge_types)
+        types, type_codes = np.unique(edge_types, return_inverse=True)
+
+    return _edge_data_grouped_by_type(
+        edge_ids, sources, targets, weights, types, type_codes
+    )
+
+
+def _edge_data_grouped_by_type(edge_ids, sources, targets, weights, types, type_codes):
+    """
+    Create an ``EdgeData``, reordering the edges so that those of each type are contiguous.
+
+    Args:
+        edge_ids (array, optional): the ID of each edge, defaulting to its position
+        sources, targets, weights (array): the node ilocs and weight of each edge
+        types (sequence): the sorted type names
+        type_codes (array, optional): the index into ``types`` of the type of each edge, or None
+            if every edge has type ``types[0]``
+    """
+    num_edges = len(sources)
+
+    if type_codes is None:
+        type_starts = [(types[0], 0)]
+        already_grouped = True
+    else:
+        counts = np.bincount(type_codes, minlength=len(types))
+        type_starts = list(zip(types, np.cumsum(counts) - counts))
+        already_grouped = (type_codes[:-1] <= type_codes[1:]).all()
+
+    if already_grouped:
+        if edge_ids is None:
+            edge_ids = pd.RangeIndex(num_edges)
+    else:
+        # a stable sort keeps the order of the edges within each type
+        order = np.argsort(type_codes, kind="stable")
+        sources = sources[order]
+        targets = targets[order]
+        weights = weights[order]
+        # the default ID of each edge is its position in the input
+        edge_ids = order if edge_ids is None else edge_ids[order]
+
+    columns = {SOURCE: sources, TARGET: targets, WEIGHT: weights}
+    return EdgeData(edge_ids, columns, type_starts)
+
+
+class _GrowableArray:
+    """
+    An array that can be efficiently appended to, by over-allocating its storage geometrically.
+
+    The dtype is promoted as required, if appended values have a larger type.
+
+    Args:
+        row_shape (tuple): the shape of each element, for instance ``(num_features,)`` for a 2D
+            array of features
+        dtype (numpy dtype, optional): the initial data type, defaulting to the type of the first
+            values appended
+    """
+
+    def __init__(self, row_shape=(), dtype=None):
+        self._row_shape = tuple(row_shape)
+        self._dtype = dtype
+        self._data = None
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def row_shape(self):
+        return self._row_shape
+
+    def append(self, values):
+        values = np.asarray(values)
+        if values.shape[1:] != self._row_shape:
+            raise ValueError(
+                f"values: expected rows of shape {self._row_shape}, found shape {values.shape[1:]}"
+            )
+
+        dtype = values.dtype if self._dtype is None else self._dtype
+        dtype = np.promote_types(dtype, values.dtype)
+
+        required = self._length + len(values)
+        if self._data is None:
+            self._data = np.empty((max(required, 1024),) + self._row_shape, dtype=dtype)
+        elif dtype != self._data.dtype:
+            capacity = max(required, len(self._data))
+            grown = np.empty((capacity,) + self._row_shape, dtype=dtype)
+            grown[: self._length] = self._data[: self._length]
+            self._data = grown
+        elif required > len(self._data):
+            grown = np.empty(
+                (max(required, 2 * len(self._data)),) + self._row_shape,
+                dtype=self._data.dtype,
+            )
+            grown[: self._length] = self._data[: self._length]
+            self._data = grown
+
+        self._dtype = dtype
+        self._data[self._length : required] = values
+        self._length = required
+
+    def finish(self):
+        """
+        Returns:
+            The appended values, as a numpy array (this can only be called once).
+        """
+        if self._data is None:
+            dtype = self._dtype if self._dtype is not None else np.float64
+            return np.empty((0,) + self._row_shape, dtype=dtype)
+
+        data = self._data
+        self._data = None
+        if len(data) == self._length:
+            return data
+        return data[: self._length].copy()
+
+
+class GraphBuilder:
+    """
+    Incrementally build the ``NodeData`` and ``EdgeData`` of a graph from chunks of arrays, such as
+    those read from files, without holding all of the input in memory at once.
+
+    Nodes (if any) must all be added before any edges, because the source and target node IDs of
+    each chunk of edges are converted to ilocs as it is added. If no nodes are added, they are
+    inferred from the edges (in order of first appearance), without features.
+
+    Args:
+        node_type_default (hashable): the type to use for nodes added without a type
+        edge_type_default (hashable): the type to use for edges added without a type
+        dtype (numpy dtype): the data type to use for the node features
+        weight_dtype (numpy dtype, optional): the data type to use for the edge weights, defaulting
+            to the type of the weights that are added
+    """
+
+    def __init__(
+        self, *, node_type_default, edge_type_default, dtype, weight_dtype=None
+    ):
+        self._node_type_default = node_type_default
+        self._edge_type_default = edge_type_default
+        self._dtype = dtype
+        self._weight_dtype = _require_numeric_dtype("weight_dtype", weight_dtype)
+
+        # type name -> (node IDs, node features), until the first edges are added
+        self._node_chunks = {}
+        self._nodes = None
+        # when inferring nodes from edges: the node IDs seen so far, in iloc order
+        self._inferred_ids = None
+
+        self._edge_ids = None
+        self._sources = _GrowableArray()
+        self._targets = _GrowableArray()
+        self._weights = _GrowableArray(dtype=self._weight_dtype)
+        # edge type name -> code, in order of first appearance
+        self._edge_type_codes = {}
+        self._edge_type_column = _GrowableArray(dtype=np.uint8)
+
+    def add_nodes(self, ids, features=None, node_type=None):
+        """
+        Add a chunk of nodes.
+
+        Args:
+            ids (array): the IDs of the nodes
+            features (array, optional): a 2D array of the features of the nodes, with one row per
+                node in ``ids``
+            node_type (hashable, optional): the type of the nodes, defaulting to
+                ``node_type_default``
+        """
+        if self._node_chunks is None:
+            raise ValueError(
+                "ids: expected all nodes to be added before any edges, found nodes added after edges"
+            )
+
+        if node_type is None:
+            node_type = self._node_type_default
+
+        ids = _require_1d("ids", ids)
+        if features is None:
+            features = np.empty((len(ids), 0), dtype=self._dtype)
+        else:
+            features = np.asarray(features, dtype=self._dtype)
+
+        if len(features) != len(ids):
+            raise ValueError(
+                f"features: expected one row per ID, found {len(ids)} IDs and {len(features)} rows"
+            )
+
+        chunks = self._node_chunks.get(node_type)
+        if chunks is None:
+            chunks = self._node_chunks[node_type] = (
+                _GrowableArray(),
+                _GrowableArray(row_shape=features.shape[1:], dtype=self._dtype),
+            )
+
+        type_ids, type_features = chunks
+        if features.shape[1:] != type_features.row_shape:
+            raise ValueError(
+                f"features: expected the same feature shape for every node of type {node_type!r}, found {type_features.row_shape} and {features.shape[1:]}"
+            )
+
+        type_ids.append(ids)
+        type_features.append(features)
+
+    def _finish_nodes(self):
+        if self._node_chunks is None:
+            # already finished
+            return
+
+        if self._node_chunks:
+            node_ids = {}
+            node_features = {}
+            for type_name, (ids, features) in self._node_chunks.items():
+                node_ids[type_name] = ids.finish()
+                node_features[type_name] = features.finish()
+
+            self._nodes = convert_node_arrays(
+                node_ids,
+                node_features,
+                default_type=self._node_type_default,
+                dtype=self._dtype,
+            )
+        else:
+            self._inferred_ids = pd.Index([])
+
+        self._node_chunks = None
+
+    def _ilocs(self, name, ids):
+        if self._inferred_ids is None:
+            return _node_ids_to_ilocs(self._nodes, ids, name=name)
+
+        codes, uniques = pd.factorize(ids)
+        if (codes < 0).any():
+            raise ValueError(
+                f"{name}: expected a node ID for every edge, found {(codes < 0).sum()} missing values (NaN or None)"
+            )
+
+        # assign new ilocs for any IDs that haven't been seen before, in the order they appear
+        uniques = pd.Index(uniques)
+        known = self._inferred_ids
+        unique_ilocs = known.get_indexer(uniques)
+        is_new = unique_ilocs < 0
+        unique_ilocs[is_new] = np.arange(len(known), len(known) + is_new.sum())
+
+        if len(known) == 0:
+            # (avoid appending to the empty index, which would lose the dtype of the IDs)
+            self._inferred_ids = uniques
+        elif is_new.any():
+            self._inferred_ids = known.append(uniques[is_new])
+
+        return unique_ilocs[codes]
+
+    def add_edges(self, sources, targets, weights=None, edge_types=None, ids=None):
+        """
+        Add a chunk of edges.
+
+        Args:
+            sources (array): the source node ID of each edge
+            targets (array): the target node ID of each edge
+            weights (array, optional): the weight of each edge, defaulting to 1
+            edge_types (hashable or array, optional): the type of every edge, or an array with the
+                type of each edge, defaulting to ``edge_type_default``
+            ids (array, optional): the ID of each edge, defaulting to its position among all the
+                edges added. This must be specified for either every chunk, or none.
+        """
+        self._finish_nodes()
+
+        sources = _require_1d("sources", sources)
+        targets = _require_1d("targets", targets)
+        num_edges = len(sources)
+        if len(targets) != num_edges:
+            raise ValueError(
+                f"targets: expected one value per edge, found {num_edges} edges and {len(targets)} values"
+            )
+
+        if weights is None:
+            weights = np.full(num_edges, DEFAULT_WEIGHT)
+        else:
+            weights = _require_1d("weights", weights)
+            if not pd.api.types.is_numeric_dtype(weights.dtype):
+                raise TypeError(
+                    f"weights: expected a numeric array, found dtype '{weights.dtype}'"
+                )
+
+        if (ids is None) != (self._edge_ids is None) and len(self._sources) > 0:
+            raise ValueError(
+                "ids: expected edge IDs for every chunk of edges or for none, found a mix"
+            )
+        if ids is not None:
+            if self._edge_ids is None:
+                self._edge_ids = _GrowableArray()
+            self._edge_ids.append(_require_1d("ids", ids))
+
+        if edge_types is None:
+            edge_types = self._edge_type_default
+
+        if is_real_iterable(edge_types):
+            codes, uniques = pd.factorize(_require_1d("edge_types", edge_types))
+        else:
+            codes, uniques = np.zeros(num_edges, dtype=np.uint8), [edge_types]
+
+        type_codes = self._edge_type_codes
+        global_codes = np.array(
+            [type_codes.setdefault(t, len(type_codes)) for t in uniques],
+            dtype=np.min_scalar_type(len(type_codes)),
+        )
+
+        self._sources.append(self._ilocs("sources", sources))
+        self._targets.append(self._ilocs("targets", targets))
+        # converting each chunk keeps the weights in their final type as they're accumulated
+        self._weights.append(_weights_with_dtype(weights, self._weight_dtype))
+        self._edge_type_column.append(global_codes[codes])
+
+    def build(self):
+        """
+        Finalise the nodes and edges that have been added.
+
+        Returns:
+            A tuple of ``(NodeData, EdgeData)``.
+        """
+        self._finish_nodes()
+
+        if self._inferred_ids is not None:
+            self._nodes = convert_node_arrays(
+                self._inferred_ids,
+                None,
+                default_type=self._node_type_default,
+                dtype=self._dtype,
+            )
+
+        num_nodes = len(self._nodes)
+        iloc_dtype = np.min_scalar_type(num_nodes)
+        sources = self._sources.finish().astype(iloc_dtype, copy=False)
+        targets = self._targets.finish().astype(iloc_dtype, copy=False)
+        weights = self._weights.finish()
+        if len(weights) == 0 and self._weight_dtype is None:
+            weights = weights.astype(DEFAULT_WEIGHT.dtype)
+        edge_ids = None if self._edge_ids is None else self._edge_ids.finish()
+
+        if self._edge_type_codes:
+            # remap the codes (in order of appearance) to the sorted order of the type names
+            appearance_order = list(self._edge_type_codes)
+            types = sorted(appearance_order)
+            sorted_codes = np.array([types.index(t) for t in appearance_order])
+            type_codes = sorted_codes[self._edge_type_column.finish()]
+        else:
+            # no edges, so nothing is needed beyond the type
+            types = [self._edge_type_default]
+            type_codes = None
+
+        edges = _edge_data_grouped_by_type(
+            edge_ids, sources, targets, weights, types, type_codes
+        )
+        return self._nodes, edges
+
+
+_PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def _read_chunks(path, columns, chunk_size, csv_options):
+    """
+    Read a CSV or Parquet file as a sequence of DataFrames of at most ``chunk_size`` rows.
+
+    Args:
+        columns (list, optional): the columns to read, where missing columns are ignored, or None
+            to read every column
+    """
+    if str(path).endswith(_PARQUET_EXTENSIONS):
+        try:
+            import pyarrow.parquet as pq
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                f"{e.msg}. Reading Parquet files requires the 'pyarrow' module; please install it",
+                name=e.name,
+                path=e.path,
+            ) from None
+
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            names = parquet_file.schema_arrow.names
+            columns = [c for c in columns if c in names]
+
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        usecols = None if columns is None else lambda c: c in columns
+        yield from pd.read_csv(
+            path, chunksize=chunk_size, usecols=usecols, **(csv_options or {})
+        )
+
+
+def _paths_by_type(paths, default_type):
+    if paths is None:
+        return {}
+    if not isinstance(paths, dict):
+        paths = {default_type: paths}
+
+    return {
+        type_name: [type_paths]
+        if isinstance(type_paths, (str, os.PathLike))
+        else list(type_paths)
+        for type_name, type_paths in paths.items()
+    }
+
+
+def read_files(
+    nodes,
+    edges,
+    *,
+    node_id_column,
+    source_column,
+    target_column,
+    edge_weight_column,
+    edge_type_column,
+    edge_id_column,
+    node_type_default,
+    edge_type_default,
+    dtype,
+    edge_weight_dtype,
+    chunk_size,
+    csv_options,
+):
+    """
+    Read the nodes and edges of a graph from CSV or Parquet files, in chunks of ``chunk_size`` rows.
+
+    See :meth:`.StellarGraph.from_files` for a description of the arguments.
+
+    Returns:
+        A tuple of ``(NodeData, EdgeData)``.
+    """
+    if edge_type_column is not None and isinstance(edges, dict):
+        raise ValueError(
+            f"edges: expected a path or list of paths when using a type column ({edge_type_column!r}), found a dict"
+        )
+
+    builder = GraphBuilder(
+        node_type_default=node_type_default,
+        edge_type_default=edge_type_default,
+        dtype=dtype,
+        weight_dtype=edge_weight_dtype,
+    )
+
+    for type_name, paths in _paths_by_type(nodes, node_type_default).items():
+        for path in paths:
+            for chunk in _read_chunks(path, None, chunk_size, csv_options):
+                id_column = (
+                    chunk.columns[0] if node_id_column is None else node_id_column
+                )
+                require_dataframe_has_columns(f"nodes ({path})", chunk, [id_column])
+                builder.add_nodes(
+                    chunk[id_column].to_numpy(),
+                    chunk.drop(columns=id_column).to_numpy(dtype=dtype),
+                    node_type=type_name,
+                )
+
+    required_columns = [source_column, target_column]
+    if edge_type_column is not None:
+        required_columns.append(edge_type_column)
+    if edge_id_column is not None:
+        required_columns.append(edge_id_column)
+    edge_columns = required_columns + [edge_weight_column]
+
+    for type_name, paths in _paths_by_type(edges, edge_type_default).items():
+        for path in paths:
+            for chunk in _read_chunks(path, edge_columns, chunk_size, csv_options):
+                require_dataframe_has_columns(
+                    f"edges ({path})", chunk, required_columns
+                )
+
+                if edge_type_column is None:
+                    edge_types = type_name
+                else:
+                    edge_types = chunk[edge_type_column].to_numpy()
+
+                weights = chunk.get(edge_weight_column)
+                if weights is not None:
+                    weights = weights.to_numpy()
+
+                ids = None
+                if edge_id_column is not None:
+                    ids = chunk[edge_id_column].to_numpy()
+
+                builder.add_edges(
+                    chunk[source_column].to_numpy(),
+                    chunk[target_column].to_numpy(),
+                    weights=weights,
+                    edge_types=edge_types,
+                    ids=ids,
+                )
+
+    return builder.build()
 
 
 SingleTypeNodeIdsAndFeatures = namedtuple(
@@ -0,0 +1,672 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Nodes and edges that have been added to a graph, but not yet merged into its main storage.
+
+"""
+
+import functools
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from ..globalvar import SOURCE, TARGET, WEIGHT
+from . import convert
+from .element_data import NodeData, EdgeData
+from .utils import is_real_iterable
+from .validation import comma_sep
+
+# the column of the nodes of a batch that records their sequence numbers
+_SEQUENCE = "sequence"
+
+
+def _as_id_array(ids):
+    if isinstance(ids, (pd.Index, pd.Series)):
+        return ids.to_numpy()
+    if isinstance(ids, np.ndarray):
+        return ids
+    return pd.Index(ids).to_numpy()
+
+
+def _concatenate(arrays, empty_dtype):
+    if not arrays:
+        return np.array([], dtype=empty_dtype)
+    return np.concatenate(arrays)
+
+
+def _with_columns(nodes, columns):
+    return NodeData(nodes.ids.pandas_index, columns, nodes.type_starts, nodes._features)
+
+
+class _Batch:
+    """
+    Some nodes and edges that have been added to a graph.
+
+    The added nodes are numbered with sequence numbers, in the order that they were added over all
+    batches. Edges refer to nodes by their "raw" iloc: the iloc in the base graph for existing
+    nodes, or the number of nodes in the base graph plus the sequence number for new nodes. Unlike
+    the ilocs that the nodes have after merging, these don't change as more nodes are added.
+
+    Args:
+        nodes (NodeData): the new nodes, with a column of their sequence numbers
+        edges (EdgeData): the new edges, with raw node ilocs as their sources and targets
+        first_sequence (int): the smallest sequence number of the nodes, which must be contiguous
+            (or the next sequence number, if there are no nodes)
+    """
+
+    def __init__(self, nodes, edges, first_sequence):
+        self.nodes = nodes
+        self.edges = edges
+        self.first_sequence = first_sequence
+        self.sequences = nodes._column(_SEQUENCE)
+
+        self.ilocs_by_sequence = np.empty(len(nodes), dtype=np.int64)
+        self.ilocs_by_sequence[self.sequences - first_sequence] = np.arange(len(nodes))
+
+        # the edges of each node are found with a binary search of the sorted keys that an
+        # `AdjacencyIndex` would record, because an index over every node in the graph would be
+        # far larger than a typical batch
+        self._sorted_adj = {}
+
+    def __len__(self):
+        return len(self.nodes) + len(self.edges)
+
+    def edge_ilocs(self, raw_node, *, ins, outs):
+        sorted_adj = self._sorted_adj.get((ins, outs))
+        if sorted_adj is None:
+            keys, edge_ilocs = self.edges._adj_keys_and_edge_ilocs(
+                np.arange(len(self.edges)), ins=ins, outs=outs
+            )
+            # a stable sort keeps the edges of each node in increasing order
+            order = np.argsort(keys, kind="stable")
+            sorted_adj = self._sorted_adj[(ins, outs)] = keys[order], edge_ilocs[order]
+
+        keys, edge_ilocs = sorted_adj
+        start, stop = np.searchsorted(keys, [raw_node, raw_node + 1])
+        return edge_ilocs[start:stop]
+
+    def merge(self, other):
+        return _Batch(
+            self.nodes.merge(other.nodes),
+            self.edges.merge(other.edges),
+            self.first_sequence,
+        )
+
+
+class _RawIlocIndex:
+    """
+    An index from node IDs to raw node ilocs (see ``_Batch``), for the nodes of a base graph and
+    some batches.
+
+    This has the ``to_iloc`` method of an ``ExternalIdIndex``, and is its own ``ids``, so that it
+    can be passed as the ``nodes`` of ``convert.convert_edges``.
+
+    Args:
+        base (ExternalIdIndex): the IDs of the nodes in the base graph
+        batches (list of NodeData): the nodes of each batch, with a column of their sequence
+            numbers
+    """
+
+    def __init__(self, base, batches):
+        self._base = base
+        self._batches = batches
+
+    @property
+    def ids(self):
+        return self
+
+    def to_iloc(self, ids, strict=False):
+        ids = _as_id_array(ids)
+        raw = self._base.to_iloc(ids, smaller_type=False).astype(np.int64, copy=False)
+
+        for nodes in self._batches:
+            (missing,) = np.nonzero(raw < 0)
+            if len(missing) == 0:
+                break
+
+            ilocs = nodes.ids.to_iloc(ids[missing], smaller_type=False)
+            found = ilocs >= 0
+            raw[missing[found]] = (
+                len(self._base) + nodes._column(_SEQUENCE)[ilocs[found]]
+            )
+
+        if strict:
+            missing_values = ids[raw < 0]
+            if len(missing_values) == 1:
+                raise KeyError(missing_values[0])
+            if len(missing_values) > 1:
+                raise KeyError(missing_values)
+
+        return raw
+
+
+class _Layout:
+    """
+    The ilocs that the elements (nodes or edges) of a base ``ElementData`` and some pending ones
+    have after merging them (with ``merge``): the elements of each type are grouped together, with
+    the pending ones after the base ones in the order of the batches, and any new types after the
+    existing ones.
+
+    Args:
+        base (ElementData): the base elements
+        pending (list of ElementData): the pending elements of each batch
+    """
+
+    def __init__(self, base, pending):
+        self.types = list(
+            dict.fromkeys(
+                itertools.chain(
+                    base._type_element_ilocs,
+                    *(batch._type_element_ilocs for batch in pending),
+                )
+            )
+        )
+        codes = {type_name: code for code, type_name in enumerate(self.types)}
+
+        def counts_and_starts(elements):
+            counts = np.zeros(len(self.types), dtype=np.int64)
+            starts = np.zeros(len(self.types), dtype=np.int64)
+            for type_name, ilocs in elements._type_element_ilocs.items():
+                counts[codes[type_name]] = len(ilocs)
+                starts[codes[type_name]] = ilocs.start
+            return counts, starts
+
+        self.base_counts, self.base_starts = counts_and_starts(base)
+        pending_counts = np.zeros((len(pending), len(self.types)), dtype=np.int64)
+        self.pending_starts = np.zeros_like(pending_counts)
+        for i, batch in enumerate(pending):
+            pending_counts[i], self.pending_starts[i] = counts_and_starts(batch)
+
+        self.totals = self.base_counts + pending_counts.sum(axis=0)
+        self.total = int(self.totals.sum())
+        self.starts = np.cumsum(self.totals) - self.totals
+        # the position of the first element of each batch within the elements of each type
+        self.pending_offsets = (
+            self.base_counts + np.cumsum(pending_counts, axis=0) - pending_counts
+        )
+
+        # the difference between the merged iloc and the existing iloc of an element, by the iloc
+        # of its type within its base or batch
+        self.base_shifts = (self.starts - self.base_starts)[
+            : len(base._type_element_ilocs)
+        ]
+        self._pending_codes = [
+            np.array(
+                [codes[type_name] for type_name in batch._type_element_ilocs],
+                dtype=np.int64,
+            )
+            for batch in pending
+        ]
+        self._pending_shifts = [
+            (self.starts + offsets - starts)[batch_codes]
+            for offsets, starts, batch_codes in zip(
+                self.pending_offsets, self.pending_starts, self._pending_codes
+            )
+        ]
+
+        self._base = base
+        self._pending = pending
+
+    def base_to_merged(self, ilocs):
+        return ilocs + self.base_shifts[self._base.type_ilocs[ilocs]]
+
+    def pending_to_merged(self, batch, ilocs):
+        return (
+            ilocs + self._pending_shifts[batch][self._pending[batch].type_ilocs[ilocs]]
+        )
+
+    def pending_codes(self, batch, ilocs):
+        return self._pending_codes[batch][self._pending[batch].type_ilocs[ilocs]]
+
+    def locate(self, merged):
+        """
+        Find the element with each merged iloc.
+
+        Returns:
+            A tuple of numpy arrays of the index of each element's type within ``types``, the
+            index of its batch (-1 for the base) and its iloc within that batch or the base.
+        """
+        merged = np.asarray(merged).astype(np.int64, copy=False)
+        if merged.size > 0 and (merged.min() < 0 or merged.max() >= self.total):
+            raise IndexError(
+                f"ilocs: expected ilocs in the range [0, {self.total}), found some outside it"
+            )
+
+        # (types without any elements start at the same iloc as the next one, and so are never
+        # selected, and similarly for batches without any elements of a type)
+        codes = np.searchsorted(self.starts, merged, side="right") - 1
+        rank = merged - self.starts[codes]
+        batches = (self.pending_offsets[:, codes] <= rank).sum(axis=0) - 1
+
+        ilocs = self.base_starts[codes] + rank
+        pending = batches >= 0
+        if pending.any():
+            batch, code = batches[pending], codes[pending]
+            ilocs[pending] = (
+                self.pending_starts[batch, code]
+                + rank[pending]
+                - self.pending_offsets[batch, code]
+            )
+
+        return codes, batches, ilocs
+
+
+class GraphDelta:
+    """
+    Nodes and edges that have been added to a graph with :meth:`.StellarGraph.with_added_edges`,
+    recorded separately from the ``NodeData`` and ``EdgeData`` of the graph (the "base"), so that
+    adding them doesn't copy or re-index the whole graph.
+
+    The additions are held in a few batches of decreasing size: each new batch is merged with the
+    previous one while that is less than twice as large, so there are a logarithmic number of
+    batches and each addition is copied a logarithmic number of times. Queries combine the base
+    with each batch, and give the same result as querying the graph created by :meth:`compact`,
+    including the order of the nodes and edges.
+
+    Args:
+        nodes (NodeData): the base nodes
+        edges (EdgeData): the base edges
+        batches (list of _Batch): the pending batches, in the order they were added
+    """
+
+    def __init__(self, nodes, edges, batches=()):
+        self.nodes = nodes
+        self.edges = edges
+        self.batches = list(batches)
+
+        self._node_layout = _Layout(nodes, [batch.nodes for batch in self.batches])
+        self._edge_layout = _Layout(edges, [batch.edges for batch in self.batches])
+        self._node_type_names = pd.Index(self._node_layout.types).to_numpy()
+        self._edge_type_names = pd.Index(self._edge_layout.types).to_numpy()
+
+        self._raw_index = _RawIlocIndex(
+            nodes.ids, [batch.nodes for batch in self.batches]
+        )
+        self._first_sequences = np.array(
+            [batch.first_sequence for batch in self.batches], dtype=np.int64
+        )
+        self._next_sequence = sum(len(batch.nodes) for batch in self.batches)
+
+    def pending_size(self):
+        """
+        Returns:
+            The total number of pending nodes and edges.
+        """
+        return sum(len(batch) for batch in self.batches)
+
+    def base_size(self):
+        """
+        Returns:
+            The total number of nodes and edges in the base.
+        """
+        return len(self.nodes) + len(self.edges)
+
+    def _check_new_nodes(self, new_nodes):
+        ids = new_nodes.ids.pandas_index
+        existing = self._raw_index.to_iloc(ids) >= 0
+        if existing.any():
+            raise ValueError(
+                f"nodes: expected IDs to appear once, found some that appeared more: {comma_sep(ids[existing])}"
+            )
+
+        sizes = {
+            type_name: size
+            for nodes in [self.nodes] + [batch.nodes for batch in self.batches]
+            for type_name, (size, _) in nodes.feature_info().items()
+        }
+        for type_name, (size, _) in new_nodes.feature_info().items():
+            expected = sizes.get(type_name, size)
+            if size != expected:
+                raise ValueError(
+                    f"nodes: expected {expected} features for nodes of type {type_name!r} (as for the existing nodes of that type), found {size}"
+                )
+
+    def _check_new_edges(self, new_edges):
+        ids = new_edges.ids.pandas_index
+        existing = np.zeros(len(ids), dtype=bool)
+        for edges in [self.edges] + [batch.edges for batch in self.batches]:
+            existing |= edges.ids.to_iloc(ids, smaller_type=False) >= 0
+
+        if existing.any():
+            raise ValueError(
+                f"edges: expected IDs to appear once, found some that appeared more: {comma_sep(ids[existing])}"
+            )
+
+    def with_added(
+        self,
+        nodes,
+        edges,
+        *,
+        node_type_default,
+        edge_type_default,
+        source_column,
+        target_column,
+        weight_column,
+        type_column,
+        dtype,
+    ):
+        """
+        Create a new ``GraphDelta`` with some more nodes and edges, given in the same form as the
+        ``nodes`` and ``edges`` arguments to :class:`.StellarGraph`.
+        """
+        first_sequence = self._next_sequence
+        if nodes is None:
+            new_nodes = NodeData([], {}, [], {})
+        else:
+            new_nodes = convert.convert_nodes(
+                nodes, name="nodes", default_type=node_type_default, dtype=dtype
+            )
+            self._check_new_nodes(new_nodes)
+
+        sequences = np.arange(first_sequence, first_sequence + len(new_nodes))
+        new_nodes = _with_columns(new_nodes, {_SEQUENCE: sequences})
+
+        if edges is None:
+            empty = np.array([], dtype=np.uint8)
+            weights = np.array([], dtype=self.edges.weights.dtype)
+            new_edges = EdgeData(
+                [], {SOURCE: empty, TARGET: empty, WEIGHT: weights}, []
+            )
+        else:
+            new_edges = convert.convert_edges(
+                edges,
+                name="edges",
+                default_type=edge_type_default,
+                source_column=source_column,
+                target_column=target_column,
+                weight_column=weight_column,
+                type_column=type_column,
+                nodes=_RawIlocIndex(
+                    self.nodes.ids,
+                    [batch.nodes for batch in self.batches] + [new_nodes],
+                ),
+                weight_dtype=self.edges.weights.dtype,
+            )
+            self._check_new_edges(new_edges)
+
+        batch = _Batch(new_nodes, new_edges, first_sequence)
+        if len(batch) == 0:
+            return self
+
+        batches = self.batches + [batch]
+        while len(batches) >= 2 and len(batches[-2]) < 2 * len(batches[-1]):
+            last = batches.pop()
+            batches[-1] = batches[-1].merge(last)
+
+        return GraphDelta(self.nodes, self.edges, batches)
+
+    def compact(self):
+        """
+        Merge the pending nodes and edges into the base.
+
+        Returns:
+            A tuple of the ``NodeData`` and ``EdgeData`` of the merged graph.
+        """
+        if not self.batches:
+            return self.nodes, self.edges
+
+        pending = functools.reduce(_Batch.merge, self.batches)
+        nodes = self.nodes.merge(_with_columns(pending.nodes, {}))
+
+        edges = EdgeData(
+            pending.edges.ids.pandas_index,
+            {
+                SOURCE: self._raw_to_merged(pending.edges.sources),
+                TARGET: self._raw_to_merged(pending.edges.targets),
+                WEIGHT: pending.edges.weights,
+            },
+            pending.edges.type_starts,
+        )
+
+        node_ilocs = None
+        if self._node_layout.base_shifts.any():
+            node_ilocs = self._node_layout.base_to_merged(np.arange(len(self.nodes)))
+
+        return nodes, self.edges.merge(edges, node_ilocs=node_ilocs)
+
+    def _split_raw(self, raw):
+        """
+        Split raw node ilocs by the batch that each node is in.
+
+        Returns:
+            An iterator of tuples of the positions within ``raw``, the index of the batch (-1 for
+            the base) and the ilocs of the nodes within that batch or the base.
+        """
+        num_base = len(self.nodes)
+        is_base = raw < num_base
+        (positions,) = np.nonzero(is_base)
+        yield positions, -1, raw[positions]
+
+        (positions,) = np.nonzero(~is_base)
+        sequences = raw[positions] - num_base
+        batch_ilocs = (
+            np.searchsorted(self._first_sequences, sequences, side="right") - 1
+        )
+        for i, batch in enumerate(self.batches):
+            selected = batch_ilocs == i
+            if selected.any():
+                sequence_offsets = sequences[selected] - batch.first_sequence
+                yield positions[selected], i, batch.ilocs_by_sequence[sequence_offsets]
+
+    def _raw_to_merged(self, raw):
+        raw = np.asarray(raw).astype(np.int64, copy=False)
+        merged = np.empty(len(raw), dtype=np.int64)
+        for positions, batch, ilocs in self._split_raw(raw):
+            if batch < 0:
+                merged[positions] = self._node_layout.base_to_merged(ilocs)
+            else:
+                merged[positions] = self._node_layout.pending_to_merged(batch, ilocs)
+        return merged
+
+    def _raw_to_ids(self, raw):
+        raw = np.asarray(raw).astype(np.int64, copy=False)
+        parts = [
+            (
+                positions,
+                (self.nodes if batch < 0 else self.batches[batch].nodes).ids.from_iloc(
+                    ilocs
+                ),
+            )
+            for positions, batch, ilocs in self._split_raw(raw)
+        ]
+
+        dtypes = {ids.dtype for _, ids in parts}
+        ids = np.empty(len(raw), dtype=dtypes.pop() if len(dtypes) == 1 else object)
+        for positions, part in parts:
+            ids[positions] = part
+        return ids
+
+    def _merged_to_raw(self, merged):
+        _, batches, raw = self._node_layout.locate(merged)
+        for i, batch in enumerate(self.batches):
+            selected = batches == i
+            raw[selected] = len(self.nodes) + batch.sequences[raw[selected]]
+        return raw
+
+    def number_of_nodes(self):
+        return self._node_layout.total
+
+    def number_of_edges(self):
+        return self._edge_layout.total
+
+    @property
+    def node_types(self):
+        return self._node_layout.types
+
+    @property
+    def edge_types(self):
+        return self._edge_layout.types
+
+    def has_node(self, node):
+        return self._raw_index.to_iloc([node])[0] >= 0
+
+    def node_ids_to_ilocs(self, ids):
+        if not is_real_iterable(ids):
+            return self.node_ids_to_ilocs([ids])[0]
+        raw = self._raw_index.to_iloc(ids, strict=True)
+        return self._raw_to_merged(raw)
+
+    def node_ilocs_to_ids(self, ilocs):
+        ilocs = np.asarray(ilocs)
+        if ilocs.ndim == 0:
+            return self.node_ilocs_to_ids(ilocs[None])[0]
+        return self._raw_to_ids(self._merged_to_raw(ilocs))
+
+    def node_types_of_ilocs(self, ilocs):
+        codes, _, _ = self._node_layout.locate(ilocs)
+        return self._node_type_names[codes]
+
+    def node_type_range(self, node_type):
+        code = self._node_layout.types.index(node_type)
+        start = int(self._node_layout.starts[code])
+        return range(start, start + int(self._node_layout.totals[code]))
+
+    def node_ids(self, node_type=None):
+        """
+        Returns:
+            A numpy array of the IDs of all nodes, or those of type ``node_type``, in iloc order.
+        """
+        if node_type is None:
+            types = self._node_layout.types
+        elif node_type in self._node_layout.types:
+            types = [node_type]
+        else:
+            raise KeyError(node_type)
+
+        parts = [
+            nodes.ids.from_iloc(nodes._type_element_ilocs[type_name])
+            for type_name in types
+            for nodes in [self.nodes] + [batch.nodes for batch in self.batches]
+            if type_name in nodes._type_element_ilocs
+        ]
+        if not parts:
+            return self.nodes.ids.from_iloc(slice(0, 0))
+        return np.concatenate(parts)
+
+    def edge_arrays(self, *, include_edge_type, include_edge_weight, use_ilocs):
+        """
+        Returns:
+            A tuple of numpy arrays of the sources, targets, types and weights of the edges, in the
+            same form as :meth:`.StellarGraph.edge_arrays`.
+        """
+        source_parts, target_parts, code_parts, weight_parts = [], [], [], []
+        for code, type_name in enumerate(self._edge_layout.types):
+            for edges in [self.edges] + [batch.edges for batch in self.batches]:
+                ilocs = edges._type_element_ilocs.get(type_name)
+                if ilocs is None:
+                    continue
+                selector = slice(ilocs.start, ilocs.stop)
+                source_parts.append(edges.sources[selector])
+                target_parts.append(edges.targets[selector])
+                code_parts.append(np.full(len(ilocs), code))
+                weight_parts.append(edges.weights[selector])
+
+        sources = _concatenate(source_parts, np.uint8)
+        targets = _concatenate(target_parts, np.uint8)
+        if use_ilocs:
+            sources = self._raw_to_merged(sources)
+            targets = self._raw_to_merged(targets)
+        else:
+            sources = self._raw_to_ids(sources)
+            targets = self._raw_to_ids(targets)
+
+        types = None
+        if include_edge_type:
+            types = _concatenate(code_parts, np.uint8)
+            if not use_ilocs:
+                types = self._edge_type_names[types]
+
+        weights = None
+        if include_edge_weight:
+            weights = _concatenate(weight_parts, self.edges.weights.dtype)
+
+        return sources, targets, types, weights
+
+    def neighbours(self, node, *, ins, outs, edge_types, use_ilocs):
+        """
+        Find the neighbours of a node, in the same order as the neighbour queries of
+        :class:`.StellarGraph`.
+
+        Returns:
+            A tuple of numpy arrays of the neighbours (as ilocs or IDs, depending on
+            ``use_ilocs``) and the weights of the corresponding edges.
+        """
+        if not use_ilocs:
+            raw = int(self._raw_index.to_iloc([node])[0])
+        elif 0 <= node < self.number_of_nodes():
+            raw = int(self._merged_to_raw([node])[0])
+        else:
+            raw = -1
+
+        merged, sources, targets, codes, weights = [], [], [], [], []
+
+        def add(edges, edge_ilocs, edge_merged, edge_codes):
+            merged.append(edge_merged)
+            sources.append(edges.sources[edge_ilocs])
+            targets.append(edges.targets[edge_ilocs])
+            codes.append(edge_codes)
+            weights.append(edges.weights[edge_ilocs])
+
+        if 0 <= raw < len(self.nodes):
+            edge_ilocs = self.edges.edge_ilocs(raw, ins=ins, outs=outs)
+            add(
+                self.edges,
+                edge_ilocs,
+                self._edge_layout.base_to_merged(edge_ilocs),
+                self.edges.type_ilocs[edge_ilocs],
+            )
+
+        if raw >= 0:
+            for i, batch in enumerate(self.batches):
+                edge_ilocs = batch.edge_ilocs(raw, ins=ins, outs=outs)
+                add(
+                    batch.edges,
+                    edge_ilocs,
+                    self._edge_layout.pending_to_merged(i, edge_ilocs),
+                    self._edge_layout.pending_codes(i, edge_ilocs),
+                )
+
+        # after compaction, the edges of each node are ordered by their ilocs
+        order = np.argsort(_concatenate(merged, np.int64), kind="stable")
+        sources = _concatenate(sources, np.uint8)[order]
+        targets = _concatenate(targets, np.uint8)[order]
+        weights = _concatenate(weights, self.edges.weights.dtype)[order]
+
+        if ins and outs:
+            other_node = np.where(sources == raw, targets, sources)
+        elif ins:
+            other_node = sources
+        else:
+            other_node = targets
+
+        if edge_types is not None:
+            filter_codes = [
+                code
+                for code, type_name in enumerate(self._edge_layout.types)
+                if type_name in edge_types
+            ]
+            correct_type = np.isin(_concatenate(codes, np.uint8)[order], filter_codes)
+            other_node = other_node[correct_type]
+            weights = weights[correct_type]
+
+        if use_ilocs:
+            other_node = self._raw_to_merged(other_node)
+        else:
+            other_node = self._raw_to_ids(other_node)
+
+        return other_node, weights
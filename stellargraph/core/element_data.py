@@ -14,14 +14,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import itertools
-from collections import defaultdict
 
 import numpy as np
 import pandas as pd
 import scipy.sparse as sps
 
 from ..globalvar import SOURCE, TARGET, WEIGHT, TYPE_ATTR_NAME
-from .validation import require_dataframe_has_columns, comma_sep
+from .feature_store import (
+    FeatureStore,
+    to_feature_store,
+    stack_feature_stores,
+    in_memory_nbytes,
+)
+from .validation import comma_sep
 
 
 class ExternalIdIndex:
@@ -31,19 +36,87 @@ class ExternalIdIndex:
 
     It is designed to allow handling only efficient integers internally, but easily convert between
     them and the user-facing IDs.
+
+    Integer IDs are converted without hashing where possible: IDs that are a contiguous increasing
+    range (like ``range(n)``) are converted with arithmetic, and other "dense" integer IDs (where the
+    range between the smallest and largest ID is not much larger than the number of IDs) use a
+    direct lookup table. Arbitrary IDs are converted via a ``pandas.Index``.
     """
 
+    # the largest ratio between the span of integer IDs (max - min + 1) and the number of IDs for
+    # which a lookup table is used, to bound the memory used by the table
+    _DENSE_LOOKUP_MAX_RATIO = 4
+
     def __init__(self, ids):
         self._index = pd.Index(ids)
         self._dtype = np.min_scalar_type(len(self._index))
+        # `to_numpy` can be expensive (e.g. materialising a RangeIndex), so it's computed once
+        self._ids = self._index.to_numpy()
+
+        # fast paths for integer IDs, see `_init_integer_lookup`
+        self._min_id = None
+        self._lookup = None
 
-        if not self._index.is_unique:
+        if pd.api.types.is_integer_dtype(self._index.dtype) and len(self._index) > 0:
+            is_unique = self._init_integer_lookup()
+        else:
+            is_unique = self._index.is_unique
+
+        if not is_unique:
             # had some duplicated IDs, which is an error
             duplicated = self._index[self._index.duplicated()].unique()
             raise ValueError(
                 f"expected IDs to appear once, found some that appeared more: {comma_sep(duplicated)}"
             )
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # indices pickled by older versions don't have the fast paths for integer IDs
+        if "_ids" not in state:
+            self._ids = self._index.to_numpy()
+            self._min_id = None
+            self._lookup = None
+            if pd.api.types.is_integer_dtype(self._index.dtype) and len(self._ids) > 0:
+                self._init_integer_lookup()
+
+    def _init_integer_lookup(self):
+        ids = self._ids
+        min_id = int(ids.min())
+        span = int(ids.max()) - min_id + 1
+
+        # check that the IDs are unique before choosing a fast path, without hashing if possible:
+        # strictly increasing IDs are unique, and a lookup table finds any duplicates as collisions
+        strictly_increasing = bool((ids[1:] > ids[:-1]).all())
+        is_range = strictly_increasing and span == len(ids)
+
+        lookup = None
+        if not is_range and span <= self._DENSE_LOOKUP_MAX_RATIO * len(ids):
+            # a table mapping id - min_id to the iloc of that ID, or -1 if it isn't in the index
+            lookup = np.full(span, -1, dtype=np.min_scalar_type(-len(ids)))
+            lookup[ids - min_id] = np.arange(len(ids))
+
+        if strictly_increasing:
+            is_unique = True
+        elif lookup is not None:
+            # duplicated IDs are written to the same element of the table
+            is_unique = (lookup >= 0).sum() == len(ids)
+        else:
+            is_unique = self._index.is_unique
+
+        if not is_unique:
+            return False
+
+        if is_range:
+            # a contiguous range min_id, min_id + 1, ..., so iloc = id - min_id, with no table
+            # required
+            self._min_id = min_id
+        elif lookup is not None:
+            self._min_id = min_id
+            self._lookup = lookup
+        # otherwise, the IDs are too sparse for a lookup table, so fall back to hashing
+
+        return True
+
     @property
     def pandas_index(self) -> pd.Index:
         """
@@ -54,6 +127,19 @@ class ExternalIdIndex:
     def __len__(self):
         return len(self._index)
 
+    def to_array(self) -> np.ndarray:
+        """
+        Returns:
+            All of the IDs, as a numpy array where strings are stored as fixed-width unicode
+            (rather than Python objects), so that saving and loading them doesn't require pickling.
+        """
+        if self._index.dtype == object and self._index.inferred_type in (
+            "string",
+            "empty",
+        ):
+            return self._index.to_numpy().astype(str)
+        return self._index.to_numpy()
+
     def contains_external(self, id):
         """
         Whether the external ID is indexed by this ``ExternalIdIndex``.
@@ -77,6 +163,22 @@ class ExternalIdIndex:
 
             raise KeyError(missing_values)
 
+    def _integer_to_iloc(self, ids):
+        # signed and wide, so that IDs smaller than the minimum become negative rather than
+        # wrapping around (IDs larger than the int64 range wrap, but are then found to be invalid)
+        offsets = ids.astype(np.int64, copy=False) - self._min_id
+
+        if self._lookup is None:
+            size = len(self._ids)
+        else:
+            size = len(self._lookup)
+
+        in_range = (0 <= offsets) & (offsets < size)
+        if self._lookup is None:
+            return np.where(in_range, offsets, -1)
+
+        return np.where(in_range, self._lookup[np.where(in_range, offsets, 0)], -1)
+
     def to_iloc(self, ids, smaller_type=True, strict=False) -> np.ndarray:
         """
         Convert external IDs ``ids`` to integer locations.
@@ -91,7 +193,15 @@ class ExternalIdIndex:
             represented by either the largest value of the dtype (if smaller_type is True) or -1 (if
             smaller_type is False)
         """
-        internal_ids = self._index.get_indexer(ids)
+        internal_ids = None
+        if self._min_id is not None:
+            ids_array = np.asarray(ids)
+            if ids_array.dtype.kind in "iu":
+                internal_ids = self._integer_to_iloc(ids_array)
+
+        if internal_ids is None:
+            internal_ids = self._index.get_indexer(ids)
+
         if strict:
             self.require_valid(ids, internal_ids)
 
@@ -105,7 +215,23 @@ class ExternalIdIndex:
         """
         Convert integer locations to their corresponding external ID.
         """
-        return self._index.to_numpy()[internal_ids]
+        return self._ids[internal_ids]
+
+    def memory_usage(self, deep=False) -> int:
+        """
+        Compute the number of bytes of memory used by this index.
+
+        Args:
+            deep (bool): if True, include the memory used by Python objects, like strings, in an
+                ``object`` index (see ``pandas.Index.memory_usage``)
+        """
+        nbytes = self._index.memory_usage(deep=deep)
+        if isinstance(self._index, pd.RangeIndex):
+            # otherwise, `self._ids` shares its memory with the index
+            nbytes += in_memory_nbytes(self._ids)
+        if self._lookup is not None:
+            nbytes += self._lookup.nbytes
+        return nbytes
 
 
 class ElementData:
@@ -119,29 +245,41 @@ class ElementData:
     than indexing pandas dataframes, series or indices.
 
     Args:
-        shared (pandas DataFrame): information for each element
-        type_starts (list of tuple of type name, int): the starting iloc of the elements of each type within ``shared``
+        ids (sequence): the external IDs of each element
+        columns (dict of hashable to numpy array): information for each element, where each array
+            has one entry per element of ``ids``
+        type_starts (list of tuple of type name, int): the starting iloc of the elements of each type within ``ids``
     """
 
-    # any columns that must be in the `shared` dataframes passed to `__init__` (this should be
+    # any columns that must be in the `columns` dictionaries passed to `__init__` (this should be
     # overridden by subclasses as appropriate)
     _SHARED_REQUIRED_COLUMNS = []
 
-    def __init__(self, shared, type_starts):
-        if not isinstance(shared, pd.DataFrame):
-            raise TypeError(
-                f"shared: expected pandas DataFrame, found {type(shared).__name__}"
-            )
+    def __init__(self, ids, columns, type_starts):
+        if not isinstance(columns, dict):
+            raise TypeError(f"columns: expected dict, found {type(columns).__name__}")
 
-        require_dataframe_has_columns("shared", shared, self._SHARED_REQUIRED_COLUMNS)
+        if not set(self._SHARED_REQUIRED_COLUMNS).issubset(columns.keys()):
+            raise ValueError(
+                f"columns: expected {comma_sep(self._SHARED_REQUIRED_COLUMNS)} columns, found: {comma_sep(list(columns.keys()))}"
+            )
 
         if not isinstance(type_starts, list):
             raise TypeError(
                 f"type_starts: expected list, found {type(type_starts).__name__}"
             )
 
+        self._id_index = ExternalIdIndex(ids)
+        num_elements = len(self._id_index)
+
+        for name, data in columns.items():
+            if len(data) != num_elements:
+                raise ValueError(
+                    f"columns[{name!r}]: expected one value per ID, found {num_elements} IDs and {len(data)} values"
+                )
+
         type_ranges = {}
-        type_stops = type_starts[1:] + [(None, len(shared))]
+        type_stops = type_starts[1:] + [(None, num_elements)]
         consecutive_types = zip(type_starts, type_stops)
         for idx, ((type_name, start), (_, stop)) in enumerate(consecutive_types):
             if idx == 0 and start != 0:
@@ -154,8 +292,7 @@ class ElementData:
                 )
             type_ranges[type_name] = range(start, stop)
 
-        self._id_index = ExternalIdIndex(shared.index)
-        self._columns = {name: data.to_numpy() for name, data in shared.iteritems()}
+        self._columns = {name: np.asarray(data) for name, data in columns.items()}
 
         # there's typically a small number of types, so we can map them down to a small integer type
         # (usually uint8) for minimum storage requirements
@@ -166,6 +303,17 @@ class ElementData:
         self._type_column = self._type_index.to_iloc(all_types).repeat(type_sizes)
         self._type_element_ilocs = type_ranges
 
+    @property
+    def type_starts(self):
+        """
+        Returns:
+            A list of tuples of the type name and the starting iloc of the elements of that type,
+            in the form passed to the constructor.
+        """
+        return [
+            (type_name, r.start) for type_name, r in self._type_element_ilocs.items()
+        ]
+
     def __len__(self) -> int:
         return len(self._id_index)
 
@@ -219,24 +367,142 @@ class ElementData:
         type_codes = self._type_column[id_ilocs]
         return self._type_index.from_iloc(type_codes)
 
+    def memory_usage(self, deep=False):
+        """
+        Compute the number of bytes of memory used by the IDs, types and columns of these elements.
+
+        Args:
+            deep (bool): see :meth:`ExternalIdIndex.memory_usage`
+
+        Returns:
+            A dictionary mapping ``"ids"``, ``"types"`` and the name of each column to the number of
+            bytes used for it.
+        """
+        usage = {
+            "ids": self._id_index.memory_usage(deep=deep),
+            "types": self._type_index.memory_usage(deep=deep)
+            + in_memory_nbytes(self._type_column),
+        }
+        for name, data in self._columns.items():
+            usage[name] = in_memory_nbytes(data)
+        return usage
+
+    def _subset_parts(self, ilocs):
+        """
+        Compute the IDs, columns and type starts for a subset of these elements, in the form
+        required by the constructor.
+
+        Args:
+            ilocs (numpy array): the ilocs of the elements to include, which must be grouped by
+                type, with the types in the same order as in this ``ElementData``
+        """
+        counts = np.bincount(
+            self._type_column[ilocs], minlength=len(self._type_element_ilocs)
+        )
+        starts = np.cumsum(counts) - counts
+        type_starts = [
+            (type_name, int(start))
+            for type_name, start, count in zip(self._type_element_ilocs, starts, counts)
+            if count > 0
+        ]
+
+        ids = self._id_index.from_iloc(ilocs)
+        columns = {name: data[ilocs] for name, data in self._columns.items()}
+        return ids, columns, type_starts
+
+    def _merged_parts(self, other, own_columns=None):
+        """
+        Compute the IDs, columns and type starts for the elements of both this ``ElementData`` and
+        ``other``, in the form required by the constructor. The elements of each type are grouped
+        together, with those from ``other`` after the existing ones, and any new types after the
+        existing types.
+
+        Args:
+            other (ElementData): the elements to add
+            own_columns (dict, optional): columns to use for the elements of this ``ElementData``
+                instead of its own
+
+        Returns:
+            A tuple of the IDs, columns and type starts, along with a numpy array of the new ilocs
+            of the elements of this ``ElementData`` and of ``other`` (in that order).
+        """
+        if own_columns is None:
+            own_columns = self._columns
+
+        if set(own_columns.keys()) != set(other._columns.keys()):
+            raise ValueError(
+                f"other: expected columns {comma_sep(list(own_columns.keys()))}, found {comma_sep(list(other._columns.keys()))}"
+            )
+
+        all_types = list(
+            dict.fromkeys(
+                list(self._type_element_ilocs) + list(other._type_element_ilocs)
+            )
+        )
+        empty = range(0, 0)
+
+        ranges = []
+        type_starts = []
+        start = 0
+        for type_name in all_types:
+            own = self._type_element_ilocs.get(type_name, empty)
+            others = other._type_element_ilocs.get(type_name, empty)
+            ranges.append((own, others))
+            type_starts.append((type_name, start))
+            start += len(own) + len(others)
+
+        def combine(own_data, other_data, concat):
+            parts = [
+                part
+                for own, others in ranges
+                for part in (
+                    own_data[own.start : own.stop],
+                    other_data[others.start : others.stop],
+                )
+            ]
+            return concat(parts) if parts else own_data
+
+        ids = combine(
+            self._id_index.pandas_index,
+            other._id_index.pandas_index,
+            lambda parts: parts[0].append(parts[1:]),
+        )
+        columns = {
+            name: combine(data, other._columns[name], np.concatenate)
+            for name, data in own_columns.items()
+        }
+
+        # the elements are placed in order, so the new iloc of each old element is its position in
+        # the concatenation of the ranges
+        old_ilocs = combine(
+            np.arange(len(self)), np.arange(len(other)) + len(self), np.concatenate
+        )
+        new_ilocs = np.empty(len(old_ilocs), dtype=np.min_scalar_type(len(old_ilocs)))
+        new_ilocs[old_ilocs] = np.arange(len(old_ilocs))
+
+        return ids, columns, type_starts, new_ilocs
+
 
 class NodeData(ElementData):
     """
     Args:
-        shared (pandas DataFrame): information for the nodes
-        type_starts (list of tuple of type name, int): the starting iloc of the nodes of each type within ``shared``
-        features (dict of type name to numpy array): a 2D numpy or scipy array of feature vectors for the nodes of each type
+        ids (sequence): the external IDs of the nodes
+        columns (dict of hashable to numpy array): information for the nodes
+        type_starts (list of tuple of type name, int): the starting iloc of the nodes of each type within ``ids``
+        features (dict of type name to numpy array or FeatureStore): a 2D numpy or scipy array of
+            feature vectors for the nodes of each type, or a :class:`.FeatureStore` to read them
+            from (such as for features that are stored out-of-core)
     """
 
-    def __init__(self, shared, type_starts, features):
-        super().__init__(shared, type_starts)
+    def __init__(self, ids, columns, type_starts, features):
+        super().__init__(ids, columns, type_starts)
         if not isinstance(features, dict):
             raise TypeError(f"features: expected dict, found {type(features).__name__}")
 
         for key, data in features.items():
-            if not isinstance(data, (np.ndarray, sps.spmatrix)):
+            if not isinstance(data, (np.ndarray, sps.spmatrix, FeatureStore)):
                 raise TypeError(
-                    f"features[{key!r}]: expected numpy or scipy array, found {type(data).__name__}"
+                    f"features[{key!r}]: expected numpy or scipy array, or FeatureStore, found {type(data).__name__}"
                 )
 
             if len(data.shape) != 2:
@@ -251,7 +517,26 @@ class NodeData(ElementData):
                     f"features[{key!r}]: expected one feature per ID, found {expected} IDs and {rows} feature rows"
                 )
 
-        self._features = features
+        self._features = {
+            type_name: to_feature_store(data) for type_name, data in features.items()
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # node data pickled by older versions stores the features as plain arrays
+        self._features = {
+            type_name: to_feature_store(data)
+            for type_name, data in self._features.items()
+        }
+
+    def feature_store(self, type_name) -> FeatureStore:
+        """
+        Returns the store of the features for a given type.
+
+        Args:
+            type_name (hashable): the name of the type
+        """
+        return self._features[type_name]
 
     def features_of_type(self, type_name) -> np.ndarray:
         """
@@ -260,7 +545,7 @@ class NodeData(ElementData):
         Args:
             type_name (hashable): the name of the type
         """
-        return self._features[type_name]
+        return self._features[type_name].to_array()
 
     def features(self, type_name, id_ilocs) -> np.ndarray:
         """
@@ -282,11 +567,66 @@ class NodeData(ElementData):
             raise ValueError("unknown IDs")
 
         try:
-            return self._features[type_name][feature_ilocs, :]
+            return self._features[type_name].gather(feature_ilocs)
         except IndexError:
             # some of the indices were too large (from a later type)
             raise ValueError("unknown IDs")
 
+    def subset(self, ilocs) -> "NodeData":
+        """
+        Create a new ``NodeData`` containing only some of these nodes, along with their features.
+
+        Args:
+            ilocs (numpy array): the ilocs of the nodes to include, which must be grouped by type,
+                with the types in the same order as in this ``NodeData``. Types without any nodes
+                in ``ilocs`` are not included.
+
+        Returns:
+            A ``NodeData`` where the node with iloc ``i`` is the node with iloc ``ilocs[i]`` in
+            this one.
+        """
+        ids, columns, type_starts = self._subset_parts(ilocs)
+        type_stops = [start for _, start in type_starts[1:]] + [len(ilocs)]
+        features = {
+            type_name: self.features(type_name, ilocs[start:stop])
+            for (type_name, start), stop in zip(type_starts, type_stops)
+        }
+        return NodeData(ids, columns, type_starts, features)
+
+    def merge(self, other) -> "NodeData":
+        """
+        Create a ``NodeData`` with the nodes of this one, along with those of ``other``.
+
+        The new nodes are placed after the existing nodes of the same type (see
+        :meth:`EdgeData.merge`). The features of each type are combined with
+        :func:`.stack_feature_stores`, which converts the new features to the dtype of the existing
+        ones, and doesn't read features that are stored out-of-core into memory.
+
+        Args:
+            other (NodeData): the nodes to add, which must have the same number of features as
+                any existing nodes of the same type
+
+        Returns:
+            A new ``NodeData`` containing the nodes of both.
+        """
+        ids, columns, type_starts, _ = self._merged_parts(other)
+
+        features = {}
+        for type_name, _ in type_starts:
+            own = self._features.get(type_name)
+            others = other._features.get(type_name)
+            if own is None or others is None:
+                features[type_name] = own if others is None else others
+                continue
+
+            if own.shape[1] != others.shape[1]:
+                raise ValueError(
+                    f"other: expected {own.shape[1]} features for nodes of type {type_name!r}, found {others.shape[1]}"
+                )
+            features[type_name] = stack_feature_stores([own, others], own.dtype)
+
+        return NodeData(ids, columns, type_starts, features)
+
     def feature_info(self):
         """
         Returns:
@@ -298,94 +638,560 @@ class NodeData(ElementData):
             for type_name, type_features in self._features.items()
         }
 
+    def features_memory_usage(self):
+        """
+        Returns:
+             A dictionary of type name to the number of bytes of memory used by the features of
+             that type (see :meth:`.FeatureStore.memory_usage`).
+        """
+        return {
+            type_name: store.memory_usage()
+            for type_name, store in self._features.items()
+        }
+
+
+class AdjacencyIndex:
+    """
+    A compressed sparse row (CSR) index from node ilocs to a collection of values (typically edge
+    ilocs), stored as two flat numpy arrays.
+
+    The values for the node with iloc ``i`` are ``values[offsets[i]:offsets[i + 1]]``. Looking up
+    the values for a node is a slice, and so doesn't copy.
+
+    Args:
+        offsets (numpy array): the start of the values for each node, with a final element equal to
+            ``len(values)``
+        values (numpy array): the values for every node, grouped by node
+    """
+
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+
+        # when there's no values for something, an empty array should be returned; this uses a tiny
+        # dtype to minimise unnecessary type promotion (e.g. if this is used with an int32 array,
+        # the result will still be int32).
+        self._empty = np.array([], dtype=np.uint8)
+
+    @staticmethod
+    def from_keys(keys, values, size=None) -> "AdjacencyIndex":
+        """
+        Build an index that groups ``values`` by the corresponding element of ``keys``.
+
+        Within each group, the values retain their relative order from ``values``.
+
+        Args:
+            keys (numpy array): the node iloc for each value
+            values (numpy array): the values to index
+            size (int, optional): the number of nodes to include in the index, if not specified this
+                is inferred as one more than the largest key
+        """
+        keys = np.asarray(keys)
+        if size is None:
+            size = int(keys.max()) + 1 if len(keys) > 0 else 0
+
+        # a stable sort ensures the values for each key stay in their original order, so that
+        # operations like sampling are deterministic
+        order = np.argsort(keys, kind="stable")
+        counts = np.bincount(keys.astype(np.intp, copy=False), minlength=size)
+
+        offsets = np.zeros(size + 1, dtype=np.min_scalar_type(len(values)))
+        np.cumsum(counts, out=offsets[1:])
+
+        return AdjacencyIndex(offsets, np.asarray(values)[order])
+
+    def merge(self, keys, values, size=None) -> "AdjacencyIndex":
+        """
+        Build a new index with extra ``values`` added to the groups for the corresponding element
+        of ``keys``.
+
+        This requires the values within each group of this index to be sorted, and keeps them
+        sorted. The new values are merged into place with a binary search, so this avoids
+        re-sorting the existing values, unlike rebuilding the index with :meth:`from_keys`, but
+        the existing values are still copied into the new index.
+
+        Args:
+            keys (numpy array): the node iloc for each new value
+            values (numpy array): the new values to add
+            size (int, optional): the number of nodes to include in the new index, which must be at
+                least the size of this index; if not specified, this is inferred from this index and
+                ``keys``
+        """
+        keys = np.asarray(keys).astype(np.int64, copy=False)
+        values = np.asarray(values)
+        if size is None:
+            size = max(len(self), int(keys.max()) + 1 if len(keys) > 0 else 0)
+
+        order = np.lexsort((values, keys))
+        keys = keys[order]
+        values = values[order]
+
+        old_counts = self.degrees()
+        old_keys = np.repeat(np.arange(len(self), dtype=np.uint64), old_counts)
+        num_values = len(self.values) + len(values)
+        dtype = np.promote_types(self.values.dtype, values.dtype)
+        old_values = self.values.astype(dtype, copy=False)
+
+        width = 1 + max(
+            int(self.values.max()) if len(self.values) > 0 else 0,
+            int(values.max()) if len(values) > 0 else 0,
+        )
+        if size * width <= 2 ** 64:
+            # find the position of each new value within this index, by ordering all values by
+            # (key, value), with a combined integer (computed with unsigned integers, because
+            # mixing signed and unsigned ones gives inexact floats)
+            width = np.uint64(width)
+            positions = np.searchsorted(
+                old_keys * width + self.values.astype(np.uint64),
+                keys.astype(np.uint64) * width + values.astype(np.uint64),
+                side="right",
+            )
+            new_values = np.insert(old_values, positions, values)
+        else:
+            # the combined integer would overflow, so sort the (key, value) pairs directly, with
+            # new values after existing equal ones
+            all_keys = np.concatenate([old_keys, keys.astype(np.uint64)])
+            all_values = np.concatenate([old_values, values.astype(dtype, copy=False)])
+            is_new = np.repeat([False, True], [len(old_values), len(values)])
+            new_values = all_values[np.lexsort((is_new, all_values, all_keys))]
+
+        counts = np.bincount(keys, minlength=size)
+        counts[: len(self)] += old_counts
+        offsets = np.zeros(size + 1, dtype=np.min_scalar_type(num_values))
+        np.cumsum(counts, out=offsets[1:])
+
+        return AdjacencyIndex(offsets, new_values)
+
+    def with_keys(self, new_keys, size) -> "AdjacencyIndex":
+        """
+        Build a new index where the values for the node with iloc ``i`` are moved to the node with
+        iloc ``new_keys[i]``, such as after inserting nodes. This requires ``new_keys`` to be
+        increasing, so that the values don't need to be reordered (or copied).
+
+        Args:
+            new_keys (numpy array): the new iloc of each node in this index
+            size (int): the number of nodes to include in the new index
+        """
+        counts = np.zeros(size, dtype=np.int64)
+        counts[new_keys[: len(self)]] = self.degrees()
+
+        offsets = np.zeros(size + 1, dtype=np.min_scalar_type(len(self.values)))
+        np.cumsum(counts, out=offsets[1:])
+
+        return AdjacencyIndex(offsets, self.values)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def lookup(self, key) -> np.ndarray:
+        """
+        Return the values for the node with iloc ``key`` (empty for nodes without any, including
+        unknown ilocs).
+        """
+        if isinstance(key, (int, np.integer)) and 0 <= key < len(self):
+            # avoid overflow when the key is stored in a small numpy integer type
+            key = int(key)
+            return self.values[self.offsets[key] : self.offsets[key + 1]]
+
+        return self._empty
+
+    def lookup_many(self, keys):
+        """
+        Return the values for each of the nodes with ilocs ``keys``, as a ragged array.
+
+        Args:
+            keys (numpy array): the node ilocs to look up (unknown ilocs have no values)
+
+        Returns:
+            A tuple of ``(offsets, values)`` where the values for ``keys[i]`` are
+            ``values[offsets[i]:offsets[i + 1]]``.
+        """
+        # signed and wide, so that invalid ilocs can be detected and `keys + 1` can't overflow
+        keys = np.asarray(keys).astype(np.int64, copy=False)
+        valid = (keys >= 0) & (keys < len(self))
+        # invalid keys are replaced by an empty range, from `offsets[0]` to `offsets[0]`
+        starts = self.offsets[np.where(valid, keys, 0)].astype(np.int64)
+        counts = self.offsets[np.where(valid, keys + 1, 0)] - starts
 
-def _numpyise(d, dtype):
-    return {k: np.array(v, dtype=dtype) for k, v in d.items()}
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # the i-th value in the output for a key is at `starts[key] + i`
+        gather = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], counts)
+        return offsets, self.values[gather]
+
+    def degrees(self) -> np.ndarray:
+        """
+        Returns:
+            The number of values for each node, as a numpy array indexed by node iloc.
+        """
+        # the offsets may be stored in a small unsigned type, but degrees are used for arithmetic
+        # (like `degrees - 1`), which shouldn't wrap around
+        return np.diff(self.offsets.astype(np.int64, copy=False))
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            The number of bytes of memory used by this index.
+        """
+        return in_memory_nbytes(self.offsets) + in_memory_nbytes(self.values)
 
 
 class EdgeData(ElementData):
     """
     Args:
-        shared (pandas DataFrame): information for the edges
-        type_starts (list of tuple of type name, int): the starting iloc of the edges of each type within ``shared``
+        ids (sequence): the external IDs of the edges
+        columns (dict of hashable to numpy array): information for the edges, including the source
+            and target node ilocs and the weight of each edge
+        type_starts (list of tuple of type name, int): the starting iloc of the edges of each type within ``ids``
     """
 
     _SHARED_REQUIRED_COLUMNS = [SOURCE, TARGET, WEIGHT]
 
-    def __init__(self, shared, type_starts):
-        super().__init__(shared, type_starts)
+    def __init__(self, ids, columns, type_starts):
+        super().__init__(ids, columns, type_starts)
+        self._compact_endpoints()
 
         # cache these columns to avoid having to do more method and dict look-ups
         self.sources = self._column(SOURCE)
         self.targets = self._column(TARGET)
         self.weights = self._column(WEIGHT)
 
+        self._init_lazy()
+
+    def _init_lazy(self):
         # These are lazily initialized, to only pay the (construction) time and memory cost when
         # actually using them
-        self._edges_dict = self._edges_in_dict = self._edges_out_dict = None
+        self._edges_index = self._edges_in_index = self._edges_out_index = None
+        self._typed_indices = {}
+        self._degrees = {}
+        self._pair_indices = {}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # edge data pickled by older versions has adjacency dicts instead of indices, and doesn't
+        # have some of the lazily-initialized indices
+        for name in [
+            "_edges_dict",
+            "_edges_in_dict",
+            "_edges_out_dict",
+            "_empty_ilocs",
+        ]:
+            self.__dict__.pop(name, None)
+        if not all(
+            name in state
+            for name in ["_edges_index", "_typed_indices", "_degrees", "_pair_indices"]
+        ):
+            self._init_lazy()
+
+    def _compact_endpoints(self):
+        # the source and target ilocs are stored with the smallest unsigned type that holds them,
+        # which is typically already the case (in which case they're used without copying)
+        sources = self._columns[SOURCE]
+        targets = self._columns[TARGET]
+        if len(sources) == 0:
+            return
+
+        if sources.dtype.kind not in "iu" or targets.dtype.kind not in "iu":
+            raise TypeError(
+                f"columns: expected integer source and target ilocs, found dtypes '{sources.dtype}' and '{targets.dtype}'"
+            )
+        if min(sources.min(), targets.min()) < 0:
+            raise ValueError(
+                "columns: expected non-negative source and target ilocs, found some negative"
+            )
 
-        # when there's no neighbors for something, an empty array should be returned; this uses a
-        # tiny dtype to minimise unnecessary type promotion (e.g. if this is used with an int32
-        # array, the result will still be int32).
-        self._empty_ilocs = np.array([], dtype=np.uint8)
+        iloc_dtype = np.min_scalar_type(int(max(sources.max(), targets.max())))
+        for name, ilocs in [(SOURCE, sources), (TARGET, targets)]:
+            if ilocs.dtype.kind == "i" or ilocs.dtype.itemsize > iloc_dtype.itemsize:
+                self._columns[name] = ilocs.astype(iloc_dtype)
 
-    def _init_directed_adj_lists(self):
-        # record the edge ilocs of incoming, outgoing and both-direction edges
-        in_dict = {}
-        out_dict = {}
+    def adj_index_memory_usage(self):
+        """
+        Returns:
+            A dictionary mapping ``"ins and outs"``, ``"ins"`` and ``"outs"`` to the number of bytes
+            of memory used by the corresponding adjacency index (see :meth:`adj_index`), and
+            ``"typed"`` to the total for all typed adjacency indices (see
+            :meth:`typed_adj_indices`), and ``"degrees"`` to the total for all cached degree
+            arrays (see :meth:`degrees`) and ``"pairs"`` to the total for the sorted node pair
+            indices (see :meth:`edge_ilocs_between`). Values that haven't been computed use 0
+            bytes.
+        """
+        indices = {
+            "ins and outs": self._edges_index,
+            "ins": self._edges_in_index,
+            "outs": self._edges_out_index,
+        }
+        usage = {
+            name: 0 if index is None else index.memory_usage()
+            for name, index in indices.items()
+        }
+        usage["typed"] = sum(
+            index.memory_usage()
+            for typed in self._typed_indices.values()
+            for index in typed.values()
+        )
+        usage["degrees"] = sum(
+            in_memory_nbytes(degrees) for degrees in self._degrees.values()
+        )
+        usage["pairs"] = sum(
+            in_memory_nbytes(keys) + in_memory_nbytes(order)
+            for keys, order in self._pair_indices.values()
+        )
+        return usage
 
-        for i, (src, tgt) in enumerate(zip(self.sources, self.targets)):
-            in_dict.setdefault(tgt, []).append(i)
-            out_dict.setdefault(src, []).append(i)
+    def _adj_size(self):
+        # every node with an edge needs an entry in the adjacency indices; isolated nodes after the
+        # last one with an edge are handled by the lookups being bounds-checked
+        if len(self.sources) == 0:
+            return 0
+        return int(max(self.sources.max(), self.targets.max())) + 1
 
-        dtype = np.min_scalar_type(len(self.sources))
-        self._edges_in_dict = _numpyise(in_dict, dtype=dtype)
-        self._edges_out_dict = _numpyise(out_dict, dtype=dtype)
+    def _edge_ilocs_array(self, count):
+        return np.arange(count, dtype=np.min_scalar_type(len(self.sources)))
 
-    def _init_undirected_adj_lists(self):
-        # record the edge ilocs of incoming, outgoing and both-direction edges
-        undirected = {}
+    def _init_directed_adj_lists(self):
+        # record the edge ilocs of incoming and outgoing edges
+        size = self._adj_size()
+        edge_ilocs = self._edge_ilocs_array(len(self.sources))
 
-        for i, (src, tgt) in enumerate(zip(self.sources, self.targets)):
-            undirected.setdefault(tgt, []).append(i)
-            if src != tgt:
-                undirected.setdefault(src, []).append(i)
+        self._edges_in_index = AdjacencyIndex.from_keys(self.targets, edge_ilocs, size)
+        self._edges_out_index = AdjacencyIndex.from_keys(self.sources, edge_ilocs, size)
 
-        dtype = np.min_scalar_type(len(self.sources))
-        self._edges_dict = _numpyise(undirected, dtype=dtype)
+    def _init_undirected_adj_lists(self):
+        # record the edge ilocs of both-direction edges: each edge is recorded against its target
+        # and its source, except for self loops which are only recorded once. Interleaving the two
+        # endpoints of each edge means the edge ilocs are increasing, and so they stay in order for
+        # each node after the stable sort.
+        size = self._adj_size()
+        keys = np.column_stack([self.targets, self.sources]).ravel()
+        edge_ilocs = self._edge_ilocs_array(len(self.sources)).repeat(2)
+
+        not_self_loop = np.ones(len(keys), dtype=bool)
+        not_self_loop[1::2] = self.sources != self.targets
+
+        self._edges_index = AdjacencyIndex.from_keys(
+            keys[not_self_loop], edge_ilocs[not_self_loop], size
+        )
+
+    def adj_index(self, *, ins, outs) -> AdjacencyIndex:
+        """
+        Return the index from node ilocs to the ilocs of their edges, computing it if required.
 
-    def _adj_lookup(self, *, ins, outs):
+        Args:
+            ins (bool): include incoming edges
+            outs (bool): include outgoing edges
+        """
         if ins and outs:
-            if self._edges_dict is None:
+            if self._edges_index is None:
                 self._init_undirected_adj_lists()
-            return self._edges_dict
+            return self._edges_index
         if ins:
-            if self._edges_in_dict is None:
+            if self._edges_in_index is None:
                 self._init_directed_adj_lists()
-            return self._edges_in_dict
+            return self._edges_in_index
         if outs:
-            if self._edges_out_dict is None:
+            if self._edges_out_index is None:
                 self._init_directed_adj_lists()
-            return self._edges_out_dict
+            return self._edges_out_index
 
         raise ValueError(
             "expected at least one of 'ins' or 'outs' to be True, found neither"
         )
 
-    def degrees(self, *, ins=True, outs=True):
+    def set_adj_index(self, index, *, ins, outs):
+        """
+        Use a precomputed index from node ilocs to the ilocs of their edges (for instance, one
+        loaded from disk), instead of computing it lazily.
+
+        Args:
+            index (AdjacencyIndex): the index, as would be returned by :meth:`adj_index`
+            ins (bool): whether ``index`` includes incoming edges
+            outs (bool): whether ``index`` includes outgoing edges
+        """
+        if ins and outs:
+            self._edges_index = index
+        elif ins:
+            self._edges_in_index = index
+        elif outs:
+            self._edges_out_index = index
+        else:
+            raise ValueError(
+                "expected at least one of 'ins' or 'outs' to be True, found neither"
+            )
+
+    def _init_typed_adj_indices(self, node_type_ilocs, *, ins, outs, by_relation):
+        size = self._adj_size()
+        sources = self.sources
+        targets = self.targets
+        rels = self.type_ilocs
+        edge_ilocs = np.arange(len(sources))
+
+        # each edge is recorded against its source (outs) and/or its target (ins), with the other
+        # endpoint as the neighbour; self loops are only recorded once when including both
+        keys = []
+        neighbours = []
+        relations = []
+        ilocs = []
+        if outs:
+            keys.append(sources)
+            neighbours.append(targets)
+            relations.append(rels)
+            ilocs.append(edge_ilocs)
+        if ins:
+            selected = sources != targets if outs else slice(None)
+            keys.append(targets[selected])
+            neighbours.append(sources[selected])
+            relations.append(rels[selected])
+            ilocs.append(edge_ilocs[selected])
+
+        keys = np.concatenate(keys)
+        neighbours = np.concatenate(neighbours)
+        key_types = node_type_ilocs[keys]
+        neighbour_types = node_type_ilocs[neighbours]
+
+        if by_relation:
+            # the neighbours of each node are sorted as strings, like earlier versions (which
+            # sorted lists with `key=str`), so that seeded sampling gives the same results
+            unique, inverse = np.unique(neighbours, return_inverse=True)
+            str_rank = np.empty(len(unique), dtype=np.int64)
+            str_rank[np.argsort(unique.astype(str), kind="stable")] = np.arange(
+                len(unique)
+            )
+            within = str_rank[inverse]
+            group_keys = [key_types, np.concatenate(relations), neighbour_types]
+        else:
+            # the neighbours of each node are in edge order, like `StellarGraph.neighbors`
+            within = np.concatenate(ilocs)
+            group_keys = [key_types, neighbour_types]
+
+        # sort by (type group, key, neighbour order) all at once, so that each group is a
+        # contiguous block and the neighbours of each node are in a deterministic order
+        order = np.lexsort([within, keys] + group_keys[::-1])
+        groups = np.column_stack(group_keys)[order]
+        keys = keys[order]
+        neighbours = neighbours[order]
+
+        if len(groups) == 0:
+            return {}
+
+        (boundaries,) = np.nonzero(np.any(groups[1:] != groups[:-1], axis=1))
+        starts = np.concatenate([[0], boundaries + 1])
+        stops = np.concatenate([boundaries + 1, [len(groups)]])
+
+        return {
+            tuple(int(t) for t in groups[start]): AdjacencyIndex.from_keys(
+                keys[start:stop], neighbours[start:stop], size
+            )
+            for start, stop in zip(starts, stops)
+        }
+
+    def typed_adj_indices(self, node_type_ilocs, *, ins, outs, by_relation=True):
         """
-        Compute the degrees of every non-isolated node.
+        Return an index from node ilocs to the ilocs of their neighbours, separately for each edge
+        type triple, computing it if required.
+
+        Each triple is ``(node type, relation type, neighbour type)`` as type ilocs, where the
+        nodes used as keys have the first node type, and their neighbours the second one. With
+        ``outs``, an edge from a source to a target is recorded against the source, under the
+        triple ``(source type, relation, target type)``, and with ``ins`` it is recorded against
+        the target, under ``(target type, relation, source type)``. The neighbours of each node
+        are sorted by the string representation of their iloc (for example, 10 is before 2).
+
+        With ``by_relation=False``, the edges of all relation types are combined, giving an index
+        for each ``(node type, neighbour type)`` pair, and the neighbours of each node are in the
+        order of the edges (like :meth:`edge_ilocs`).
+
+        Args:
+            node_type_ilocs (numpy array): the type iloc of each node, indexed by node iloc
+            ins (bool): include incoming edges
+            outs (bool): include outgoing edges
+            by_relation (bool): if True, separate the edges by relation type
+
+        Returns:
+            A dictionary mapping each triple (or pair) of type ilocs that has at least one edge to
+            an :class:`AdjacencyIndex`.
+        """
+        if not (ins or outs):
+            raise ValueError(
+                "expected at least one of 'ins' or 'outs' to be True, found neither"
+            )
+
+        key = (ins, outs, by_relation)
+        indices = self._typed_indices.get(key)
+        if indices is None:
+            indices = self._init_typed_adj_indices(
+                node_type_ilocs, ins=ins, outs=outs, by_relation=by_relation
+            )
+            self._typed_indices[key] = indices
+        return indices
+
+    def _compute_degrees(self, *, ins, outs, weighted, edge_types, size):
+        if edge_types is None:
+            selectors = [slice(None)]
+        else:
+            ranges = (self.type_range(type_name) for type_name in edge_types)
+            selectors = [slice(r.start, r.stop) for r in ranges]
+
+        degrees = np.zeros(size, dtype=np.float64 if weighted else np.int64)
+        for selector in selectors:
+            sources = self.sources[selector].astype(np.intp, copy=False)
+            targets = self.targets[selector].astype(np.intp, copy=False)
+            weights = self.weights[selector] if weighted else None
+
+            if outs:
+                degrees += np.bincount(sources, weights=weights, minlength=size)
+            if ins:
+                if outs:
+                    # self loops are only counted once, matching `adj_index`
+                    not_self_loop = sources != targets
+                    targets = targets[not_self_loop]
+                    if weighted:
+                        weights = weights[not_self_loop]
+
+                degrees += np.bincount(targets, weights=weights, minlength=size)
+
+        return degrees
+
+    def degrees(
+        self, *, ins=True, outs=True, weighted=False, edge_types=None, size=None
+    ):
+        """
+        Compute the degrees of every node, by counting the source and target columns directly,
+        caching the result.
 
         Args:
             ins (bool): count incoming edges
             outs (bool): count outgoing edges
+            weighted (bool): if True, sum the weights of the edges, instead of counting them
+            edge_types (list of hashable, optional): if provided, only count edges of these types
+            size (int, optional): the length of the result, which must be larger than every node
+                iloc with an edge; if not specified, this is one more than the largest such iloc
 
         Returns:
-            The in-, out- or total (summed) degree of all non-isolated nodes as a numpy array (if
+            The in-, out- or total (summed) degree of each node as a read-only numpy array (if
             ``ret`` is the return value, ``ret[i]`` is the degree of the node with iloc ``i``)
         """
-        adj = self._adj_lookup(ins=ins, outs=outs)
-        return defaultdict(int, ((key, len(value)) for key, value in adj.items()))
+        if not (ins or outs):
+            raise ValueError(
+                "expected at least one of 'ins' or 'outs' to be True, found neither"
+            )
+
+        if edge_types is not None:
+            edge_types = tuple(dict.fromkeys(edge_types))
+        if size is None:
+            size = self._adj_size()
+
+        key = (ins, outs, weighted, edge_types, size)
+        degrees = self._degrees.get(key)
+        if degrees is None:
+            degrees = self._compute_degrees(
+                ins=ins, outs=outs, weighted=weighted, edge_types=edge_types, size=size
+            )
+            degrees.flags.writeable = False
+            self._degrees[key] = degrees
+
+        return degrees
 
     def edge_ilocs(self, node_id, *, ins, outs) -> np.ndarray:
         """
@@ -399,4 +1205,205 @@ class EdgeData(ElementData):
             The integer locations of the edges for the given node_id.
         """
 
-        return self._adj_lookup(ins=ins, outs=outs).get(node_id, self._empty_ilocs)
+        return self.adj_index(ins=ins, outs=outs).lookup(node_id)
+
+    def induced_edge_ilocs(self, node_ilocs, *, ins, outs):
+        """
+        Find the edges where both the source and target are in ``node_ilocs``.
+
+        This uses the adjacency index for ``ins`` and ``outs`` (see :meth:`adj_index`) to only
+        consider the edges incident to ``node_ilocs``, rather than every edge.
+
+        Args:
+            node_ilocs: the ilocs of the nodes, where invalid ilocs are ignored
+
+        Returns:
+            A sorted numpy array of the ilocs of the edges between the nodes, with no duplicates.
+        """
+        _, candidates = self.edge_ilocs_batch(node_ilocs, ins=ins, outs=outs)
+
+        if ins and outs:
+            # an edge between two of the nodes is incident to both of them
+            candidates = np.unique(candidates)
+        else:
+            candidates = np.sort(candidates)
+
+        # candidates from the out (respectively, in) index already have their source (target) in
+        # `node_ilocs`, so only the other end needs to be checked
+        selected = np.ones(len(candidates), dtype=bool)
+        if ins:
+            selected &= np.isin(self.sources[candidates], node_ilocs)
+        if outs:
+            selected &= np.isin(self.targets[candidates], node_ilocs)
+
+        return candidates[selected]
+
+    def subset(self, ilocs, node_ilocs) -> "EdgeData":
+        """
+        Create a new ``EdgeData`` containing only some of these edges.
+
+        Args:
+            ilocs (numpy array): the ilocs of the edges to include, which must be grouped by type,
+                with the types in the same order as in this ``EdgeData``. Types without any edges
+                in ``ilocs`` are not included.
+            node_ilocs (numpy array): the nodes of the new graph, where the node with iloc ``i``
+                in the new graph is the node with iloc ``node_ilocs[i]`` in this one. This must
+                contain every source and target of the edges in ``ilocs``.
+
+        Returns:
+            An ``EdgeData`` where the edge with iloc ``i`` is the edge with iloc ``ilocs[i]`` in
+            this one.
+        """
+        ids, columns, type_starts = self._subset_parts(ilocs)
+
+        node_index = ExternalIdIndex(node_ilocs)
+        columns[SOURCE] = node_index.to_iloc(columns[SOURCE], strict=True)
+        columns[TARGET] = node_index.to_iloc(columns[TARGET], strict=True)
+        return EdgeData(ids, columns, type_starts)
+
+    def edge_ilocs_batch(self, node_ilocs, *, ins, outs):
+        """
+        Return the integer locations of the edges for each of the given node ilocs.
+
+        Args:
+            node_ilocs: the ilocs of the nodes
+
+        Returns:
+            A tuple of ``(offsets, edge_ilocs)``, where the edges of ``node_ilocs[i]`` are
+            ``edge_ilocs[offsets[i]:offsets[i + 1]]``.
+        """
+        return self.adj_index(ins=ins, outs=outs).lookup_many(node_ilocs)
+
+    def _adj_keys_and_edge_ilocs(self, edge_ilocs, *, ins, outs):
+        # the keys (node ilocs) and values (edge ilocs) that `adj_index` records for some edges
+        sources = self.sources[edge_ilocs]
+        targets = self.targets[edge_ilocs]
+        if ins and outs:
+            not_self_loop = sources != targets
+            keys = np.concatenate([sources, targets[not_self_loop]])
+            values = np.concatenate([edge_ilocs, edge_ilocs[not_self_loop]])
+            return keys, values
+        if ins:
+            return targets, edge_ilocs
+        return sources, edge_ilocs
+
+    def merge(self, other, node_ilocs=None):
+        """
+        Create an ``EdgeData`` with the edges of this one, along with those of ``other``.
+
+        The new edges are placed after the existing edges of the same type (so the existing edges
+        of later types have new ilocs). Any adjacency index that has already been computed for this
+        ``EdgeData`` is merged with the new edges (see :meth:`AdjacencyIndex.merge`), which gives
+        the same result as recomputing it without re-sorting the existing edges. The columns and
+        indices are copied, so this takes time proportional to the total number of edges.
+
+        Args:
+            other (EdgeData): the edges to add, which must refer to the same nodes, or to the nodes
+                after they are renumbered by ``node_ilocs``
+            node_ilocs (numpy array, optional): if nodes have been inserted (see
+                :meth:`NodeData.merge`), the new iloc of each node that the edges of this
+                ``EdgeData`` refer to, which must be increasing
+
+        Returns:
+            A new ``EdgeData`` containing the edges of both.
+        """
+        own_columns = None
+        if node_ilocs is not None:
+            own_columns = dict(self._columns)
+            own_columns[SOURCE] = node_ilocs[self.sources]
+            own_columns[TARGET] = node_ilocs[self.targets]
+
+        ids, columns, type_starts, new_ilocs = self._merged_parts(other, own_columns)
+        merged = EdgeData(ids, columns, type_starts)
+
+        own_new_ilocs = new_ilocs[: len(self)]
+        added_new_ilocs = new_ilocs[len(self) :]
+        size = merged._adj_size()
+
+        directions = {
+            (True, True): self._edges_index,
+            (True, False): self._edges_in_index,
+            (False, True): self._edges_out_index,
+        }
+        for (ins, outs), index in directions.items():
+            if index is None:
+                continue
+
+            # renumber the existing edges, which preserves their order, and then merge the new ones
+            renumbered = AdjacencyIndex(index.offsets, own_new_ilocs[index.values])
+            if node_ilocs is not None:
+                renumbered = renumbered.with_keys(node_ilocs, size)
+            keys, values = merged._adj_keys_and_edge_ilocs(
+                added_new_ilocs, ins=ins, outs=outs
+            )
+            merged.set_adj_index(
+                renumbered.merge(keys, values, size), ins=ins, outs=outs
+            )
+
+        return merged
+
+    @staticmethod
+    def _pair_keys(sources, targets, size, directed):
+        # a composite key for each (source, target) pair, where an undirected edge is keyed by its
+        # endpoints in ascending order, so that it matches in both directions
+        if not directed:
+            sources, targets = (
+                np.minimum(sources, targets),
+                np.maximum(sources, targets),
+            )
+        return sources.astype(np.uint64) * np.uint64(size) + targets.astype(np.uint64)
+
+    def _pair_index(self, directed):
+        index = self._pair_indices.get(directed)
+        if index is None:
+            keys = self._pair_keys(
+                self.sources, self.targets, self._adj_size(), directed
+            )
+            # a stable sort keeps the edges between each pair in increasing iloc order
+            order = np.argsort(keys, kind="stable")
+            index = keys[order], order.astype(np.min_scalar_type(len(order)))
+            self._pair_indices[directed] = index
+        return index
+
+    def edge_ilocs_between(self, sources, targets, *, directed):
+        """
+        Return the integer locations of the edges between each of the given pairs of nodes, using a
+        sorted index of the ``(source, target)`` pair of every edge that is computed if required.
+
+        Args:
+            sources (numpy array): the ilocs of the source node of each pair
+            targets (numpy array): the ilocs of the target node of each pair, with the same shape
+                as ``sources``
+            directed (bool): if True, only find edges from the source to the target, otherwise
+                find edges in either direction
+
+        Returns:
+            A tuple of ``(offsets, edge_ilocs)``, where the edges between ``sources[i]`` and
+            ``targets[i]`` are ``edge_ilocs[offsets[i]:offsets[i + 1]]``, in increasing order.
+            Pairs that include unknown ilocs (such as -1) have no edges.
+        """
+        # signed and wide, so that invalid ilocs can be detected
+        sources = np.asarray(sources).astype(np.int64, copy=False).ravel()
+        targets = np.asarray(targets).astype(np.int64, copy=False).ravel()
+        if sources.shape != targets.shape:
+            raise ValueError(
+                f"targets: expected the same number of nodes as sources ({len(sources)}), found {len(targets)}"
+            )
+
+        size = self._adj_size()
+        valid = (sources >= 0) & (sources < size) & (targets >= 0) & (targets < size)
+        keys = self._pair_keys(
+            np.where(valid, sources, 0), np.where(valid, targets, 0), size, directed
+        )
+
+        sorted_keys, order = self._pair_index(directed)
+        starts = np.searchsorted(sorted_keys, keys, side="left")
+        stops = np.searchsorted(sorted_keys, keys, side="right")
+        counts = np.where(valid, stops - starts, 0)
+
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # the i-th edge for a pair is at `starts[pair] + i` in the sorted index
+        gather = np.arange(offsets[-1]) + np.repeat(starts - offsets[:-1], counts)
+        return offsets, order[gather]
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bulk export of the element_data.py types to other formats (SciPy, Apache Arrow, Parquet and
+NumPy ``.npz``), operating on whole columns rather than on each node or edge individually.
+"""
+
+import numpy as np
+import scipy.sparse as sps
+
+from ..globalvar import SOURCE, TARGET, WEIGHT
+from .element_data import NodeData, EdgeData
+
+ID = "id"
+TYPE = "type"
+FEATURES = "features"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            f"{e.msg}. Exporting to Arrow or Parquet requires the 'pyarrow' module; please install it",
+            name=e.name,
+            path=e.path,
+        ) from None
+
+    return pyarrow
+
+
+def to_coo(nodes: NodeData, edges: EdgeData):
+    """
+    Create a SciPy COO matrix with one entry per edge, in order of the edge ilocs (multiple edges
+    between the same nodes are not summed), with the weights as the data.
+
+    Returns:
+        A tuple of the matrix and the edge type iloc of each edge.
+    """
+    num_nodes = len(nodes)
+    matrix = sps.coo_matrix(
+        (edges.weights, (edges.sources, edges.targets)), shape=(num_nodes, num_nodes)
+    )
+    return matrix, edges.type_ilocs
+
+
+def _arrow_types(pa, element_data):
+    # dictionary encoded, so that the type names are stored once
+    return pa.DictionaryArray.from_arrays(
+        element_data.type_ilocs.astype(np.int32),
+        pa.array(element_data.types.from_iloc(slice(None))),
+    )
+
+
+def _arrow_features(pa, nodes):
+    # every type's features, flattened and concatenated in iloc order, which is grouped by type
+    features = []
+    for type_name in nodes.types.pandas_index:
+        type_features = nodes.features_of_type(type_name)
+        if sps.issparse(type_features):
+            type_features = type_features.toarray()
+        features.append(type_features)
+
+    if not features:
+        return pa.array([], type=pa.list_(pa.float32()))
+
+    widths = np.concatenate(
+        [
+            np.full(len(type_features), type_features.shape[1])
+            for type_features in features
+        ]
+    )
+    flat = pa.array(np.concatenate([f.ravel() for f in features]))
+
+    if (widths == features[0].shape[1]).all():
+        return pa.FixedSizeListArray.from_arrays(flat, features[0].shape[1])
+
+    offsets = np.concatenate([[0], np.cumsum(widths)]).astype(np.int32)
+    return pa.ListArray.from_arrays(pa.array(offsets), flat)
+
+
+def to_arrow(nodes: NodeData, edges: EdgeData, include_features, use_ilocs):
+    """
+    Create Apache Arrow tables of the nodes and of the edges.
+
+    Returns:
+        A tuple of the node table and the edge table.
+    """
+    pa = _pyarrow()
+
+    node_columns = {
+        ID: np.arange(len(nodes)) if use_ilocs else nodes.ids.from_iloc(slice(None)),
+        TYPE: _arrow_types(pa, nodes),
+    }
+    if include_features:
+        node_columns[FEATURES] = _arrow_features(pa, nodes)
+
+    sources = edges.sources
+    targets = edges.targets
+    if not use_ilocs:
+        sources = nodes.ids.from_iloc(sources)
+        targets = nodes.ids.from_iloc(targets)
+
+    edge_columns = {
+        ID: np.arange(len(edges)) if use_ilocs else edges.ids.from_iloc(slice(None)),
+        SOURCE: sources,
+        TARGET: targets,
+        TYPE: _arrow_types(pa, edges),
+        WEIGHT: edges.weights,
+    }
+
+    return pa.table(node_columns), pa.table(edge_columns)
+
+
+def to_parquet(
+    nodes: NodeData,
+    edges: EdgeData,
+    nodes_path,
+    edges_path,
+    include_features,
+    use_ilocs,
+):
+    """
+    Write the nodes and the edges to Parquet files.
+    """
+    node_table, edge_table = to_arrow(nodes, edges, include_features, use_ilocs)
+
+    import pyarrow.parquet as pq
+
+    pq.write_table(node_table, nodes_path)
+    pq.write_table(edge_table, edges_path)
+
+
+def to_npz(path, nodes: NodeData, edges: EdgeData, is_directed, compressed):
+    """
+    Write the edge list of the graph, along with the node IDs and the type names, to a single NumPy
+    ``.npz`` file.
+    """
+    save = np.savez_compressed if compressed else np.savez
+    # (strings are saved as fixed-width unicode, so that loading doesn't require unpickling)
+    save(
+        path,
+        node_ids=nodes.ids.to_array(),
+        node_types=nodes.types.to_array(),
+        node_type_ilocs=nodes.type_ilocs,
+        edge_ids=edges.ids.to_array(),
+        edge_types=edges.types.to_array(),
+        edge_type_ilocs=edges.type_ilocs,
+        sources=edges.sources,
+        targets=edges.targets,
+        weights=edges.weights,
+        is_directed=is_directed,
+    )
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Storage for the feature vectors of nodes, that allows the features to be held in memory, or
+out-of-core in a memory-mapped or chunked file.
+
+"""
+__all__ = [
+    "FeatureStore",
+    "ArrayFeatureStore",
+    "ChunkedFeatureStore",
+    "StackedFeatureStore",
+]
+
+from abc import ABC, abstractmethod
+import itertools
+import mmap
+
+import numpy as np
+import scipy.sparse as sps
+
+
+class FeatureStore(ABC):
+    """
+    Abstract base class for the storage of the feature vectors of the nodes of a single type, as a
+    2D matrix with one row per node (in the order of the :ref:`node ilocs <iloc-explanation>` within
+    the type).
+
+    A ``FeatureStore`` must implement the ``shape`` and ``dtype`` properties, and the ``gather``
+    method to read a selection of rows.
+    """
+
+    @property
+    @abstractmethod
+    def shape(self):
+        """
+        Returns:
+            The ``(rows, columns)`` shape of the feature matrix.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def dtype(self):
+        """
+        Returns:
+            The numpy dtype of the features.
+        """
+        pass
+
+    @abstractmethod
+    def gather(self, rows) -> np.ndarray:
+        """
+        Read the feature vectors for some rows.
+
+        Args:
+            rows (numpy array): the indices of the rows to read, which may be repeated and in any
+                order. Indices that are out of bounds raise an ``IndexError``.
+
+        Returns:
+            A numpy array of the features of each row, with shape ``rows.shape + (columns,)``.
+        """
+        pass
+
+    def to_array(self):
+        """
+        Returns:
+            The whole feature matrix, as a numpy or scipy array.
+        """
+        return self.gather(np.arange(self.shape[0]))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            The number of bytes of memory used to hold the features. This is 0 for features that
+            are stored out-of-core, which is the default for stores that don't override it.
+        """
+        return 0
+
+
+def _is_memory_mapped(array):
+    # views of a memory-mapped array have it (or the underlying `mmap`) as their base
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return isinstance(array, mmap.mmap)
+
+
+def in_memory_nbytes(data) -> int:
+    """
+    Compute the number of bytes of memory used by a numpy array or scipy sparse matrix.
+
+    Memory-mapped arrays (such as those from :meth:`.StellarGraph.load`) are counted as 0 bytes,
+    because they are paged in and out of memory by the operating system, as required.
+    """
+    if isinstance(data, sps.spmatrix):
+        parts = [
+            getattr(data, name, None)
+            for name in ["data", "indices", "indptr", "row", "col", "offsets"]
+        ]
+        return sum(
+            in_memory_nbytes(part) for part in parts if isinstance(part, np.ndarray)
+        )
+
+    if _is_memory_mapped(data):
+        return 0
+
+    return data.nbytes
+
+
+def _check_rows(rows, num_rows):
+    if rows.size > 0 and (rows.min() < 0 or rows.max() >= num_rows):
+        raise IndexError(
+            f"rows: expected indices in the range [0, {num_rows}), found some outside it"
+        )
+
+
+def _sorted_unique_rows(rows):
+    return np.unique(rows.ravel(), return_inverse=True)
+
+
+class ArrayFeatureStore(FeatureStore):
+    """
+    A :class:`FeatureStore` backed by a numpy array (including a ``numpy.memmap``) or a scipy
+    sparse matrix.
+
+    Args:
+        data (numpy or scipy array): the 2D feature matrix
+        sorted_reads (bool, optional): if True, :meth:`gather` reads each requested row once, in
+            increasing order, so that reading from a memory-mapped file is sequential. If not
+            specified, this is enabled only for ``numpy.memmap`` arrays.
+    """
+
+    def __init__(self, data, sorted_reads=None):
+        if not isinstance(data, (np.ndarray, sps.spmatrix)):
+            raise TypeError(
+                f"data: expected numpy or scipy array, found {type(data).__name__}"
+            )
+
+        if sorted_reads is None:
+            sorted_reads = isinstance(data, np.memmap)
+
+        if sorted_reads and not isinstance(data, np.ndarray):
+            raise ValueError(
+                f"sorted_reads: expected False for non-numpy data, found {sorted_reads!r}"
+            )
+
+        self._data = data
+        self._sorted_reads = sorted_reads
+
+    @property
+    def shape(self):
+        return self._data.shape
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    def gather(self, rows):
+        if not self._sorted_reads:
+            return self._data[rows, :]
+
+        rows = np.asarray(rows)
+        _check_rows(rows, self.shape[0])
+        unique, inverse = _sorted_unique_rows(rows)
+        # `np.asarray` ensures the result is a normal in-memory array, not another memmap
+        sampled = np.asarray(self._data[unique, :])
+        return sampled[inverse].reshape(rows.shape + (self.shape[1],))
+
+    def to_array(self):
+        return self._data
+
+    def memory_usage(self):
+        return in_memory_nbytes(self._data)
+
+
+class ChunkedFeatureStore(FeatureStore):
+    """
+    A :class:`FeatureStore` backed by a chunked, typically on-disk, array such as a
+    ``h5py.Dataset`` or a ``zarr.Array``.
+
+    The rows requested in each call to :meth:`gather` are deduplicated and sorted, and then read
+    with one contiguous slice per chunk of rows, so that the underlying storage sees a small number
+    of sequential reads.
+
+    Args:
+        data (array-like): a 2D array with ``shape`` and ``dtype`` attributes, that supports reading
+            a contiguous range of rows with ``data[start:stop]``
+        chunk_rows (int, optional): the number of rows in each chunk. If not specified, this is
+            taken from ``data.chunks`` (as available for HDF5 and zarr), or defaults to 1024.
+    """
+
+    def __init__(self, data, chunk_rows=None):
+        if len(data.shape) != 2:
+            raise ValueError(
+                f"data: expected 2 dimensions, found {len(data.shape)} dimensions"
+            )
+
+        if chunk_rows is None:
+            chunks = getattr(data, "chunks", None)
+            chunk_rows = chunks[0] if chunks else 1024
+
+        if chunk_rows < 1:
+            raise ValueError(
+                f"chunk_rows: expected a positive integer, found {chunk_rows}"
+            )
+
+        self._data = data
+        self._chunk_rows = chunk_rows
+
+    @property
+    def shape(self):
+        return tuple(self._data.shape)
+
+    @property
+    def dtype(self):
+        return np.dtype(self._data.dtype)
+
+    def gather(self, rows):
+        rows = np.asarray(rows)
+        _check_rows(rows, self.shape[0])
+
+        num_columns = self.shape[1]
+        unique, inverse = _sorted_unique_rows(rows)
+        sampled = np.empty((len(unique), num_columns), dtype=self.dtype)
+
+        # split the sorted rows into the groups that fall into each chunk, and read each group with
+        # a single slice
+        chunk_ids = unique // self._chunk_rows
+        (boundaries,) = np.nonzero(np.diff(chunk_ids))
+        group_starts = np.concatenate([[0], boundaries + 1])
+        group_stops = np.concatenate([boundaries + 1, [len(unique)]])
+
+        if len(unique) == 0:
+            group_starts = group_stops = []
+
+        for group_start, group_stop in zip(group_starts, group_stops):
+            group = unique[group_start:group_stop]
+            first, last = group[0], group[-1]
+            block = np.asarray(self._data[first : last + 1])
+            sampled[group_start:group_stop] = block[group - first]
+
+        return sampled[inverse].reshape(rows.shape + (num_columns,))
+
+    def to_array(self):
+        return np.asarray(self._data[:])
+
+
+class StackedFeatureStore(FeatureStore):
+    """
+    A :class:`FeatureStore` that reads from several other stores with the same number of columns,
+    with the rows of each store after those of the previous one, such as when nodes are added to a
+    graph with features that are stored out-of-core (see :meth:`.StellarGraph.with_added_edges`).
+
+    Args:
+        stores (list of FeatureStore): the stores
+        dtype (numpy dtype, optional): the dtype of the features, defaulting to the dtype of the
+            first store
+    """
+
+    def __init__(self, stores, dtype=None):
+        if not stores:
+            raise ValueError("stores: expected at least one store, found none")
+
+        columns = sorted({store.shape[1] for store in stores})
+        if len(columns) != 1:
+            raise ValueError(
+                f"stores: expected every store to have the same number of columns, found {columns}"
+            )
+
+        self._stores = list(stores)
+        self._starts = np.cumsum([0] + [store.shape[0] for store in stores])
+        self._dtype = np.dtype(stores[0].dtype if dtype is None else dtype)
+
+    @property
+    def shape(self):
+        return (int(self._starts[-1]), self._stores[0].shape[1])
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    def gather(self, rows):
+        rows = np.asarray(rows)
+        _check_rows(rows, self.shape[0])
+
+        flat_rows = rows.ravel()
+        sampled = np.empty((len(flat_rows), self.shape[1]), dtype=self.dtype)
+
+        # (empty stores start at the same row as the next one, and so are never selected)
+        store_ilocs = np.searchsorted(self._starts, flat_rows, side="right") - 1
+        for store_iloc, (store, start) in enumerate(zip(self._stores, self._starts)):
+            (selected,) = np.nonzero(store_ilocs == store_iloc)
+            if len(selected) == 0:
+                continue
+
+            part = store.gather(flat_rows[selected] - start)
+            if sps.issparse(part):
+                part = part.toarray()
+            sampled[selected] = part
+
+        return sampled.reshape(rows.shape + (self.shape[1],))
+
+    def memory_usage(self):
+        return sum(store.memory_usage() for store in self._stores)
+
+
+def _is_in_memory_array(store):
+    return isinstance(store, ArrayFeatureStore) and (
+        isinstance(store._data, sps.spmatrix) or not _is_memory_mapped(store._data)
+    )
+
+
+def _concatenate(arrays, dtype):
+    if any(isinstance(array, sps.spmatrix) for array in arrays):
+        return sps.vstack(arrays, format="csr").astype(dtype, copy=False)
+    if len(arrays) == 1:
+        return arrays[0].astype(dtype, copy=False)
+    return np.concatenate(arrays).astype(dtype, copy=False)
+
+
+def stack_feature_stores(stores, dtype=None) -> FeatureStore:
+    """
+    Create a :class:`FeatureStore` with the rows of each of ``stores``, one after the other.
+
+    Features that are held in memory are concatenated into a single array, while other stores
+    (such as memory-mapped or chunked ones) are read in place by a :class:`StackedFeatureStore`,
+    so that they aren't loaded into memory.
+
+    Args:
+        stores (list of FeatureStore): the stores, which must have the same number of columns
+        dtype (numpy dtype, optional): the dtype of the features, defaulting to the dtype of the
+            first store
+    """
+    if dtype is None:
+        dtype = stores[0].dtype
+
+    flat = []
+    for store in stores:
+        if isinstance(store, StackedFeatureStore):
+            flat.extend(store._stores)
+        else:
+            flat.append(store)
+
+    parts = []
+    for in_memory, group in itertools.groupby(flat, key=_is_in_memory_array):
+        if in_memory:
+            data = _concatenate([store._data for store in group], dtype)
+            parts.append(ArrayFeatureStore(data))
+        else:
+            parts.extend(group)
+
+    if len(parts) == 1 and parts[0].dtype == dtype:
+        return parts[0]
+
+    return StackedFeatureStore(parts, dtype)
+
+
+def to_feature_store(data) -> FeatureStore:
+    """
+    Wrap ``data`` in an appropriate :class:`FeatureStore`, if it isn't one already.
+    """
+    if isinstance(data, FeatureStore):
+        return data
+
+    return ArrayFeatureStore(data)
@@ -25,19 +25,36 @@ from collections import defaultdict, namedtuple
 import pandas as pd
 import numpy as np
 import scipy.sparse as sps
+import os
+import shutil
+import tempfile
 import warnings
+import weakref
 
 from .. import globalvar
 from .schema import GraphSchema, EdgeType
 from .experimental import experimental, ExperimentalWarning
 from .element_data import NodeData, EdgeData, ExternalIdIndex
+from .delta import GraphDelta
 from .utils import is_real_iterable
-from .validation import comma_sep, separated
-from . import convert
+from .validation import comma_sep, separated, require_integer_in_range
+from .adjacency_cache import AdjacencyCache, AdjacencyCacheInfo, NORMALIZATIONS
+from . import convert, export, ordering, storage
 
 
 NeighbourWithWeight = namedtuple("NeighbourWithWeight", ["node", "weight"])
 
+# a memory-backed filesystem (available on most Linux systems), used by `StellarGraph.to_shared`
+# so that the saved graph is held in shared memory, rather than written to disk
+_SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def _read_only(array):
+    # a view, so that the original array (which may be internal storage) remains writeable
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
 
 class StellarGraph:
     """
@@ -227,6 +244,13 @@ class StellarGraph:
 
         dtype (numpy data-type, optional):
             The numpy data-type to use for the features extracted from each of the ``nodes`` DataFrames.
+            Using a smaller type, like ``"float16"``, reduces the memory required for the features.
+
+        edge_weight_dtype (numpy data-type, optional):
+            The numpy data-type to use for the weights of the edges. If not specified, the weights
+            keep the type of the ``edge_weight_column`` column (or ``float32`` for the default
+            weights). Using a smaller type, like ``"float32"`` or ``"float16"`` instead of
+            ``"float64"``, reduces the memory required for the edges.
 
         graph:
             Deprecated, use :meth:`from_networkx`.
@@ -251,6 +275,7 @@ class StellarGraph:
         node_type_default=globalvar.NODE_TYPE_DEFAULT,
         edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
         dtype="float32",
+        edge_weight_dtype=None,
         # legacy arguments:
         graph=None,
         node_type_name=globalvar.TYPE_ATTR_NAME,
@@ -308,6 +333,9 @@ class StellarGraph:
         )
 
         self._is_directed = is_directed
+        self._adjacency_cache = AdjacencyCache()
+        self._shared_path = None
+        self._delta = None
         self._edges = convert.convert_edges(
             edges,
             name="edges",
@@ -317,10 +345,7 @@ class StellarGraph:
             weight_column=edge_weight_column,
             type_column=edge_type_column,
             nodes=self._nodes,
-        )
-
-        nodes_from_edges = pd.unique(
-            np.concatenate([self._edges.targets, self._edges.sources])
+            weight_dtype=edge_weight_dtype,
         )
 
     @staticmethod
@@ -355,6 +380,7 @@ class StellarGraph:
         edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
         node_features=None,
         dtype="float32",
+        edge_weight_dtype=None,
     ):
         """
         Construct a ``StellarGraph`` object from a NetworkX graph::
@@ -435,6 +461,13 @@ class StellarGraph:
             edge_weight_attr (str, optional):
                 The name of the attribute to use as the weight of edges.
 
+            dtype (numpy data-type, optional):
+                The numpy data-type to use for the node features.
+
+            edge_weight_dtype (numpy data-type, optional):
+                The numpy data-type to use for the weights of the edges (see
+                :class:`StellarGraph`).
+
         Returns:
             A ``StellarGraph`` (if ``graph`` is undirected) or ``StellarDiGraph`` (if ``graph`` is
             directed) instance representing the data in ``graph`` and ``node_features``.
@@ -452,12 +485,396 @@ class StellarGraph:
 
         cls = StellarDiGraph if graph.is_directed() else StellarGraph
         return cls(
-            nodes=nodes, edges=edges, edge_weight_column=edge_weight_attr, dtype=dtype
+            nodes=nodes,
+            edges=edges,
+            edge_weight_column=edge_weight_attr,
+            dtype=dtype,
+            edge_weight_dtype=edge_weight_dtype,
+        )
+
+    @staticmethod
+    def from_arrays(
+        node_ids=None,
+        node_features_by_type=None,
+        sources=None,
+        targets=None,
+        weights=None,
+        edge_types=None,
+        *,
+        edge_ids=None,
+        is_directed=False,
+        use_ilocs=False,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+        edge_weight_dtype=None,
+    ):
+        """
+        Construct a ``StellarGraph`` directly from NumPy arrays, without Pandas DataFrames::
+
+            Gs = StellarGraph.from_arrays(
+                node_ids=np.array(["a", "b", "c"]),
+                node_features_by_type=np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]),
+                sources=np.array(["a", "b"]),
+                targets=np.array(["b", "c"]),
+            )
+
+        This creates the same graph as the equivalent call to the :class:`StellarGraph`
+        constructor, but avoids the intermediate copies made when processing DataFrames. Arrays that
+        already have an appropriate type and order are used directly, without copying, so the
+        memory used during construction is close to the memory used by the final graph.
+
+        For graphs with multiple node types, pass ``node_ids`` and ``node_features_by_type`` as
+        dictionaries from type name to arrays::
+
+            Gs = StellarGraph.from_arrays(
+                node_ids={"user": np.array([0, 1]), "item": np.array([2, 3, 4])},
+                node_features_by_type={"item": np.array([[1.0], [2.0], [3.0]])},
+                sources=np.array([0, 1, 1]),
+                targets=np.array([2, 3, 4]),
+                edge_types=np.array(["rated", "bought", "rated"]),
+            )
+
+        Args:
+            node_ids (array or dict of hashable to array, optional): the IDs of the nodes, as a
+                single 1D array for a graph with one node type (``node_type_default``), or a 1D
+                array for each node type. If not specified, the nodes are inferred from
+                ``sources`` and ``targets``, without features.
+            node_features_by_type (array, FeatureStore or dict of hashable to array or FeatureStore, optional):
+                the feature matrix for the nodes of each type, with rows in the same order as
+                ``node_ids``. Node types that aren't included have no features. For a graph with
+                one node type, this can be passed directly, rather than in a dictionary.
+            sources (array, optional): the source node ID (or iloc, see ``use_ilocs``) of each edge
+            targets (array, optional): the target node ID (or iloc) of each edge
+            weights (array, optional): the weight of each edge, defaulting to 1
+            edge_types (array, optional): the type of each edge, defaulting to ``edge_type_default``
+            edge_ids (array, optional): the ID of each edge, defaulting to its position in
+                ``sources``
+            is_directed (bool, optional): if True, create a :class:`StellarDiGraph`, otherwise a
+                :class:`StellarGraph`
+            use_ilocs (bool, optional): if True, ``sources`` and ``targets`` are the :ref:`ilocs
+                <iloc-explanation>` of nodes (their positions within ``node_ids``, with the types
+                in sorted order), instead of node IDs
+            node_type_default (str, optional): the node type to use if ``node_ids`` is not a
+                dictionary
+            edge_type_default (str, optional): the edge type to use if ``edge_types`` is not
+                specified
+            dtype (numpy data-type, optional): the data-type to use for dense node feature matrices
+            edge_weight_dtype (numpy data-type, optional): the data-type to use for the edge
+                weights, defaulting to the type of ``weights`` (or ``float32``, if ``weights`` isn't
+                specified)
+
+        Returns:
+            A ``StellarGraph`` (if ``is_directed`` is False) or ``StellarDiGraph`` (otherwise)
+            instance.
+        """
+        if (sources is None) != (targets is None):
+            raise ValueError(
+                "sources, targets: expected both or neither to be specified, found only one"
+            )
+
+        if node_ids is None:
+            if use_ilocs:
+                raise ValueError(
+                    "node_ids: expected node IDs when 'use_ilocs=True', found None"
+                )
+
+            if sources is None:
+                node_ids = []
+            else:
+                node_ids = pd.unique(np.concatenate([sources, targets]))
+
+        nodes = convert.convert_node_arrays(
+            node_ids,
+            node_features_by_type,
+            default_type=node_type_default,
+            dtype=dtype,
+        )
+
+        if sources is None:
+            empty = np.array([], dtype=np.uint8)
+            columns = {
+                globalvar.SOURCE: empty,
+                globalvar.TARGET: empty,
+                globalvar.WEIGHT: empty,
+            }
+            edges = EdgeData(empty, columns, [])
+        else:
+            edges = convert.convert_edge_arrays(
+                sources,
+                targets,
+                weights,
+                edge_types,
+                edge_ids,
+                nodes=nodes,
+                default_type=edge_type_default,
+                use_ilocs=use_ilocs,
+                weight_dtype=edge_weight_dtype,
+            )
+
+        return StellarGraph._from_element_data(nodes, edges, is_directed)
+
+    @staticmethod
+    def from_files(
+        nodes=None,
+        edges=None,
+        *,
+        is_directed=False,
+        node_id_column=None,
+        source_column=globalvar.SOURCE,
+        target_column=globalvar.TARGET,
+        edge_weight_column=globalvar.WEIGHT,
+        edge_type_column=None,
+        edge_id_column=None,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+        edge_weight_dtype=None,
+        chunk_size=100000,
+        csv_options=None,
+    ):
+        """
+        Construct a ``StellarGraph`` by reading nodes and edges from CSV or Parquet files::
+
+            Gs = StellarGraph.from_files(
+                nodes="nodes.csv", edges=["edges-0.parquet", "edges-1.parquet"]
+            )
+
+        The files are read in chunks of ``chunk_size`` rows, with the node IDs in each chunk of
+        edges converted to :ref:`ilocs <iloc-explanation>` as it is read, so that the memory used
+        while reading is close to the memory used by the final graph, rather than that of the
+        whole files parsed with Pandas. The index of the edges of each node is computed as part of
+        loading.
+
+        Files with names ending with ``.parquet`` or ``.pq`` are read as Parquet (which requires
+        the ``pyarrow`` module), and any others are read as CSV.
+
+        Args:
+            nodes (path, list of paths or dict of hashable to path or list of paths, optional):
+                files containing the nodes of the graph, with one row per node containing the node
+                ID (from the ``node_id_column`` column) and its features (all other columns). If
+                there is only one type of node, a path or list of paths can be passed directly, and
+                the type defaults to ``node_type_default``. If this is not passed, the nodes are
+                inferred from the edges, with no features.
+            edges (path, list of paths or dict of hashable to path or list of paths, optional):
+                files containing the edges of the graph, with one row per edge, with columns given
+                by ``source_column``, ``target_column`` and (optionally) ``edge_weight_column``,
+                ``edge_type_column`` and ``edge_id_column``. Other columns are ignored. If there is
+                only one type of edge, a path or list of paths can be passed directly.
+            is_directed (bool, optional): if True, create a :class:`StellarDiGraph`, otherwise a
+                :class:`StellarGraph`
+            node_id_column (str, optional): the column of the ``nodes`` files containing the node
+                IDs, defaulting to the first column
+            source_column (str, optional): the column of the ``edges`` files containing the source
+                node of each edge
+            target_column (str, optional): the column of the ``edges`` files containing the target
+                node of each edge
+            edge_weight_column (str, optional): the column of the ``edges`` files containing the
+                weight of each edge. If this column doesn't exist, the weight defaults to 1.
+            edge_type_column (str, optional): the column of the ``edges`` files containing the type
+                of each edge (if this is set, ``edges`` must not be a dictionary)
+            edge_id_column (str, optional): the column of the ``edges`` files containing the ID of
+                each edge. If this is not set, each edge's ID is its position among all the edges,
+                in the order they're read.
+            node_type_default (str, optional): the node type to use if ``nodes`` is not a
+                dictionary
+            edge_type_default (str, optional): the edge type to use if ``edges`` is not a
+                dictionary, and there's no ``edge_type_column``
+            dtype (numpy data-type, optional): the data-type to use for the node features
+            edge_weight_dtype (numpy data-type, optional): the data-type to use for the edge
+                weights, defaulting to the type read from the files
+            chunk_size (int, optional): the number of rows to read from a file at once
+            csv_options (dict, optional): additional keyword arguments to pass to
+                ``pandas.read_csv`` for reading CSV files, such as ``{"sep": "\\t"}``
+
+        Returns:
+            A ``StellarGraph`` (if ``is_directed`` is False) or ``StellarDiGraph`` (otherwise)
+            instance.
+        """
+        require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+
+        nodes, edges = convert.read_files(
+            nodes,
+            edges,
+            node_id_column=node_id_column,
+            source_column=source_column,
+            target_column=target_column,
+            edge_weight_column=edge_weight_column,
+            edge_type_column=edge_type_column,
+            edge_id_column=edge_id_column,
+            node_type_default=node_type_default,
+            edge_type_default=edge_type_default,
+            dtype=dtype,
+            edge_weight_dtype=edge_weight_dtype,
+            chunk_size=chunk_size,
+            csv_options=csv_options,
         )
 
+        # build the index of the edges of each node now, as part of loading
+        edges.adj_index(ins=True, outs=True)
+        if is_directed:
+            edges.adj_index(ins=True, outs=False)
+            edges.adj_index(ins=False, outs=True)
+
+        return StellarGraph._from_element_data(nodes, edges, is_directed)
+
+    @staticmethod
+    def _from_element_data(nodes, edges, is_directed):
+        """
+        Construct a graph directly from the internal ``NodeData`` and ``EdgeData`` representations,
+        skipping the conversion from Pandas DataFrames.
+        """
+        cls = StellarDiGraph if is_directed else StellarGraph
+        graph = cls.__new__(cls)
+        graph._set_element_data(nodes, edges, is_directed)
+        return graph
+
+    def _set_element_data(self, nodes, edges, is_directed, shared_path=None):
+        self._nodes = nodes
+        self._edges = edges
+        self._is_directed = is_directed
+        self._adjacency_cache = AdjacencyCache()
+        self._shared_path = shared_path
+        self._delta = None
+
+    @staticmethod
+    def _from_delta(delta, is_directed):
+        """
+        Construct a graph with nodes and edges that are pending in a ``GraphDelta``, which are
+        merged into ``NodeData`` and ``EdgeData`` when those are first used (see :meth:`compact`).
+        """
+        cls = StellarDiGraph if is_directed else StellarGraph
+        graph = cls.__new__(cls)
+        graph._delta = delta
+        graph._is_directed = is_directed
+        graph._adjacency_cache = AdjacencyCache()
+        graph._shared_path = None
+        return graph
+
+    def save(self, path):
+        """
+        Save this graph to the directory ``path``, as a collection of flat ``.npy`` files.
+
+        The graph can be loaded again with :meth:`load`. This saves the node and edge IDs, types,
+        weights and features, along with the index of the edges of each node, so that loading is
+        much faster than constructing the graph from Pandas DataFrames.
+
+        Node and edge types must be strings or numbers.
+
+        Args:
+            path (str): the directory to save into, which will be created if it doesn't exist
+        """
+        storage.save(path, self._nodes, self._edges, self.is_directed())
+
+    @staticmethod
+    def load(path, mmap=True, allow_pickle=False):
+        """
+        Load a graph saved with :meth:`save`.
+
+        With ``mmap=True``, the arrays are memory-mapped read-only (via ``numpy.load(...,
+        mmap_mode="r")``) rather than read into memory. This makes loading near-instant, and
+        processes that load the same graph share memory through the operating system's page cache.
+
+        Args:
+            path (str): the directory that the graph was saved into
+            mmap (bool): if True, memory-map the arrays instead of reading them into memory
+            allow_pickle (bool): if True, allow loading node or edge IDs that are saved as Python
+                objects (such as IDs of mixed types), which requires unpickling them. Unpickling
+                can execute arbitrary code, so only use this for trusted files. Strings and
+                numbers don't require this.
+
+        Returns:
+            A ``StellarGraph`` or ``StellarDiGraph`` instance, equivalent to the graph that was
+            saved.
+        """
+        nodes, edges, is_directed = storage.load(
+            path, mmap=mmap, allow_pickle=allow_pickle
+        )
+        return StellarGraph._from_element_data(nodes, edges, is_directed)
+
+    def to_shared(self, path=None):
+        """
+        Create a copy of this graph that can be shared between processes without copying it, such
+        as with the workers used by Keras with ``use_multiprocessing=True``::
+
+            shared = graph.to_shared()
+            generator = GraphSAGENodeGenerator(shared, batch_size=50, num_samples=[10, 5])
+            model.fit(generator.flow(...), workers=4, use_multiprocessing=True)
+
+        The graph is saved with :meth:`save`, including the index of the edges of each node, and
+        then loaded with its arrays memory-mapped (see :meth:`load`). Pickling the returned graph
+        only records the location of the saved graph, and unpickling it memory-maps the same
+        files, so every process shares the same memory, rather than each process having its own
+        copy of the graph. The edge indices are computed once, in the process that calls this
+        method.
+
+        Node and edge types must be strings or numbers.
+
+        Args:
+            path (str, optional): the directory to save the graph into, which must be available to
+                every process that uses the graph. If not specified, a new temporary directory is
+                created in shared memory (``/dev/shm``, if it exists), which is deleted when the
+                returned graph is garbage collected in this process.
+
+        Returns:
+            A ``StellarGraph`` or ``StellarDiGraph`` instance, equivalent to this graph.
+        """
+        owned = path is None
+        if owned:
+            shared_memory = (
+                _SHARED_MEMORY_DIR if os.path.isdir(_SHARED_MEMORY_DIR) else None
+            )
+            path = tempfile.mkdtemp(prefix="stellargraph-", dir=shared_memory)
+
+        self.save(path)
+        # (these files were just written by this process)
+        nodes, edges, is_directed = storage.load(path, mmap=True, allow_pickle=True)
+
+        cls = StellarDiGraph if is_directed else StellarGraph
+        shared = cls.__new__(cls)
+        shared._set_element_data(nodes, edges, is_directed, shared_path=path)
+
+        if owned:
+            # processes that unpickle the graph don't own the directory, and so don't delete it
+            weakref.finalize(shared, shutil.rmtree, path, ignore_errors=True)
+
+        return shared
+
+    def __getstate__(self):
+        if self._shared_path is None:
+            # any pending additions are pickled as part of the main storage
+            self.compact()
+            return self.__dict__
+
+        # a shared graph is reloaded from its files when unpickled, see `to_shared`
+        return {"_shared_path": self._shared_path}
+
+    def __setstate__(self, state):
+        shared_path = state.get("_shared_path")
+        if shared_path is None:
+            self.__dict__.update(state)
+            # graphs pickled by older versions don't have the lazily-initialised attributes
+            self.__dict__.setdefault("_shared_path", None)
+            self.__dict__.setdefault("_delta", None)
+            if "_adjacency_cache" not in self.__dict__:
+                self._adjacency_cache = AdjacencyCache()
+            return
+
+        # (the files are trusted as much as the pickle that refers to them)
+        nodes, edges, is_directed = storage.load(
+            shared_path, mmap=True, allow_pickle=True
+        )
+        self._set_element_data(nodes, edges, is_directed, shared_path=shared_path)
+
     # customise how a missing attribute is handled to give better error messages for the NetworkX
     # -> no NetworkX transition.
     def __getattr__(self, item):
+        if item in ("_nodes", "_edges") and self.__dict__.get("_delta") is not None:
+            # operations that aren't supported by the pending additions of `with_added_edges`
+            # use the main storage, and so merge the additions into it first
+            self.compact()
+            return self.__dict__[item]
+
         import networkx
 
         try:
@@ -493,6 +910,8 @@ class StellarGraph:
         Returns:
              int: The number of nodes.
         """
+        if self._delta is not None:
+            return self._delta.number_of_nodes()
         return len(self._nodes)
 
     def number_of_edges(self) -> int:
@@ -502,6 +921,8 @@ class StellarGraph:
         Returns:
              int: The number of edges.
         """
+        if self._delta is not None:
+            return self._delta.number_of_edges()
         return len(self._edges)
 
     def nodes(self, node_type=None, use_ilocs=False) -> Iterable[Any]:
@@ -516,6 +937,15 @@ class StellarGraph:
             All the nodes in the graph if ``node_type`` is ``None``, otherwise all the nodes in the
             graph of type ``node_type``.
         """
+        if self._delta is not None:
+            if use_ilocs:
+                if node_type is None:
+                    return range(self.number_of_nodes())
+                return self._delta.node_type_range(node_type)
+
+            ids = self._delta.node_ids(node_type)
+            return ids if node_type is not None else pd.Index(ids)
+
         if node_type is None:
             all_ids = self._nodes.ids.pandas_index
             if use_ilocs:
@@ -545,8 +975,59 @@ class StellarGraph:
         Returns:
             The graph edges. If edge weights are included then a tuple of (edges, weights)
         """
-        # FIXME: these would be better returned as the 2 or 3 arrays directly, rather than tuple-ing
-        # (the same applies to all other instances of zip in this file)
+        # see edge_arrays for a version that avoids creating a tuple per edge
+        sources, targets, _, weights = self.edge_arrays(
+            include_edge_weight=include_edge_weight, use_ilocs=use_ilocs
+        )
+
+        if include_edge_type:
+            # the types are always names here, even with use_ilocs
+            if self._delta is not None:
+                _, _, types, _ = self._delta.edge_arrays(
+                    include_edge_type=True, include_edge_weight=False, use_ilocs=False
+                )
+            else:
+                types = self._edges.type_of_iloc(slice(None))
+            edges = list(zip(sources, targets, types))
+        else:
+            edges = list(zip(sources, targets))
+
+        if include_edge_weight:
+            return edges, weights
+
+        return edges
+
+    def edge_arrays(
+        self, include_edge_type=False, include_edge_weight=False, use_ilocs=False
+    ) -> tuple:
+        """
+        Obtains the edges in the graph, as one array per property, without creating an object per
+        edge.
+
+        The arrays are read-only, and are views of the graph's internal storage where possible
+        (the :ref:`node ilocs <iloc-explanation>` and edge type ilocs with ``use_ilocs=True``, and
+        the weights), so this is appropriate for enumerating the edges of large graphs.
+
+        Args:
+            include_edge_type (bool): if True, include the type of each edge
+            include_edge_weight (bool): if True, include the weight of each edge
+            use_ilocs (bool): if True, return :ref:`node ilocs <iloc-explanation>` for the sources
+                and targets, and edge type ilocs for the types, instead of IDs and type names
+
+        Returns:
+            A tuple of numpy arrays ``(sources, targets, types, weights)``, with one element per
+            edge, where ``types`` and ``weights`` are ``None`` if they are not included.
+        """
+        if self._delta is not None:
+            arrays = self._delta.edge_arrays(
+                include_edge_type=include_edge_type,
+                include_edge_weight=include_edge_weight,
+                use_ilocs=use_ilocs,
+            )
+            return tuple(
+                None if array is None else _read_only(array) for array in arrays
+            )
+
         sources = self._edges.sources
         targets = self._edges.targets
 
@@ -554,16 +1035,19 @@ class StellarGraph:
             sources = self._nodes.ids.from_iloc(sources)
             targets = self._nodes.ids.from_iloc(targets)
 
-        if include_edge_type:
-            types = self._edges.type_of_iloc(slice(None))
-            edges = list(zip(sources, targets, types))
+        if not include_edge_type:
+            types = None
+        elif use_ilocs:
+            types = self._edges.type_ilocs
         else:
-            edges = list(zip(sources, targets))
+            types = self._edges.type_of_iloc(slice(None))
 
-        if include_edge_weight:
-            return edges, self._edges.weights
+        weights = self._edges.weights if include_edge_weight else None
 
-        return edges
+        return tuple(
+            None if array is None else _read_only(array)
+            for array in (sources, targets, types, weights)
+        )
 
     def has_node(self, node: Any) -> bool:
         """
@@ -576,6 +1060,8 @@ class StellarGraph:
              bool: A value of True (cf False) if the node is
              (cf is not) in the graph.
         """
+        if self._delta is not None:
+            return self._delta.has_node(node)
         return node in self._nodes
 
     def _transform_edges(
@@ -607,6 +1093,21 @@ class StellarGraph:
 
         return list(other_node)
 
+    def _delta_neighbours(
+        self, node, include_edge_weight, edge_types, use_ilocs, *, ins, outs
+    ):
+        other_node, weights = self._delta.neighbours(
+            node, ins=ins, outs=outs, edge_types=edge_types, use_ilocs=use_ilocs
+        )
+
+        if include_edge_weight:
+            return [
+                NeighbourWithWeight(node, weight)
+                for node, weight in zip(other_node, weights)
+            ]
+
+        return list(other_node)
+
     def neighbors(
         self, node: Any, include_edge_weight=False, edge_types=None, use_ilocs=False
     ) -> Iterable[Any]:
@@ -626,6 +1127,11 @@ class StellarGraph:
         Returns:
             iterable: The neighbouring nodes.
         """
+        if self._delta is not None:
+            return self._delta_neighbours(
+                node, include_edge_weight, edge_types, use_ilocs, ins=True, outs=True
+            )
+
         if not use_ilocs:
             node = self._nodes.ids.to_iloc([node])[0]
 
@@ -667,6 +1173,11 @@ class StellarGraph:
                 use_ilocs=use_ilocs,
             )
 
+        if self._delta is not None:
+            return self._delta_neighbours(
+                node, include_edge_weight, edge_types, use_ilocs, ins=True, outs=False
+            )
+
         if not use_ilocs:
             node = self._nodes.ids.to_iloc([node])[0]
         edge_ilocs = self._edges.edge_ilocs(node, ins=True, outs=False)
@@ -705,6 +1216,11 @@ class StellarGraph:
                 use_ilocs=use_ilocs,
             )
 
+        if self._delta is not None:
+            return self._delta_neighbours(
+                node, include_edge_weight, edge_types, use_ilocs, ins=False, outs=True
+            )
+
         if not use_ilocs:
             node = self._nodes.ids.to_iloc([node])[0]
 
@@ -715,6 +1231,163 @@ class StellarGraph:
             target, edge_ilocs, include_edge_weight, edge_types, use_ilocs
         )
 
+    def _edge_type_filter(self, offsets, edge_ilocs, edge_types):
+        """
+        Select the edges with the given types from a ragged array of edge ilocs.
+
+        Returns:
+            A tuple of the offsets of the ragged array after filtering, and a boolean mask of the
+            edges to keep.
+        """
+        filter_edge_type_ilocs = self._edges.types.to_iloc(edge_types)
+        correct_type = np.isin(
+            self._edges.type_ilocs[edge_ilocs], filter_edge_type_ilocs
+        )
+
+        # recount the edges that remain for each element
+        num_elements = len(offsets) - 1
+        element_idx_per_edge = np.repeat(np.arange(num_elements), np.diff(offsets))
+        counts = np.bincount(element_idx_per_edge[correct_type], minlength=num_elements)
+        offsets = np.zeros_like(offsets)
+        np.cumsum(counts, out=offsets[1:])
+
+        return offsets, correct_type
+
+    def _neighbors_batch(
+        self, nodes, *, ins, outs, include_edge_weight, edge_types, use_ilocs
+    ):
+        if use_ilocs:
+            node_ilocs = np.asarray(nodes)
+        else:
+            node_ilocs = self._nodes.ids.to_iloc(nodes)
+
+        offsets, edge_ilocs = self._edges.edge_ilocs_batch(
+            node_ilocs, ins=ins, outs=outs
+        )
+
+        if ins and outs:
+            source = self._edges.sources[edge_ilocs]
+            target = self._edges.targets[edge_ilocs]
+            node_per_edge = np.repeat(node_ilocs, np.diff(offsets))
+            other_node = np.where(source == node_per_edge, target, source)
+        elif ins:
+            other_node = self._edges.sources[edge_ilocs]
+        else:
+            other_node = self._edges.targets[edge_ilocs]
+
+        if edge_types is not None:
+            offsets, correct_type = self._edge_type_filter(
+                offsets, edge_ilocs, edge_types
+            )
+            edge_ilocs = edge_ilocs[correct_type]
+            other_node = other_node[correct_type]
+
+        if not use_ilocs:
+            other_node = self._nodes.ids.from_iloc(other_node)
+
+        if include_edge_weight:
+            return offsets, other_node, self._edges.weights[edge_ilocs]
+
+        return offsets, other_node
+
+    def neighbors_batch(
+        self, nodes, include_edge_weight=False, edge_types=None, use_ilocs=False
+    ):
+        """
+        Obtains the neighbouring nodes of each of the given nodes, in a single vectorized
+        operation.
+
+        This is equivalent to calling :meth:`neighbors` for each node, but returns the result as
+        a "ragged" array: the neighbours of ``nodes[i]`` are ``neighbours[offsets[i]:offsets[i +
+        1]]``. This avoids per-node overhead, and so is much faster for processing many nodes at
+        once, such as a whole frontier of a sampler.
+
+        Args:
+            nodes (iterable): The nodes in question.
+            include_edge_weight (bool, default False): If True, also return the weight of the edge
+                to each neighbour.
+            edge_types (list of hashable, optional): If provided, only traverse the graph
+                via the provided edge types when collecting neighbours.
+            use_ilocs (bool): if True `nodes` are treated as :ref:`node ilocs <iloc-explanation>`
+                and the ilocs of each neighbour are returned.
+
+        Returns:
+            A tuple of numpy arrays ``(offsets, neighbours)``, or ``(offsets, neighbours,
+            weights)`` if ``include_edge_weight`` is True.
+        """
+        return self._neighbors_batch(
+            nodes,
+            ins=True,
+            outs=True,
+            include_edge_weight=include_edge_weight,
+            edge_types=edge_types,
+            use_ilocs=use_ilocs,
+        )
+
+    def in_nodes_batch(
+        self, nodes, include_edge_weight=False, edge_types=None, use_ilocs=False
+    ):
+        """
+        Obtains the neighbouring nodes with edges directed to each of the given nodes, in a single
+        vectorized operation. For an undirected graph, neighbours are treated as both in-nodes and
+        out-nodes.
+
+        See :meth:`neighbors_batch` for more details about the result.
+
+        Args:
+            nodes (iterable): The nodes in question.
+            include_edge_weight (bool, default False): If True, also return the weight of the edge
+                to each neighbour.
+            edge_types (list of hashable, optional): If provided, only traverse the graph
+                via the provided edge types when collecting neighbours.
+            use_ilocs (bool): if True `nodes` are treated as :ref:`node ilocs <iloc-explanation>`
+                and the ilocs of each neighbour are returned.
+
+        Returns:
+            A tuple of numpy arrays ``(offsets, in_nodes)``, or ``(offsets, in_nodes, weights)`` if
+            ``include_edge_weight`` is True.
+        """
+        return self._neighbors_batch(
+            nodes,
+            ins=True,
+            outs=not self.is_directed(),
+            include_edge_weight=include_edge_weight,
+            edge_types=edge_types,
+            use_ilocs=use_ilocs,
+        )
+
+    def out_nodes_batch(
+        self, nodes, include_edge_weight=False, edge_types=None, use_ilocs=False
+    ):
+        """
+        Obtains the neighbouring nodes with edges directed from each of the given nodes, in a
+        single vectorized operation. For an undirected graph, neighbours are treated as both
+        in-nodes and out-nodes.
+
+        See :meth:`neighbors_batch` for more details about the result.
+
+        Args:
+            nodes (iterable): The nodes in question.
+            include_edge_weight (bool, default False): If True, also return the weight of the edge
+                to each neighbour.
+            edge_types (list of hashable, optional): If provided, only traverse the graph
+                via the provided edge types when collecting neighbours.
+            use_ilocs (bool): if True `nodes` are treated as :ref:`node ilocs <iloc-explanation>`
+                and the ilocs of each neighbour are returned.
+
+        Returns:
+            A tuple of numpy arrays ``(offsets, out_nodes)``, or ``(offsets, out_nodes, weights)``
+            if ``include_edge_weight`` is True.
+        """
+        return self._neighbors_batch(
+            nodes,
+            ins=not self.is_directed(),
+            outs=True,
+            include_edge_weight=include_edge_weight,
+            edge_types=edge_types,
+            use_ilocs=use_ilocs,
+        )
+
     def nodes_of_type(self, node_type=None):
         """
         Get the nodes of the graph with the specified node types.
@@ -749,9 +1422,14 @@ class StellarGraph:
         else:
             nodes = [node]
 
-        if not use_ilocs:
-            nodes = self._nodes.ids.to_iloc(nodes, strict=True)
-        type_sequence = self._nodes.type_of_iloc(nodes)
+        if self._delta is not None:
+            if not use_ilocs:
+                nodes = self._delta.node_ids_to_ilocs(nodes)
+            type_sequence = self._delta.node_types_of_ilocs(nodes)
+        else:
+            if not use_ilocs:
+                nodes = self._nodes.ids.to_iloc(nodes, strict=True)
+            type_sequence = self._nodes.type_of_iloc(nodes)
 
         if is_real_iterable(node):
             return type_sequence
@@ -767,7 +1445,12 @@ class StellarGraph:
         Returns:
             set of types
         """
-        return set(self._nodes.types.pandas_index)
+        return set(self._node_type_names())
+
+    def _node_type_names(self):
+        if self._delta is not None:
+            return pd.Index(self._delta.node_types)
+        return self._nodes.types.pandas_index
 
     def unique_node_type(self, error_message=None):
         """
@@ -782,7 +1465,7 @@ class StellarGraph:
             ``ValueError`` exception.
         """
 
-        all_types = self._nodes.types.pandas_index
+        all_types = self._node_type_names()
         if len(all_types) == 1:
             return all_types[0]
 
@@ -800,6 +1483,8 @@ class StellarGraph:
         Returns:
             a sequence of all edge types in the graph
         """
+        if self._delta is not None:
+            return pd.Index(self._delta.edge_types)
         return self._edges.types.pandas_index
 
     def node_feature_sizes(self, node_types=None):
@@ -845,6 +1530,8 @@ class StellarGraph:
         Returns:
             Numpy array containing the indices for the requested nodes.
         """
+        if self._delta is not None:
+            return self._delta.node_ids_to_ilocs(nodes)
         return self._nodes.ids.to_iloc(nodes, strict=True)
 
     def node_ilocs_to_ids(self, node_ilocs):
@@ -857,6 +1544,8 @@ class StellarGraph:
         Returns:
             Numpy array containing the node ids for the requested nodes.
         """
+        if self._delta is not None:
+            return self._delta.node_ilocs_to_ids(node_ilocs)
         return self._nodes.ids.from_iloc(node_ilocs)
 
     def node_features(self, nodes=None, node_type=None, use_ilocs=False):
@@ -1185,18 +1874,56 @@ class StellarGraph:
         """
         Obtains a map from node to node degree.
 
+        Use :meth:`node_degree_array` to get the degrees as a numpy array, which is much faster
+        for large graphs.
+
         use_ilocs (bool): if True return :ref:`node ilocs <iloc-explanation>`
 
         Returns:
             The degree of each node.
         """
         degrees = self._edges.degrees()
-        if use_ilocs:
-            return degrees
-        node_ids = self.node_ilocs_to_ids(list(degrees.keys()))
-        return defaultdict(
-            int,
-            ((node_id, degree) for node_id, degree in zip(node_ids, degrees.values())),
+        (non_isolated,) = degrees.nonzero()
+        keys = non_isolated if use_ilocs else self.node_ilocs_to_ids(non_isolated)
+        return defaultdict(int, zip(keys, degrees[non_isolated]))
+
+    def node_degree_array(self, direction="both", weighted=False, edge_types=None):
+        """
+        Obtains the degree of every node, as a numpy array indexed by :ref:`node iloc
+        <iloc-explanation>`.
+
+        This is computed with vectorized operations on the edges the first time it is required,
+        and then cached, so the result is read-only.
+
+        Args:
+            direction (str): which edges to count for each node: ``"in"`` for incoming edges,
+                ``"out"`` for outgoing edges, or ``"both"`` for all edges. For an undirected graph,
+                all edges are both incoming and outgoing, so these are all the same.
+            weighted (bool): if True, sum the weights of the edges, instead of counting them
+            edge_types (list of hashable, optional): If provided, only count edges of these types.
+
+        Returns:
+            A numpy array of length ``number_of_nodes()`` where element ``i`` is the degree of the
+            node with iloc ``i``. This has an integer dtype, or a floating point one if
+            ``weighted`` is True.
+        """
+        if direction not in ("in", "out", "both"):
+            raise ValueError(
+                f"direction: expected 'in', 'out' or 'both', found {direction!r}"
+            )
+
+        if direction == "both" or not self.is_directed():
+            ins = outs = True
+        else:
+            ins = direction == "in"
+            outs = not ins
+
+        return self._edges.degrees(
+            ins=ins,
+            outs=outs,
+            weighted=weighted,
+            edge_types=edge_types,
+            size=self.number_of_nodes(),
         )
 
     def to_adjacency_matrix(
@@ -1221,6 +1948,118 @@ class StellarGraph:
         Returns:
              The weighted adjacency matrix.
         """
+        if nodes is None:
+            # the cached matrix is read-only, so a copy is returned in case it is modified
+            return self._adjacency_matrix(weighted=weighted, edge_type=edge_type).copy()
+
+        return self._build_adjacency_matrix(nodes, weighted, edge_type)
+
+    def _adjacency_matrix(self, weighted=False, edge_type=None, normalization=None):
+        """
+        Retrieve the adjacency matrix of the whole graph from the adjacency cache, computing and
+        storing it if required.
+
+        Args:
+            weighted (bool): as for :meth:`to_adjacency_matrix`
+            edge_type (hashable, optional): as for :meth:`to_adjacency_matrix`
+            normalization (str, optional): if set, the normalization to apply to the adjacency
+                matrix: ``"self_loops"`` (set every diagonal element to 1), ``"left"`` (``D^-1 A``),
+                ``"symmetric"`` (``D^-1/2 A D^-1/2``), or ``"left_self_loops"`` or
+                ``"symmetric_self_loops"`` (the same normalizations, after adding self loops).
+
+        Returns:
+            A SciPy CSR matrix, that is shared with other callers and so is read-only.
+        """
+        if normalization is not None and normalization not in NORMALIZATIONS:
+            raise ValueError(
+                f"normalization: expected one of {comma_sep(list(NORMALIZATIONS))}, found {normalization!r}"
+            )
+
+        if edge_type is not None:
+            # validate eagerly, so that the error isn't raised from deep within the cache
+            self._edges.type_range(edge_type)
+
+        def compute():
+            if normalization is None:
+                return self._build_adjacency_matrix(None, weighted, edge_type)
+
+            adj = self._adjacency_matrix(weighted=weighted, edge_type=edge_type)
+            return NORMALIZATIONS[normalization](adj)
+
+        return self._adjacency_cache.get((weighted, edge_type, normalization), compute)
+
+    def adjacency_cache_info(self) -> AdjacencyCacheInfo:
+        """
+        Describe the cache of adjacency matrices of this graph.
+
+        The adjacency matrices of the whole graph computed by :meth:`to_adjacency_matrix` and by
+        the generators in :mod:`stellargraph.mapper` (such as :class:`.FullBatchNodeGenerator`)
+        are cached, so that requesting the same matrix again doesn't need to recompute it. The
+        total size of the cached matrices is bounded, with the least recently used matrices
+        evicted first.
+
+        Returns:
+            A named tuple with fields ``hits``, ``misses``, ``keys`` (the ``(weighted, edge_type,
+            normalization)`` of each cached matrix), ``nbytes`` (the total size of the cached
+            matrices) and ``max_bytes``.
+        """
+        return self._adjacency_cache.info()
+
+    def adjacency_cache_clear(self):
+        """
+        Remove all matrices from the cache of adjacency matrices of this graph, and reset its
+        statistics.
+
+        See :meth:`adjacency_cache_info` for more details about the cache.
+        """
+        self._adjacency_cache.clear()
+
+    def memory_usage(self, deep=False) -> pd.Series:
+        """
+        Compute the memory used by this graph, broken down by the part of the graph that uses it.
+
+        This can be used to estimate the memory required to work with a graph, such as to choose
+        the memory limit of each worker that trains a model on it::
+
+            usage = graph.memory_usage()
+            print(usage)
+            print(f"total: {usage.sum()} bytes")
+
+        Arrays that are memory-mapped from disk (such as after :meth:`load` with ``mmap=True``)
+        and node features held out-of-core in a :class:`.FeatureStore` are counted as 0 bytes,
+        because they're only read into memory as required.
+
+        Args:
+            deep (bool): if True, include the memory used by Python objects, like string node and
+                edge IDs, which requires inspecting each of them (see
+                ``pandas.Index.memory_usage``)
+
+        Returns:
+            A Pandas Series of the number of bytes used by each part of the graph, with a two-level
+            index: the component (``"nodes"``, ``"node features"``, ``"edges"``, ``"adjacency
+            index"`` or ``"adjacency cache"``) and the name of the part of that component (for
+            instance, the node type for ``"node features"``).
+        """
+        components = {
+            "nodes": self._nodes.memory_usage(deep=deep),
+            "node features": self._nodes.features_memory_usage(),
+            "edges": self._edges.memory_usage(deep=deep),
+            "adjacency index": self._edges.adj_index_memory_usage(),
+            "adjacency cache": {"matrices": self._adjacency_cache.info().nbytes},
+        }
+        usage = {
+            (component, part): nbytes
+            for component, parts in components.items()
+            for part, nbytes in parts.items()
+        }
+        return pd.Series(
+            list(usage.values()),
+            index=pd.MultiIndex.from_tuples(list(usage.keys())),
+            dtype=np.int64,
+            name="bytes",
+        )
+
+    def _build_adjacency_matrix(self, nodes, weighted, edge_type):
         if edge_type is None:
             type_selector = slice(None)
         else:
@@ -1239,7 +2078,14 @@ class StellarGraph:
             node_ilocs = self._nodes.ids.to_iloc(nodes)
             index = ExternalIdIndex(node_ilocs)
             n = len(index)
-            selector = np.isin(sources, node_ilocs) & np.isin(targets, node_ilocs)
+
+            selector = self._induced_edge_ilocs(node_ilocs)
+            if edge_type is not None:
+                selector = selector[
+                    (type_selector.start <= selector) & (selector < type_selector.stop)
+                ]
+                # `selector` is used with the already type-restricted columns
+                selector -= type_selector.start
 
             # these indices are computed relative to the index above
             src_idx = index.to_iloc(sources[selector])
@@ -1269,6 +2115,14 @@ class StellarGraph:
         adj.sum_duplicates()
         return adj
 
+    def _induced_edge_ilocs(self, node_ilocs):
+        # the edges between the nodes, found by looking at only those incident to the nodes: the
+        # out-edges are enough for directed graphs, while undirected graphs use the edges in both
+        # directions, which are (more likely to be) already computed
+        return self._edges.induced_edge_ilocs(
+            node_ilocs, ins=not self.is_directed(), outs=True
+        )
+
     def subgraph(self, nodes):
         """
         Compute the node-induced subgraph implied by ``nodes``.
@@ -1283,43 +2137,182 @@ class StellarGraph:
         """
 
         node_ilocs = self._nodes.ids.to_iloc(nodes, strict=True)
-        node_types = self._nodes.type_of_iloc(node_ilocs)
-        node_type_to_ilocs = pd.Series(node_ilocs, index=node_types).groupby(level=0)
+        # group the nodes by type (preserving the order of `nodes` within each type), as required
+        # for the new graph
+        by_type = np.argsort(self._nodes.type_ilocs[node_ilocs], kind="stable")
+        node_ilocs = node_ilocs[by_type]
+
+        edge_ilocs = self._induced_edge_ilocs(node_ilocs)
+
+        return StellarGraph._from_element_data(
+            self._nodes.subset(node_ilocs),
+            self._edges.subset(edge_ilocs, node_ilocs),
+            self.is_directed(),
+        )
+
+    def reorder(self, method="rcm", seed=None):
+        """
+        Create an equivalent graph with the nodes renumbered so that connected nodes have nearby
+        :ref:`ilocs <iloc-explanation>`.
+
+        Node ilocs follow the order of the input data by default, so the neighbours of a node can
+        be spread across the whole graph. Renumbering them places the features and edges of nearby
+        nodes close together in memory, which makes vectorized operations over the whole graph,
+        like multiplying by the adjacency matrix, more cache-friendly. It doesn't make sampling
+        from randomly chosen nodes (such as with :class:`.GraphSAGENodeGenerator`) measurably
+        faster, because the sampled nodes are scattered regardless of the order.
+
+        The new graph has the same node and edge IDs, types, features and weights, but the nodes of
+        each type (and the edges of each type) are stored in a different order, so ilocs from this
+        graph can't be used with the new one. The nodes of each type stay together.
+
+        Args:
+            method (str): the ordering to use:
+
+                - ``"degree"``: nodes with the highest degree first
+                - ``"rcm"``: reverse Cuthill-McKee ordering, which minimises the bandwidth of the
+                  adjacency matrix
+                - ``"bfs"``: breadth-first search order of each connected component, starting
+                  from the node with the highest degree
+                - ``"partition"``: the nodes of each community found by label propagation placed
+                  together
 
-        node_frames = {
-            type_name: pd.DataFrame(
-                self._nodes.features(type_name, ilocs),
-                index=self._nodes.ids.from_iloc(ilocs),
+            seed (int, optional): the random seed to use for the ``"partition"`` method
+
+        Returns:
+            A :class:`StellarGraph` or :class:`StellarDiGraph` (matching this graph).
+        """
+        order = ordering.node_order(self, method, seed)
+
+        # the nodes of each type have to be contiguous
+        by_type = np.argsort(self._nodes.type_ilocs[order], kind="stable")
+        node_ilocs = order[by_type]
+
+        new_ilocs = np.empty(len(node_ilocs), dtype=np.int64)
+        new_ilocs[node_ilocs] = np.arange(len(node_ilocs))
+
+        # sort the edges of each type by their new source (and target) ilocs, so that the edges
+        # of each node are also together
+        edge_ilocs = np.lexsort(
+            (
+                new_ilocs[self._edges.targets],
+                new_ilocs[self._edges.sources],
+                self._edges.type_ilocs,
             )
-            for type_name, ilocs in node_type_to_ilocs
-        }
+        )
 
-        # FIXME(#985): this is O(edges in graph) but could potentially be optimised to O(edges in
-        # graph incident to `nodes`), which could be much fewer if `nodes` is small
-        edge_ilocs = np.where(
-            np.isin(self._edges.sources, node_ilocs)
-            & np.isin(self._edges.targets, node_ilocs)
+        return StellarGraph._from_element_data(
+            self._nodes.subset(node_ilocs),
+            self._edges.subset(edge_ilocs, node_ilocs),
+            self.is_directed(),
         )
-        edge_frame = pd.DataFrame(
-            {
-                "id": self._edges.ids.from_iloc(edge_ilocs),
-                globalvar.SOURCE: self._nodes.ids.from_iloc(
-                    self._edges.sources[edge_ilocs]
-                ),
-                globalvar.TARGET: self._nodes.ids.from_iloc(
-                    self._edges.targets[edge_ilocs]
-                ),
-                globalvar.WEIGHT: self._edges.weights[edge_ilocs],
-            },
-            index=self._edges.type_of_iloc(edge_ilocs),
+
+    def with_added_edges(
+        self,
+        edges=None,
+        nodes=None,
+        *,
+        source_column=globalvar.SOURCE,
+        target_column=globalvar.TARGET,
+        edge_weight_column=globalvar.WEIGHT,
+        edge_type_column=None,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+        compact_threshold=0.1,
+    ):
+        """
+        Create a new graph with the nodes and edges of this one, along with some new edges and
+        nodes, such as a graph of interactions that grows over time.
+
+        The new nodes and edges are recorded separately from the main storage of the graph, as a
+        pending "delta", and this graph is not modified or copied, so the cost of adding a batch
+        depends on the size of the batch, not the size of the graph. These methods read through
+        the pending additions, giving the same results (and the same order) as after merging them:
+        :meth:`neighbors`, :meth:`in_nodes`, :meth:`out_nodes`, :meth:`nodes`, :meth:`edges`,
+        :meth:`edge_arrays`, :meth:`has_node`, :meth:`node_type`, :meth:`node_ids_to_ilocs`,
+        :meth:`node_ilocs_to_ids`, :meth:`number_of_nodes`, :meth:`number_of_edges`,
+        :attr:`node_types` and :attr:`edge_types`.
+
+        The pending additions are merged into the main storage (as done by :meth:`compact`) when
+        they become larger than ``compact_threshold`` times the size of the graph, or when any
+        other operation is used, such as reading node features or computing an adjacency matrix.
+        Merging copies the graph, but merges any index of the edges of each node that has already
+        been computed (such as by :meth:`neighbors`), rather than rebuilding it.
+
+        Args:
+            edges (DataFrame or dict of hashable to Pandas DataFrame, optional): the new edges, in
+                the same form as the ``edges`` argument to :class:`StellarGraph`. Their IDs must not
+                overlap the IDs of the existing edges, and their source and target nodes must be in
+                this graph or in ``nodes``.
+            nodes (DataFrame or dict of hashable to Pandas DataFrame, optional): the new nodes, in
+                the same form as the ``nodes`` argument to :class:`StellarGraph`. Their IDs must not
+                overlap the IDs of the existing nodes, and they must have the same number of
+                features as any existing nodes of the same type.
+            source_column (str, optional): the name of the column to use as the source node of
+                edges in ``edges``
+            target_column (str, optional): the name of the column to use as the target node of
+                edges in ``edges``
+            edge_weight_column (str, optional): the name of the column to use as the weight of
+                edges in ``edges``, defaulting to ``1`` if it doesn't exist
+            edge_type_column (str, optional): the name of the column to use as the edge type in
+                the ``edges`` DataFrame
+            node_type_default (str, optional): the node type to use, if ``nodes`` is passed as a
+                DataFrame (not a ``dict``)
+            edge_type_default (str, optional): the edge type to use, if ``edges`` is passed as a
+                DataFrame (not a ``dict``) without ``edge_type_column``
+            dtype (numpy data-type, optional): the data-type to use for the features of new nodes
+                of new types (those of existing types are converted to the data-type of the
+                existing features when merged)
+            compact_threshold (float, optional): merge the pending additions into the main
+                storage when their total number of nodes and edges is more than this fraction of
+                the number of nodes and edges in the graph. If ``None``, they are only merged when
+                required.
+
+        Returns:
+            A :class:`StellarGraph` or :class:`StellarDiGraph` (matching this graph), with the
+            nodes and edges of this one, plus the new ones. The new nodes and edges of each type
+            have ilocs after the existing ones of that type, and new types are after the existing
+            types, so adding nodes changes the ilocs of existing nodes of later types.
+        """
+        delta = self._delta
+        if delta is None:
+            delta = GraphDelta(self._nodes, self._edges)
+
+        delta = delta.with_added(
+            nodes,
+            edges,
+            node_type_default=node_type_default,
+            edge_type_default=edge_type_default,
+            source_column=source_column,
+            target_column=target_column,
+            weight_column=edge_weight_column,
+            type_column=edge_type_column,
+            dtype=dtype,
         )
-        edge_frames = {
-            type_name: df.set_index("id")
-            for type_name, df in edge_frame.groupby(level=0)
-        }
+        graph = StellarGraph._from_delta(delta, self.is_directed())
+
+        if (
+            compact_threshold is not None
+            and delta.pending_size() > compact_threshold * delta.base_size()
+        ):
+            graph.compact()
 
-        cls = StellarDiGraph if self.is_directed() else StellarGraph
-        return cls(node_frames, edge_frames)
+        return graph
+
+    def compact(self):
+        """
+        Merge the nodes and edges that are pending in this graph (from :meth:`with_added_edges`)
+        into its main storage, in place.
+
+        This happens automatically when required, so calling it is only needed to control when
+        the cost of merging is paid, such as after a series of small updates and before training
+        a model. This does nothing if there are no pending additions.
+        """
+        delta = self._delta
+        if delta is not None:
+            self._nodes, self._edges = delta.compact()
+            self._delta = None
 
     def connected_components(self):
         """
@@ -1337,7 +2330,7 @@ class StellarGraph:
             to smallest (fewest nodes).
         """
 
-        adj = self.to_adjacency_matrix()
+        adj = self._adjacency_matrix()
         count, cc_labels = sps.csgraph.connected_components(adj, directed=False)
         cc_sizes = np.bincount(cc_labels, minlength=count)
         cc_by_size = np.argsort(cc_sizes)[::-1]
@@ -1433,10 +2426,7 @@ class StellarGraph:
                 graph.add_nodes_from(node_ids, **ty_dict)
 
         iterator = zip(
-            self._nodes.ids.from_iloc(self._edges.sources),
-            self._nodes.ids.from_iloc(self._edges.targets),
-            self._edges.type_of_iloc(slice(None)),
-            self._edges.weights,
+            *self.edge_arrays(include_edge_type=True, include_edge_weight=True),
         )
         graph.add_edges_from(
             (src, dst, {edge_type_attr: type_, edge_weight_attr: weight})
@@ -1445,43 +2435,238 @@ class StellarGraph:
 
         return graph
 
-    def _adjacency_types(self, graph_schema: GraphSchema, use_ilocs=False):
+    def to_coo(self):
+        """
+        Create a SciPy COO sparse matrix with one entry for each edge, along with the type of each
+        edge.
+
+        Unlike :meth:`to_adjacency_matrix`, multiple edges between the same pair of nodes are kept
+        as separate entries (rather than summed), and the entries are in the order of the edge
+        ilocs, with the weights as the ``data``.
+
+        Returns:
+            A tuple of the ``number_of_nodes × number_of_nodes`` COO matrix indexed by :ref:`node
+            ilocs <iloc-explanation>`, and a numpy array of the type of each entry, as an index
+            into :meth:`edge_types`.
+        """
+        return export.to_coo(self._nodes, self._edges)
+
+    def to_arrow(self, include_features=False, use_ilocs=False):
         """
-        Obtains the edges in the form of the typed mapping:
+        Create Apache Arrow tables of the nodes and edges of this graph.
 
-            {edge_type_triple: {source_node: [target_node, ...]}}
+        The node table has ``id`` and ``type`` columns (and a list-valued ``features`` column with
+        ``include_features=True``), and the edge table has ``id``, ``source``, ``target``,
+        ``type`` and ``weight`` columns. Types are dictionary-encoded. The columns are built
+        directly from the graph's arrays, without creating Python objects for each element
+        (except for IDs that are themselves Python objects, like strings).
+
+        This requires the ``pyarrow`` module.
 
         Args:
-            graph_schema: The graph schema.
-            use_ilocs (bool): if True return :ref:`node ilocs <iloc-explanation>`
+            include_features (bool): if True, include the node features (sparse features are
+                converted to dense)
+            use_ilocs (bool): if True, use :ref:`node ilocs <iloc-explanation>` for the node IDs,
+                sources and targets, and edge ilocs for the edge IDs
+
         Returns:
-             The edge types mapping.
+            A tuple of the node ``pyarrow.Table`` and the edge ``pyarrow.Table``.
         """
-        source_types, rel_types, target_types = self._edge_type_triples(slice(None))
+        return export.to_arrow(self._nodes, self._edges, include_features, use_ilocs)
 
-        triples = defaultdict(lambda: defaultdict(lambda: []))
+    def to_parquet(
+        self, nodes_path, edges_path, include_features=False, use_ilocs=False
+    ):
+        """
+        Write the nodes and edges of this graph to Parquet files, as the tables from
+        :meth:`to_arrow`.
 
-        sources = self._edges.sources
-        targets = self._edges.targets
+        The edge file can be read again with :meth:`from_files`, such as
+        ``StellarGraph.from_files(edges=edges_path, edge_type_column="type")``.
+
+        This requires the ``pyarrow`` module.
+
+        Args:
+            nodes_path (str): the path of the file for the nodes
+            edges_path (str): the path of the file for the edges
+            include_features (bool): as for :meth:`to_arrow`
+            use_ilocs (bool): as for :meth:`to_arrow`
+        """
+        export.to_parquet(
+            self._nodes,
+            self._edges,
+            nodes_path,
+            edges_path,
+            include_features,
+            use_ilocs,
+        )
+
+    def to_npz(self, path, compressed=True):
+        """
+        Write the edge list of this graph to a NumPy ``.npz`` file.
+
+        The file contains arrays of the ``sources``, ``targets``, ``weights`` and
+        ``edge_type_ilocs`` of each edge (with the sources and targets as :ref:`node ilocs
+        <iloc-explanation>`), along with ``node_ids``, ``node_type_ilocs``, ``edge_ids`` and the
+        ``node_types`` and ``edge_types`` names that the ilocs refer to, and ``is_directed``.
+        String IDs and types are stored as fixed-width unicode arrays, so the file can be read with
+        ``numpy.load(path)``. IDs and types that are not numbers or strings (such as a mix of
+        both) are pickled, and so need ``numpy.load(path, allow_pickle=True)``.
+
+        Node features are not included; see :meth:`save` to save a whole graph.
+
+        Args:
+            path (str): the path of the file
+            compressed (bool): if True, compress the file (see ``numpy.savez_compressed``)
+        """
+        export.to_npz(path, self._nodes, self._edges, self.is_directed(), compressed)
+
+    def _typed_adj_indices(self, *, ins, outs, by_relation=True):
+        """
+        Obtains the adjacency index for each edge type triple, mapping the :ref:`iloc
+        <iloc-explanation>` of each node of the triple's first node type to the ilocs of its
+        neighbours (see :meth:`.EdgeData.typed_adj_indices`).
+
+        Args:
+            by_relation (bool): if False, combine the edges of every edge type, giving an index
+                for each pair of node types, with the neighbours in the same order as
+                :meth:`neighbors`
+
+        Returns:
+            A dictionary mapping each :class:`.EdgeType` (or ``(n1, n2)`` tuple of node types, if
+            ``by_relation`` is False) that has at least one edge to an :class:`.AdjacencyIndex`.
+        """
+        indices = self._edges.typed_adj_indices(
+            self._nodes.type_ilocs, ins=ins, outs=outs, by_relation=by_relation
+        )
+        node_types = self._nodes.types
+        if not by_relation:
+            return {
+                (node_types.from_iloc(n1), node_types.from_iloc(n2)): index
+                for (n1, n2), index in indices.items()
+            }
+
+        edge_types = self._edges.types
+        return {
+            EdgeType(
+                node_types.from_iloc(n1),
+                edge_types.from_iloc(rel),
+                node_types.from_iloc(n2),
+            ): index
+            for (n1, rel, n2), index in indices.items()
+        }
+
+    def typed_adjacency(self, edge_type):
+        """
+        Obtains the neighbours of every node via the edges of a single edge type triple, as a
+        compressed sparse row (CSR) index of :ref:`node ilocs <iloc-explanation>`.
+
+        The neighbours of the node with iloc ``i`` are ``neighbours[offsets[i]:offsets[i + 1]]``,
+        sorted by the string representation of their iloc (for example, 10 is before 2), as with the
+        adjacency lists of earlier versions. This is empty if the node doesn't have the triple's
+        first node type (``n1``),
+        and otherwise contains nodes of its second node type (``n2``). For an undirected graph,
+        edges are traversed in both directions, while for a directed graph, they're only traversed
+        from source to target.
+
+        The index for all triples is computed together with vectorized operations the first time
+        it's required, and then cached.
+
+        Args:
+            edge_type (EdgeType or tuple): the ``(n1, rel, n2)`` triple of node type, edge type and
+                neighbour node type, such as one from :meth:`create_graph_schema`.
+
+        Returns:
+            A tuple of numpy arrays ``(offsets, neighbours)``, where ``offsets`` has one element
+            more than the number of nodes in the graph.
+        """
+        n1, rel, n2 = edge_type
+        self._nodes.types.to_iloc([n1, n2], strict=True)
+        self._edges.types.to_iloc([rel], strict=True)
+
+        indices = self._typed_adj_indices(ins=not self.is_directed(), outs=True)
+        index = indices.get(EdgeType(n1, rel, n2))
+        num_nodes = self.number_of_nodes()
+        if index is None:
+            return (
+                np.zeros(num_nodes + 1, dtype=np.uint8),
+                np.array([], dtype=self._edges.sources.dtype),
+            )
+
+        # the index only covers nodes up to the last one with an edge, so extend it to every node
+        offsets = index.offsets
+        padding = num_nodes - len(index)
+        if padding > 0:
+            offsets = np.concatenate([offsets, np.repeat(offsets[-1], padding)])
+
+        return offsets, index.values
+
+    def _edge_ilocs_between(self, sources, targets, edge_types, use_ilocs):
         if not use_ilocs:
-            sources = self._nodes.ids.from_iloc(sources)
-            targets = self._nodes.ids.from_iloc(targets)
+            sources = self._nodes.ids.to_iloc(sources, smaller_type=False)
+            targets = self._nodes.ids.to_iloc(targets, smaller_type=False)
+
+        offsets, edge_ilocs = self._edges.edge_ilocs_between(
+            sources, targets, directed=self.is_directed()
+        )
+
+        if edge_types is not None:
+            offsets, correct_type = self._edge_type_filter(
+                offsets, edge_ilocs, edge_types
+            )
+            edge_ilocs = edge_ilocs[correct_type]
+
+        return offsets, edge_ilocs
+
+    def has_edges(self, sources, targets, edge_types=None, use_ilocs=False):
+        """
+        Checks whether there is an edge between each of the given pairs of nodes, in a single
+        vectorized operation.
+
+        For a directed graph, this only checks for edges from ``sources[i]`` to ``targets[i]``,
+        while for an undirected graph, an edge in either direction counts. The first call builds
+        a sorted index of the node pairs of every edge, which is then reused.
+
+        Args:
+            sources (iterable): The first node of each pair.
+            targets (iterable): The second node of each pair, with the same length as ``sources``.
+            edge_types (list of hashable, optional): If provided, only consider edges of these
+                types.
+            use_ilocs (bool): if True `sources` and `targets` are treated as :ref:`node ilocs
+                <iloc-explanation>`.
+
+        Returns:
+            A boolean numpy array where element ``i`` is True if there is an edge between
+            ``sources[i]`` and ``targets[i]``. Pairs involving unknown nodes have no edges.
+        """
+        offsets, _ = self._edge_ilocs_between(sources, targets, edge_types, use_ilocs)
+        return np.diff(offsets) > 0
 
-        iterator = zip(source_types, rel_types, target_types, sources, targets,)
-        for src_type, rel_type, tgt_type, src, tgt in iterator:
-            triple = EdgeType(src_type, rel_type, tgt_type)
-            triples[triple][src].append(tgt)
+    def edge_weights(self, sources, targets, edge_types=None, use_ilocs=False):
+        """
+        Obtains the weights of the edges between each of the given pairs of nodes, in a single
+        vectorized operation.
 
-            if not self.is_directed() and src != tgt:
-                other_triple = EdgeType(tgt_type, rel_type, src_type)
-                triples[other_triple][tgt].append(src)
+        See :meth:`has_edges` for details about which edges are considered. There may be any number
+        of edges between a pair of nodes, so the result is a "ragged" array: the weights of the
+        edges between ``sources[i]`` and ``targets[i]`` are ``weights[offsets[i]:offsets[i +
+        1]]``.
 
-        for subdict in triples.values():
-            for v in subdict.values():
-                # each list should be in order, to ensure sampling methods are deterministic
-                v.sort(key=str)
+        Args:
+            sources (iterable): The first node of each pair.
+            targets (iterable): The second node of each pair, with the same length as ``sources``.
+            edge_types (list of hashable, optional): If provided, only consider edges of these
+                types.
+            use_ilocs (bool): if True `sources` and `targets` are treated as :ref:`node ilocs
+                <iloc-explanation>`.
 
-        return triples
+        Returns:
+            A tuple of numpy arrays ``(offsets, weights)``.
+        """
+        offsets, edge_ilocs = self._edge_ilocs_between(
+            sources, targets, edge_types, use_ilocs
+        )
+        return offsets, self._edges.weights[edge_ilocs]
 
     def _edge_weights(
         self, source_node: Any, target_node: Any, use_ilocs=False
@@ -1497,28 +2682,10 @@ class StellarGraph:
         Returns:
             list: The edge weights.
         """
-        # self loops should only be counted once, which means they're effectively always a directed
-        # edge at the storage level, unlikely other edges in an undirected graph. This is
-        # particularly important with the intersection1d call, where the source_ilocs and
-        # target_ilocs will be equal, when source_node == target_node, and thus the intersection
-        # will contain all incident edges.
-        effectively_directed = self.is_directed() or source_node == target_node
-        both_dirs = not effectively_directed
-
-        if not use_ilocs:
-            source_node = self._nodes.ids.to_iloc([source_node])[0]
-            target_node = self._nodes.ids.to_iloc([target_node])[0]
-
-        source_edge_ilocs = self._edges.edge_ilocs(
-            source_node, ins=both_dirs, outs=True
+        _, weights = self.edge_weights(
+            [source_node], [target_node], use_ilocs=use_ilocs
         )
-        target_edge_ilocs = self._edges.edge_ilocs(
-            target_node, ins=True, outs=both_dirs
-        )
-
-        ilocs = np.intersect1d(source_edge_ilocs, target_edge_ilocs, assume_unique=True)
-
-        return [float(x) for x in self._edges.weights[ilocs]]
+        return [float(x) for x in weights]
 
 
 # A convenience class that merely specifies that edges have direction.
@@ -1535,6 +2702,7 @@ class StellarDiGraph(StellarGraph):
         node_type_default=globalvar.NODE_TYPE_DEFAULT,
         edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
         dtype="float32",
+        edge_weight_dtype=None,
         # legacy arguments
         graph=None,
         node_type_name=globalvar.TYPE_ATTR_NAME,
@@ -1552,6 +2720,7 @@ class StellarDiGraph(StellarGraph):
             node_type_default=node_type_default,
             edge_type_default=edge_type_default,
             dtype=dtype,
+            edge_weight_dtype=edge_weight_dtype,
             # legacy arguments
             graph=graph,
             node_type_name=node_type_name,
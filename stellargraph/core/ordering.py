@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Orderings of the nodes of a graph that place connected nodes near each other, to improve the
+memory locality of operations like gathering the features of neighbours.
+"""
+
+import numpy as np
+import scipy.sparse as sps
+
+from .validation import comma_sep
+from ..random import random_state
+
+
+def _symmetric_adjacency(graph):
+    adj = graph._adjacency_matrix()
+    if graph.is_directed():
+        adj = (adj + adj.T).tocsr()
+    return adj
+
+
+def _degree_order(graph, adj, seed):
+    # highest degree first, so that the most frequently accessed nodes are together
+    return np.argsort(-graph.node_degree_array(), kind="stable")
+
+
+def _rcm_order(graph, adj, seed):
+    return sps.csgraph.reverse_cuthill_mckee(adj, symmetric_mode=True)
+
+
+def _first_per_group(groups, order):
+    # the first element of `order` in each group (of consecutive equal values of `groups[order]`)
+    sorted_groups = groups[order]
+    is_first = np.ones(len(order), dtype=bool)
+    is_first[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    return order[is_first]
+
+
+def _bfs_order(graph, adj, seed):
+    num_nodes = adj.shape[0]
+    _, components = sps.csgraph.connected_components(adj, directed=False)
+    degrees = np.diff(adj.indptr)
+
+    # start a breadth-first search from the highest degree node of each component, and run them
+    # all simultaneously, one level at a time
+    roots = _first_per_group(components, np.lexsort((-degrees, components)))
+
+    visited = np.zeros(num_nodes, dtype=bool)
+    visited[roots] = True
+    levels = []
+    frontier = roots
+    while len(frontier) > 0:
+        levels.append(frontier)
+
+        starts = adj.indptr[frontier]
+        counts = adj.indptr[frontier + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        gather = np.arange(counts.sum()) + np.repeat(starts - offsets, counts)
+        neighbours = adj.indices[gather]
+        neighbours = neighbours[~visited[neighbours]]
+
+        # each newly discovered node is visited in the order it was first seen
+        _, first_seen = np.unique(neighbours, return_index=True)
+        frontier = neighbours[np.sort(first_seen)]
+        visited[frontier] = True
+
+    # the levels interleave the components, so group each component together (in order of their
+    # roots), keeping the breadth-first order within each one
+    order = np.concatenate(levels) if levels else np.array([], dtype=int)
+    component_rank = np.empty(len(roots), dtype=np.int64)
+    component_rank[components[roots]] = np.arange(len(roots))
+    return order[np.argsort(component_rank[components[order]], kind="stable")]
+
+
+def _label_propagation(adj, rs, max_iter=20):
+    """
+    Find communities in a graph with (semi-synchronous) label propagation: every node starts in its
+    own community, and repeatedly joins the most common community among its neighbours.
+
+    Args:
+        adj (scipy sparse matrix): the symmetric adjacency matrix of the graph
+        rs (numpy RandomState): the random state to use for breaking ties
+        max_iter (int): the maximum number of rounds of propagation
+
+    Returns:
+        A numpy array of the community label of each node.
+    """
+    num_nodes = adj.shape[0]
+    coo = adj.tocoo()
+    rows = coo.row.astype(np.int64)
+    cols = coo.col
+    labels = np.arange(num_nodes, dtype=np.int64)
+
+    for _ in range(max_iter):
+        # count the labels of the neighbours of each node
+        pairs, counts = np.unique(rows * num_nodes + labels[cols], return_counts=True)
+        pair_rows = pairs // num_nodes
+        pair_labels = pairs % num_nodes
+
+        # the most common label for each node, breaking ties randomly
+        tiebreak = rs.random_sample(len(pairs))
+        best = _first_per_group(pair_rows, np.lexsort((tiebreak, -counts, pair_rows)))
+
+        if (labels[pair_rows[best]] == pair_labels[best]).all():
+            break
+
+        # only update about half of the nodes in each round, to avoid oscillating
+        update = best[rs.random_sample(len(best)) < 0.5]
+        labels[pair_rows[update]] = pair_labels[update]
+
+    return labels
+
+
+def _partition_order(graph, adj, seed):
+    _, rs = random_state(seed)
+    labels = _label_propagation(adj, rs)
+    # group the nodes in each community, keeping their existing relative order
+    return np.argsort(labels, kind="stable")
+
+
+_ORDERS = {
+    "degree": _degree_order,
+    "rcm": _rcm_order,
+    "bfs": _bfs_order,
+    "partition": _partition_order,
+}
+
+
+def node_order(graph, method, seed=None):
+    """
+    Compute an ordering of the nodes of ``graph`` that improves memory locality.
+
+    Args:
+        graph (StellarGraph): the graph
+        method (str): the ordering to compute, see :meth:`.StellarGraph.reorder`
+        seed (int, optional): the random seed, for methods that are randomised
+
+    Returns:
+        A permutation of the node ilocs of ``graph``, as a numpy array.
+    """
+    compute = _ORDERS.get(method)
+    if compute is None:
+        raise ValueError(
+            f"method: expected one of {comma_sep(list(_ORDERS))}, found {method!r}"
+        )
+
+    if graph.number_of_nodes() == 0:
+        return np.array([], dtype=np.int64)
+
+    return compute(graph, _symmetric_adjacency(graph), seed)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Partitioning the nodes of a graph into a fixed number of balanced parts, with few edges between
+the parts.
+"""
+
+import numpy as np
+
+from .ordering import _bfs_order, _first_per_group, _symmetric_adjacency
+from .validation import comma_sep
+from ..random import random_state
+
+
+def _chunks(order, num_parts):
+    # split the nodes into contiguous chunks of `order`, with sizes that differ by at most 1
+    parts = np.empty(len(order), dtype=np.int64)
+    parts[order] = np.arange(len(order)) * num_parts // len(order)
+    return parts
+
+
+def _random_parts(adj, num_parts, rs, imbalance, max_iter):
+    return _chunks(rs.permutation(adj.shape[0]), num_parts)
+
+
+def _rank_within_groups(groups):
+    # the position of each element within its group, for `groups` that is sorted
+    return np.arange(len(groups)) - np.searchsorted(groups, groups, side="left")
+
+
+def _label_propagation_parts(adj, num_parts, rs, imbalance, max_iter):
+    num_nodes = adj.shape[0]
+
+    # start from contiguous chunks of a breadth-first order, which already keeps most neighbours
+    # together, and then refine them
+    parts = _chunks(_bfs_order(None, adj, None), num_parts)
+
+    ideal = num_nodes / num_parts
+    max_size = max(int(np.ceil(ideal)), int(ideal * (1 + imbalance)))
+    min_size = max(1, min(int(ideal), int(np.ceil(ideal * (1 - imbalance)))))
+
+    coo = adj.tocoo()
+    rows = coo.row.astype(np.int64)
+    cols = coo.col
+    weights = coo.data
+
+    for _ in range(max_iter):
+        # the total weight of the edges from each node to each part
+        pairs, inverse = np.unique(rows * num_parts + parts[cols], return_inverse=True)
+        pair_weights = np.bincount(inverse, weights=weights)
+        pair_rows = pairs // num_parts
+        pair_parts = pairs % num_parts
+
+        internal = np.zeros(num_nodes)
+        is_internal = pair_parts == parts[pair_rows]
+        internal[pair_rows[is_internal]] = pair_weights[is_internal]
+
+        # the part with the most connections for each node, breaking ties randomly (the weights
+        # are edge counts, so a random fraction doesn't change their order), found with a
+        # segmented maximum because `pairs` is already sorted by node
+        scores = pair_weights + 0.5 * rs.random_sample(len(pairs))
+        starts = np.flatnonzero(np.diff(pair_rows, prepend=-1))
+        row_max = np.maximum.reduceat(scores, starts)
+        is_best = scores == np.repeat(row_max, np.diff(starts, append=len(pairs)))
+        best = _first_per_group(pair_rows, np.flatnonzero(is_best))
+        nodes = pair_rows[best]
+        targets = pair_parts[best]
+        gains = pair_weights[best] - internal[nodes]
+
+        improves = gains > 0
+        if not improves.any():
+            break
+
+        # only move about half of the nodes in each round, to avoid oscillating
+        move = improves & (rs.random_sample(len(nodes)) < 0.5)
+        nodes, targets, gains = nodes[move], targets[move], gains[move]
+
+        # keep the parts balanced, by allowing the moves with the highest gains until a part
+        # would be too large (conservatively ignoring nodes that leave it)...
+        sizes = np.bincount(parts, minlength=num_parts)
+        order = np.lexsort((-gains, targets))
+        nodes, targets, gains = nodes[order], targets[order], gains[order]
+        allowed = _rank_within_groups(targets) < (max_size - sizes)[targets]
+        nodes, targets, gains = nodes[allowed], targets[allowed], gains[allowed]
+
+        # ... or too small (ignoring nodes that join it)
+        sources = parts[nodes]
+        order = np.lexsort((-gains, sources))
+        nodes, targets, sources = nodes[order], targets[order], sources[order]
+        allowed = _rank_within_groups(sources) < (sizes - min_size)[sources]
+
+        parts[nodes[allowed]] = targets[allowed]
+
+    return parts
+
+
+_PARTITIONERS = {
+    "label_propagation": _label_propagation_parts,
+    "random": _random_parts,
+}
+
+
+def partition_nodes(
+    graph, num_parts, method="label_propagation", seed=None, imbalance=0.05, max_iter=20
+):
+    """
+    Partition the nodes of a graph into ``num_parts`` parts of similar size.
+
+    The ``"label_propagation"`` method starts from contiguous chunks of a breadth-first ordering of
+    the nodes, and then repeatedly moves nodes to the part that contains most of their neighbours
+    (while keeping the size of each part within ``imbalance`` of the average), so that few edges
+    cross between parts. It only uses vectorized NumPy and SciPy operations on the adjacency
+    matrix. The ``"random"`` method assigns nodes to parts uniformly at random.
+
+    Args:
+        graph (StellarGraph): the graph to partition, where edges are treated as undirected
+        num_parts (int): the number of parts, at most the number of nodes
+        method (str): the partitioning algorithm: ``"label_propagation"`` or ``"random"``
+        seed (int, optional): the random seed
+        imbalance (float): the largest fraction by which the size of a part can differ from the
+            average size when refining the partition
+        max_iter (int): the maximum number of rounds of refinement
+
+    Returns:
+        A numpy array of the part (from ``0`` to ``num_parts - 1``) of each node, indexed by
+        :ref:`node iloc <iloc-explanation>`.
+    """
+    partition = _PARTITIONERS.get(method)
+    if partition is None:
+        raise ValueError(
+            f"method: expected one of {comma_sep(list(_PARTITIONERS))}, found {method!r}"
+        )
+
+    num_nodes = graph.number_of_nodes()
+    if not 1 <= num_parts <= num_nodes:
+        raise ValueError(
+            f"num_parts: expected a value between 1 and the number of nodes ({num_nodes}), found {num_parts}"
+        )
+
+    _, rs = random_state(seed)
+    return partition(_symmetric_adjacency(graph), num_parts, rs, imbalance, max_iter)
+
+
+def edge_cut(graph, parts):
+    """
+    Compute the fraction of the edges of a graph that are between nodes in different parts.
+
+    Args:
+        graph (StellarGraph): the graph
+        parts (numpy array): the part of each node, indexed by :ref:`node iloc
+            <iloc-explanation>`, such as from :func:`partition_nodes`
+
+    Returns:
+        The fraction of edges that cross between parts, from 0 to 1.
+    """
+    if graph.number_of_edges() == 0:
+        return 0.0
+
+    edges = graph._edges
+    return float(np.mean(parts[edges.sources] != parts[edges.targets]))
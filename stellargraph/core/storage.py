@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Saving and loading the element_data.py types as a directory of flat ``.npy`` files, which can be
+memory-mapped on load.
+"""
+
+import json
+import os
+
+import numpy as np
+import scipy.sparse as sps
+
+from ..globalvar import SOURCE, TARGET, WEIGHT
+from .element_data import NodeData, EdgeData, AdjacencyIndex
+from .feature_store import ArrayFeatureStore
+
+FORMAT_VERSION = 1
+METADATA_FILE = "metadata.json"
+
+# the approximate number of bytes of features that are read into memory at once, when saving
+# features that aren't held in an array
+_SAVE_CHUNK_BYTES = 64 * 2 ** 20
+
+# the adjacency indices that are saved, by name, with the (ins, outs) arguments to
+# `EdgeData.adj_index`
+_ADJ_INDICES = {"both": (True, True), "in": (True, False), "out": (False, True)}
+
+
+def _json_type_name(type_name, name):
+    # type names are often numpy scalars (e.g. from np.unique), which JSON can't handle directly
+    if isinstance(type_name, np.generic):
+        type_name = type_name.item()
+
+    if not isinstance(type_name, (str, int, float, bool)):
+        raise TypeError(
+            f"{name}: expected type names to be strings or numbers to be saved, found {type(type_name).__name__}"
+        )
+    return type_name
+
+
+def _json_type_starts(type_starts, name):
+    return [[_json_type_name(t, name), int(start)] for t, start in type_starts]
+
+
+def _save_array(path, file_name, array):
+    array = np.asarray(array)
+    np.save(os.path.join(path, file_name), array, allow_pickle=array.dtype == object)
+    return {"file": file_name}
+
+
+def _has_object_dtype(file_name):
+    # read from the file's own header (not the metadata), because object arrays are pickled
+    with open(file_name, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return dtype.hasobject
+
+
+def _load_array(path, info, mmap, allow_pickle=False):
+    """
+    Load an array, which is only unpickled (if it contains Python objects) when the caller
+    explicitly allows it for that array, never based on the contents of the saved files.
+    """
+    file_name = os.path.join(path, info["file"])
+    is_object = _has_object_dtype(file_name)
+    if is_object and not allow_pickle:
+        raise ValueError(
+            f"allow_pickle: the array in {file_name!r} contains Python objects, which can only be loaded by unpickling them; please pass allow_pickle=True if the saved graph is trusted"
+        )
+
+    # arrays of Python objects can't be memory-mapped, and so are loaded into memory
+    mmap_mode = "r" if mmap and not is_object else None
+    return np.load(file_name, mmap_mode=mmap_mode, allow_pickle=is_object)
+
+
+def _save_ids(path, file_name, ids):
+    # fixed-width strings don't need pickling, and so can be memory-mapped
+    return _save_array(path, file_name, ids.to_array())
+
+
+def _save_features(path, file_name, store):
+    if isinstance(store, ArrayFeatureStore):
+        # the features are already in memory or memory-mapped, so can be saved directly
+        features = store.to_array()
+        if isinstance(features, sps.spmatrix):
+            file_name += ".npz"
+            sps.save_npz(os.path.join(path, file_name), features.tocsr())
+            return {"file": file_name, "sparse": True}
+
+        return {**_save_array(path, file_name + ".npy", features), "sparse": False}
+
+    # other stores may hold their features out-of-core, so they're copied into the file one chunk
+    # of rows at a time, rather than being loaded into memory all at once
+    file_name += ".npy"
+    rows, columns = store.shape
+    if rows == 0 or columns == 0:
+        empty = np.empty(store.shape, dtype=store.dtype)
+        return {**_save_array(path, file_name, empty), "sparse": False}
+
+    saved = np.lib.format.open_memmap(
+        os.path.join(path, file_name), mode="w+", dtype=store.dtype, shape=store.shape
+    )
+    chunk_rows = max(1, _SAVE_CHUNK_BYTES // (columns * store.dtype.itemsize))
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        chunk = store.gather(np.arange(start, stop))
+        saved[start:stop] = chunk.toarray() if sps.issparse(chunk) else chunk
+
+    saved.flush()
+    return {"file": file_name, "sparse": False}
+
+
+def _load_features(path, info, mmap):
+    if info["sparse"]:
+        return sps.load_npz(os.path.join(path, info["file"]))
+
+    return _load_array(path, info, mmap)
+
+
+def save(path, nodes: NodeData, edges: EdgeData, is_directed):
+    """
+    Save the nodes and edges of a graph to the directory ``path``, creating it if required.
+
+    This computes (if required) and saves the adjacency indices used by the graph, so that they
+    don't need to be recomputed after loading.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    # the metadata is removed first and written last, so that if this save is interrupted, any
+    # previous graph in this directory can't be loaded with its metadata describing new arrays
+    metadata_path = os.path.join(path, METADATA_FILE)
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+
+    node_type_starts = nodes.type_starts
+    node_features = [
+        _save_features(path, f"node_features_{i}", nodes.feature_store(type_name))
+        for i, (type_name, _) in enumerate(node_type_starts)
+    ]
+
+    edge_columns = {SOURCE: edges.sources, TARGET: edges.targets, WEIGHT: edges.weights}
+    edge_column_info = {
+        name: _save_array(path, f"edge_{name}.npy", column)
+        for name, column in edge_columns.items()
+    }
+
+    # undirected graphs only ever use both directions at once
+    adj_names = ["both", "in", "out"] if is_directed else ["both"]
+    adj_info = {}
+    for adj_name in adj_names:
+        ins, outs = _ADJ_INDICES[adj_name]
+        index = edges.adj_index(ins=ins, outs=outs)
+        adj_info[adj_name] = {
+            "offsets": _save_array(path, f"adj_{adj_name}_offsets.npy", index.offsets),
+            "values": _save_array(path, f"adj_{adj_name}_values.npy", index.values),
+        }
+
+    metadata = {
+        "version": FORMAT_VERSION,
+        "is_directed": is_directed,
+        "nodes": {
+            "ids": _save_ids(path, "node_ids.npy", nodes.ids),
+            "type_starts": _json_type_starts(node_type_starts, "nodes"),
+            "features": node_features,
+        },
+        "edges": {
+            "ids": _save_ids(path, "edge_ids.npy", edges.ids),
+            "type_starts": _json_type_starts(edges.type_starts, "edges"),
+            "columns": edge_column_info,
+            "adjacency": adj_info,
+        },
+    }
+
+    with open(metadata_path, "w") as f:
+        json.dump(metadata, f)
+
+
+def load(path, mmap, allow_pickle=False):
+    """
+    Load the nodes and edges of a graph saved with :func:`save`.
+
+    Only the node and edge IDs can contain Python objects (like IDs of mixed types), and these are
+    only unpickled with ``allow_pickle=True``.
+
+    Returns:
+        A tuple of the ``NodeData``, the ``EdgeData`` and whether the graph is directed.
+    """
+    metadata_path = os.path.join(path, METADATA_FILE)
+    try:
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(
+            f"path: expected a directory containing a saved graph, found no {METADATA_FILE!r} in {path!r}"
+        ) from None
+
+    version = metadata.get("version")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"path: expected a saved graph with format version {FORMAT_VERSION}, found version {version!r}"
+        )
+
+    node_meta = metadata["nodes"]
+    node_type_starts = [tuple(ts) for ts in node_meta["type_starts"]]
+    node_features = {
+        type_name: _load_features(path, info, mmap)
+        for (type_name, _), info in zip(node_type_starts, node_meta["features"])
+    }
+    nodes = NodeData(
+        _load_array(path, node_meta["ids"], mmap, allow_pickle),
+        {},
+        node_type_starts,
+        node_features,
+    )
+
+    edge_meta = metadata["edges"]
+    edge_columns = {
+        name: _load_array(path, info, mmap)
+        for name, info in edge_meta["columns"].items()
+    }
+    edges = EdgeData(
+        _load_array(path, edge_meta["ids"], mmap, allow_pickle),
+        edge_columns,
+        [tuple(ts) for ts in edge_meta["type_starts"]],
+    )
+
+    for adj_name, info in edge_meta["adjacency"].items():
+        ins, outs = _ADJ_INDICES[adj_name]
+        index = AdjacencyIndex(
+            _load_array(path, info["offsets"], mmap),
+            _load_array(path, info["values"], mmap),
+        )
+        edges.set_adj_index(index, ins=ins, outs=outs)
+
+    return nodes, edges, metadata["is_directed"]
@@ -22,12 +22,15 @@ __all__ = [
     "SampledHeterogeneousBreadthFirstWalk",
     "TemporalRandomWalk",
     "DirectedBreadthFirstNeighbours",
+    "RandomWalkStream",
 ]
 
 
+import multiprocessing
 import numpy as np
 import warnings
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from scipy import stats
 from scipy.special import softmax
 
@@ -35,7 +38,8 @@ from ..core.schema import GraphSchema
 from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable
 from ..core.validation import require_integer_in_range, comma_sep
-from ..random import random_state
+from ..random import random_state, picklable_state, restore_picklable_state
+from .walk_corpus import WalkCorpus, walk_corpus_metadata
 from abc import ABC, abstractmethod
 
 
@@ -48,11 +52,246 @@ def _default_if_none(value, default, name, ensure_not_none=True):
     return value
 
 
+# the number of rounds of rejection sampling for a step of BiasedRandomWalk, before sampling any
+# remaining walks from the exact distribution
+_MAX_REJECTION_ROUNDS = 20
+
+
+class _NeighbourSampler:
+    """
+    Vectorized sampling of a random neighbour for each of many nodes at once, by following one of
+    their edges (in either direction), chosen uniformly or in proportion to the edge weights.
+
+    The edges of each node are found from the graph's CSR adjacency index. For weighted sampling,
+    the cumulative sum of the weights over that index is precomputed, so that sampling is a single
+    ``searchsorted``.
+
+    Args:
+        graph (StellarGraph): the graph
+        weighted (bool): if True, sample edges in proportion to their weights
+    """
+
+    def __init__(self, graph, weighted):
+        edges = graph._edges
+        index = edges.adj_index(ins=True, outs=True)
+
+        # the index might not include the nodes with the largest ilocs, if they have no edges
+        num_nodes = graph.number_of_nodes()
+        num_indexed = len(index.offsets) - 1
+        starts = np.zeros(num_nodes, dtype=np.int64)
+        starts[:num_indexed] = index.offsets[:-1]
+        counts = np.zeros(num_nodes, dtype=np.int64)
+        counts[:num_indexed] = np.diff(index.offsets)
+
+        self._sources = edges.sources
+        self._targets = edges.targets
+        self._edge_ilocs = index.values
+        self._starts = starts
+        self._counts = counts
+
+        if weighted:
+            cumulative = np.cumsum(edges.weights[index.values], dtype=np.float64)
+            padded = np.concatenate([[0.0], cumulative])
+            self._cumulative = cumulative
+            self._padded = padded
+            self._before = padded[starts]
+            self._totals = padded[starts + counts] - self._before
+            # a node whose edges all have zero weight is a dead end
+            self.has_neighbours = self._totals > 0
+        else:
+            self._cumulative = None
+            self.has_neighbours = counts > 0
+
+    def sample(self, np_rs, nodes):
+        """
+        Args:
+            np_rs (RandomState): the random state
+            nodes (numpy array): the ilocs of some nodes, that all have neighbours
+
+        Returns:
+            A numpy array of the iloc of a random neighbour of each node.
+        """
+        u = np_rs.random_sample(len(nodes))
+        starts = self._starts[nodes]
+        if self._cumulative is None:
+            positions = starts + (u * self._counts[nodes]).astype(np.int64)
+        else:
+            positions = np.searchsorted(
+                self._cumulative, self._before[nodes] + u * self._totals[nodes], "right"
+            )
+            # rounding might put a position just past the end of the node's edges
+            positions = np.minimum(positions, starts + self._counts[nodes] - 1)
+
+        return self._other_end(self._edge_ilocs[positions], nodes)
+
+    def edges(self, node):
+        """
+        Args:
+            node (int): the iloc of a node
+
+        Returns:
+            A tuple of a numpy array of the iloc of the other end of each edge of ``node``, and the
+            probability of sampling each of those edges.
+        """
+        start = self._starts[node]
+        edge_ilocs = self._edge_ilocs[start : start + self._counts[node]]
+        if self._cumulative is None:
+            weights = np.ones(len(edge_ilocs))
+        else:
+            weights = np.diff(self._padded[start : start + len(edge_ilocs) + 1])
+
+        return self._other_end(edge_ilocs, node), weights / weights.sum()
+
+    def _other_end(self, edge_ilocs, nodes):
+        # (which also works for self loops)
+        return (
+            self._sources[edge_ilocs].astype(np.int64)
+            + self._targets[edge_ilocs]
+            - nodes
+        )
+
+
+def _walk_ilocs(sampler, np_rs, start_nodes, length, second_order_step=None):
+    """
+    Advance a random walk from each of ``start_nodes`` simultaneously, one step at a time.
+
+    Args:
+        sampler (_NeighbourSampler): samples the first order steps
+        np_rs (RandomState): the random state
+        start_nodes (numpy array): the node iloc at the start of each walk
+        length (int): the maximum length of each walk
+        second_order_step (callable, optional): called as ``second_order_step(np_rs, current,
+            previous)`` to choose the next node of each walk (after the first step) based on the
+            current and previous nodes, instead of using ``sampler`` directly
+
+    Returns:
+        A numpy array of shape ``(len(start_nodes), length)`` of the node ilocs of each walk, where
+        walks that stop early at a dead end are padded with ``-1``.
+    """
+    walks = np.full((len(start_nodes), length), -1, dtype=np.int64)
+    walks[:, 0] = start_nodes
+
+    walk_indices = np.arange(len(start_nodes))
+    current = walks[:, 0]
+    previous = None
+    for step in range(1, length):
+        # walks that reach a dead end stop
+        has_neighbours = sampler.has_neighbours[current]
+        walk_indices = walk_indices[has_neighbours]
+        current = current[has_neighbours]
+        if previous is not None:
+            previous = previous[has_neighbours]
+
+        if len(current) == 0:
+            break
+
+        if previous is None or second_order_step is None:
+            following = sampler.sample(np_rs, current)
+        else:
+            following = second_order_step(np_rs, current, previous)
+
+        previous, current = current, following
+        walks[walk_indices, step] = current
+
+    return walks
+
+
+def _iloc_walks_to_ids(graph, walks):
+    # convert all of the IDs at once, and then split them into the (possibly short) walks
+    walk_lengths = (walks != -1).sum(axis=1)
+    ids = graph.node_ilocs_to_ids(walks[walks != -1]).tolist()
+    ends = np.cumsum(walk_lengths)
+    return [
+        ids[end - walk_length : end] for end, walk_length in zip(ends, walk_lengths)
+    ]
+
+
+# the number of root nodes (or context windows, for TemporalRandomWalk) in each shard of a parallel
+# run: this is fixed, rather than depending on the number of workers, so that the walks depend only
+# on the seed
+_ROOTS_PER_SHARD = 1000
+_CONTEXT_WINDOWS_PER_SHARD = 10000
+
+# the walker used by each worker process of a parallel run
+_worker_walker = None
+
+
+def _shard_seeds(np_rs, seed, num_shards):
+    # independent seeds for each shard, derived from `seed`, or from the walker's random state (so
+    # that a walker seeded at construction still gives reproducible runs)
+    if seed is None:
+        entropy = int(np_rs.randint(2 ** 32, dtype=np.uint64))
+    else:
+        require_integer_in_range(seed, "seed", min_val=0)
+        entropy = seed
+
+    children = np.random.SeedSequence(entropy).spawn(num_shards)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _init_worker(walker):
+    global _worker_walker
+    _worker_walker = walker
+
+
+def _run_worker_shard(kwargs):
+    return _worker_walker.run(**kwargs)
+
+
+def _run_shards(walker, shard_kwargs, workers):
+    """
+    Call ``walker.run`` with the arguments of each shard, in a pool of ``workers`` processes.
+
+    Returns:
+        A list of the results of each shard, in order.
+    """
+    workers = min(workers, len(shard_kwargs))
+    if workers <= 1:
+        return [walker.run(**kwargs) for kwargs in shard_kwargs]
+
+    # forking shares the graph with the workers (copy-on-write), rather than pickling it
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    )
+    with ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker, initargs=(walker,)
+    ) as pool:
+        return list(pool.map(_run_worker_shard, shard_kwargs))
+
+
+def _run_root_shards(walker, nodes, workers, seed, **kwargs):
+    """
+    Run the walks from ``nodes`` in fixed-size shards of root nodes, in parallel, each with its own
+    seed.
+    """
+    require_integer_in_range(workers, "workers", min_val=1)
+    if not isinstance(nodes, np.ndarray):
+        nodes = list(nodes)
+
+    starts = range(0, len(nodes), _ROOTS_PER_SHARD)
+    seeds = _shard_seeds(walker._np_random_state, seed, len(starts))
+    shard_kwargs = [
+        dict(kwargs, nodes=nodes[start : start + _ROOTS_PER_SHARD], seed=shard_seed)
+        for start, shard_seed in zip(starts, seeds)
+    ]
+    results = _run_shards(walker, shard_kwargs, workers)
+
+    if isinstance(results[0], np.ndarray):
+        return np.concatenate(results)
+    return [walk for walks in results for walk in walks]
+
+
 class RandomWalk(ABC):
     """
     Abstract base class for Random Walk classes. A Random Walk class must implement a ``run`` method
     which takes an iterable of node IDs and returns a list of walks. Each walk is a list of node IDs
     that contains the starting node as its first element.
+
+    Walks can be generated in parallel by passing ``workers`` to ``run``. The root nodes are split
+    into shards of a fixed size, and each shard is walked with its own seed, derived from the run's
+    seed with :class:`numpy.random.SeedSequence`, in one of a pool of worker processes. The
+    walks thus depend only on the seed and not on the number of workers, but they are different
+    to the walks from a run without ``workers``.
     """
 
     def __init__(self, graph, seed=None):
@@ -62,6 +301,13 @@ class RandomWalk(ABC):
         self.graph = graph
         self._random_state, self._np_random_state = random_state(seed)
 
+    def __getstate__(self):
+        # the random state may be a global module, which can't be pickled directly
+        return picklable_state(self)
+
+    def __setstate__(self, state):
+        restore_picklable_state(self, state)
+
     def _get_random_state(self, seed):
         """
         Args:
@@ -78,6 +324,20 @@ class RandomWalk(ABC):
         rs, _ = random_state(seed)
         return rs
 
+    def _get_np_random_state(self, seed):
+        """
+        Args:
+            seed: The optional seed value for a given run.
+
+        Returns:
+            The NumPy random state as determined by the seed.
+        """
+        if seed is None:
+            return self._np_random_state
+        require_integer_in_range(seed, "seed", min_val=0)
+        _, np_rs = random_state(seed)
+        return np_rs
+
     @staticmethod
     def _validate_walk_params(nodes, n, length):
         if not is_real_iterable(nodes):
@@ -96,6 +356,111 @@ class RandomWalk(ABC):
     def run(self, nodes, **kwargs):
         pass
 
+    def _run_ilocs(self, nodes, **kwargs):
+        """
+        Perform the walks from some root nodes given as ilocs, returning the walks as a NumPy
+        array of ilocs, padded with ``-1`` (like ``UniformRandomWalk.run(..., use_ilocs=True)``).
+        """
+        walks = self.run(self.graph.node_ilocs_to_ids(nodes), **kwargs)
+        lengths = np.array([len(walk) for walk in walks], dtype=np.int64)
+        padded = np.full((len(walks), lengths.max(initial=0)), -1, dtype=np.int64)
+        if len(walks) > 0:
+            flat = self.graph.node_ids_to_ilocs(
+                [node for walk in walks for node in walk]
+            )
+            padded[np.arange(padded.shape[1]) < lengths[:, None]] = flat
+
+        return padded
+
+    def iter_walks(
+        self, nodes, *, chunk_size=1000, use_ilocs=False, as_str=False, **kwargs
+    ):
+        """
+        Perform the walks lazily, a chunk of root nodes at a time, so that the memory used is
+        bounded by the walks from one chunk, rather than by every walk.
+
+        The result can be iterated over several times, and gives the same walks each time, so it
+        can be used directly as the corpus for gensim's ``Word2Vec``, which makes a pass over
+        the corpus to build the vocabulary and then one for each training epoch:
+
+        .. code-block:: python
+
+            walks = BiasedRandomWalk(graph, n=10, length=80, p=0.5, q=2.0).iter_walks(
+                graph.nodes(), as_str=True
+            )
+            model = Word2Vec(walks, ...)
+
+        Args:
+            nodes (list): The root nodes as a list of node IDs
+            chunk_size (int): the number of root nodes in each chunk
+            use_ilocs (bool): if True, ``nodes`` are :ref:`node ilocs <iloc-explanation>`, and
+                the walks are NumPy arrays of ilocs
+            as_str (bool): if True, each element of each walk is converted to a string, as used
+                for the tokens of gensim's ``Word2Vec``
+            kwargs: other arguments for the ``run`` method of this walker, like ``n``,
+                ``length`` or ``seed``
+
+        Returns:
+            A :class:`.RandomWalkStream` of the walks from ``nodes``.
+        """
+        require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+        if not is_real_iterable(nodes):
+            raise ValueError(f"nodes: expected an iterable, found: {nodes}")
+
+        if not isinstance(nodes, np.ndarray):
+            nodes = list(nodes)
+
+        # the seed of each chunk is fixed here, so that every pass gives the same walks
+        num_chunks = -(-len(nodes) // chunk_size)
+        seeds = _shard_seeds(
+            self._np_random_state, kwargs.pop("seed", None), num_chunks
+        )
+        chunks = [
+            (nodes[i * chunk_size : (i + 1) * chunk_size], seed)
+            for i, seed in enumerate(seeds)
+        ]
+        return RandomWalkStream(self, chunks, use_ilocs, as_str, kwargs)
+
+
+class RandomWalkStream:
+    """
+    A restartable iterable over the walks of a :class:`.RandomWalk`, that are generated lazily, one
+    chunk of root nodes at a time, each time it is iterated over. Create this with
+    :meth:`.RandomWalk.iter_walks`.
+
+    Iterating over this yields each walk: a list of node IDs, or a NumPy array of node ilocs if
+    ``use_ilocs=True``.
+    """
+
+    def __init__(self, walker, chunks, use_ilocs, as_str, run_kwargs):
+        self._walker = walker
+        self._chunks = chunks
+        self._use_ilocs = use_ilocs
+        self._as_str = as_str
+        self._run_kwargs = run_kwargs
+
+    def chunks(self):
+        """
+        Iterate over the walks from each chunk of root nodes.
+
+        Yields:
+            A list of walks (as lists of node IDs) for each chunk, or, if ``use_ilocs=True``, a
+            NumPy array of node ilocs for each chunk, with one row per walk padded with ``-1``.
+        """
+        for nodes, seed in self._chunks:
+            if self._use_ilocs:
+                yield self._walker._run_ilocs(nodes, seed=seed, **self._run_kwargs)
+            else:
+                yield self._walker.run(nodes, seed=seed, **self._run_kwargs)
+
+    def __iter__(self):
+        for walks in self.chunks():
+            if self._use_ilocs:
+                walks = (walk[walk != -1] for walk in walks)
+            if self._as_str:
+                walks = ([str(node) for node in walk] for walk in walks)
+            yield from walks
+
 
 class GraphWalk(object):
     """
@@ -123,13 +488,28 @@ class GraphWalk(object):
                 "The parameter graph_schema should be either None or of type GraphSchema."
             )
 
+    def __getstate__(self):
+        # the random state may be a global module, which can't be pickled directly
+        return picklable_state(self)
+
+    def __setstate__(self, state):
+        restore_picklable_state(self, state)
+
     def get_adjacency_types(self):
-        # Allow additional info for heterogeneous graphs.
+        """
+        Obtains the typed adjacency index of the graph, mapping each edge type triple to the
+        neighbours of each node via that type of edge, for faster neighbour sampling in
+        heterogeneous graphs.
+
+        Returns:
+            A dictionary mapping each :class:`.EdgeType` to an :class:`.AdjacencyIndex` of
+            :ref:`node ilocs <iloc-explanation>`.
+        """
         adj = getattr(self, "adj_types", None)
-        if not adj:
-            # Create a dict of adjacency lists per edge type, for faster neighbour sampling from graph in SampledHeteroBFS:
-            self.adj_types = adj = self.graph._adjacency_types(
-                self.graph_schema, use_ilocs=True
+        if adj is None:
+            # the graph caches the underlying index, so this only converts the type names
+            self.adj_types = adj = self.graph._typed_adj_indices(
+                ins=not self.graph.is_directed(), outs=True
             )
         return adj
 
@@ -234,10 +614,74 @@ class GraphWalk(object):
                 self._raise_error(err_msg)
 
 
-class UniformRandomWalk(RandomWalk):
+class _CachedCorpusMixin:
+    """
+    Support for storing the walks of a :class:`RandomWalk` in a :class:`.WalkCorpus`, for walkers
+    whose walks are fully described by their parameters (see ``_walk_parameters``).
+    """
+
+    @abstractmethod
+    def _walk_parameters(self, **kwargs):
+        """
+        Resolve the parameters of the walks (with the defaults from construction), for describing a
+        :class:`.WalkCorpus`.
+        """
+        pass
+
+    def cached_corpus(self, path, nodes, *, seed, **kwargs):
+        """
+        Perform the walks from ``nodes`` and write them to a :class:`.WalkCorpus` in the directory
+        ``path``, or, if that directory already contains the walks from the same graph, root nodes,
+        parameters and seed, reuse them without walking again.
+
+        The walks are written a chunk at a time, so the memory used is bounded by the walks from
+        one chunk. They are the same as the walks from ``run(nodes, seed=seed, workers=...)``.
+
+        Args:
+            path (str): the directory to store the corpus in
+            nodes (list): The root nodes as a list of node IDs
+            seed (int): Random number generator seed, which is required so that the walks can be
+                reproduced
+            kwargs: other arguments for the ``run`` method of this walker, like ``n`` or
+                ``length``
+
+        Returns:
+            A :class:`.WalkCorpus` of the walks, memory-mapped from disk.
+        """
+        parameters = self._walk_parameters(**kwargs)
+        n = parameters["n"]
+        length = parameters["length"]
+        self._validate_walk_params(nodes, n, length)
+        require_integer_in_range(seed, "seed", min_val=0)
+
+        root_ilocs = self.graph.node_ids_to_ilocs(nodes)
+        metadata = walk_corpus_metadata(
+            self.graph, type(self).__name__, parameters, seed, root_ilocs
+        )
+        existing = WalkCorpus._load_if_matching(path, metadata)
+        if existing is not None:
+            return existing
+
+        # the shards of a parallel run, so that the walks are the same
+        stream = self.iter_walks(
+            root_ilocs,
+            chunk_size=_ROOTS_PER_SHARD,
+            use_ilocs=True,
+            seed=seed,
+            **parameters,
+        )
+        return WalkCorpus._write(
+            path, stream.chunks(), len(root_ilocs) * n, length, metadata
+        )
+
+
+class UniformRandomWalk(_CachedCorpusMixin, RandomWalk):
     """
     Performs uniform random walks on the given graph
 
+    All of the walks are advanced together, one step at a time, with vectorized operations on the
+    graph's adjacency index, so that generating many walks (like a DeepWalk corpus) is fast.
+
     Args:
         graph (StellarGraph): Graph to traverse
         n (int, optional): Total number of random walks per root node
@@ -250,8 +694,11 @@ class UniformRandomWalk(RandomWalk):
         super().__init__(graph, seed=seed)
         self.n = n
         self.length = length
+        self._sampler = None
 
-    def run(self, nodes, *, n=None, length=None, seed=None):
+    def run(
+        self, nodes, *, n=None, length=None, seed=None, use_ilocs=False, workers=None
+    ):
         """
         Perform a random walk starting from the root nodes. Optional parameters default to using the
         values passed in during construction.
@@ -261,35 +708,50 @@ class UniformRandomWalk(RandomWalk):
             n (int, optional): Total number of random walks per root node
             length (int, optional): Maximum length of each random walk
             seed (int, optional): Random number generator seed
+            use_ilocs (bool): if True, ``nodes`` are :ref:`node ilocs <iloc-explanation>`, and the
+                walks are returned as a single NumPy array of ilocs (see below)
+            workers (int, optional): if specified, generate the walks in parallel with this many
+                processes (see :class:`.RandomWalk`)
 
         Returns:
-            List of lists of nodes ids for each of the random walks
+            List of lists of nodes ids for each of the random walks. With ``use_ilocs=True``, a
+            NumPy array of shape ``(len(nodes) * n, length)`` of the node ilocs of each walk,
+            where walks that stop early at a node without neighbours are padded with ``-1``.
 
         """
         n = _default_if_none(n, self.n, "n")
         length = _default_if_none(length, self.length, "length")
         self._validate_walk_params(nodes, n, length)
-        rs = self._get_random_state(seed)
+        if workers is not None and len(nodes) > 0:
+            return _run_root_shards(
+                self, nodes, workers, seed, n=n, length=length, use_ilocs=use_ilocs
+            )
 
-        nodes = self.graph.node_ids_to_ilocs(nodes)
+        np_rs = self._get_np_random_state(seed)
+
+        if use_ilocs:
+            node_ilocs = np.asarray(nodes)
+        else:
+            node_ilocs = self.graph.node_ids_to_ilocs(nodes)
+
+        if self._sampler is None:
+            self._sampler = _NeighbourSampler(self.graph, weighted=False)
 
         # for each root node, do n walks
-        return [self._walk(rs, node, length) for node in nodes for _ in range(n)]
-
-    def _walk(self, rs, start_node, length):
-        walk = [start_node]
-        current_node = start_node
-        for _ in range(length - 1):
-            neighbours = self.graph.neighbors(current_node, use_ilocs=True)
-            if not neighbours:
-                # dead end, so stop
-                break
-            else:
-                # has neighbours, so pick one to walk to
-                current_node = rs.choice(neighbours)
-            walk.append(current_node)
+        walks = _walk_ilocs(self._sampler, np_rs, np.repeat(node_ilocs, n), length)
+        if use_ilocs:
+            return walks
+
+        return _iloc_walks_to_ids(self.graph, walks)
+
+    def _run_ilocs(self, nodes, **kwargs):
+        return self.run(nodes, use_ilocs=True, **kwargs)
 
-        return list(self.graph.node_ilocs_to_ids(walk))
+    def _walk_parameters(self, n=None, length=None):
+        return {
+            "n": _default_if_none(n, self.n, "n"),
+            "length": _default_if_none(length, self.length, "length"),
+        }
 
 
 def naive_weighted_choices(rs, weights):
@@ -327,7 +789,7 @@ def naive_weighted_choices(rs, weights):
     return idx
 
 
-class BiasedRandomWalk(RandomWalk):
+class BiasedRandomWalk(_CachedCorpusMixin, RandomWalk):
     """
     Performs biased second order random walks (like those used in Node2Vec algorithm
     https://snap.stanford.edu/node2vec/) controlled by the values of two parameters p and q.
@@ -340,11 +802,27 @@ class BiasedRandomWalk(RandomWalk):
         q (float, optional): Defines probability, 1/q, for moving to a node away from the source node
         weighted (bool, optional): Indicates whether the walk is unweighted or weighted
         seed (int, optional): Random number generator seed
+        method (str, optional): How to sample each step of the walks: ``"exact"`` (the default)
+            computes the transition probability of every neighbour at every step, for one walk
+            at a time, while ``"rejection"`` advances all walks together with vectorized
+            operations, by sampling a neighbour based on the edge weights alone and then
+            accepting it with probability proportional to its ``p``/``q`` bias (rejection
+            sampling, as in KnightKing). Both give walks with the same distribution, but
+            ``"rejection"`` is much faster, particularly for graphs with high degree nodes. With
+            ``"rejection"``, a node whose edges all have zero weight ends a weighted walk.
 
     """
 
     def __init__(
-        self, graph, n=None, length=None, p=1.0, q=1.0, weighted=False, seed=None,
+        self,
+        graph,
+        n=None,
+        length=None,
+        p=1.0,
+        q=1.0,
+        weighted=False,
+        seed=None,
+        method="exact",
     ):
         super().__init__(graph, seed=seed)
         self.n = n
@@ -352,7 +830,9 @@ class BiasedRandomWalk(RandomWalk):
         self.p = p
         self.q = q
         self.weighted = weighted
+        self.method = method
         self._checked_weights = False
+        self._samplers = {}
 
         if weighted:
             self._check_weights_valid()
@@ -364,12 +844,14 @@ class BiasedRandomWalk(RandomWalk):
             return
 
         # Check that all edge weights are greater than or equal to 0.
-        edges, weights = self.graph.edges(include_edge_weight=True, use_ilocs=True)
+        sources, targets, _, weights = self.graph.edge_arrays(
+            include_edge_weight=True, use_ilocs=True
+        )
         (invalid,) = np.where((weights < 0) | ~np.isfinite(weights))
         if len(invalid) > 0:
 
             def format(idx):
-                s, t = edges[idx]
+                s, t = sources[idx], targets[idx]
                 w = weights[idx]
                 return f"{s!r} to {t!r} (weight = {w})"
 
@@ -380,7 +862,17 @@ class BiasedRandomWalk(RandomWalk):
         self._checked_weights = True
 
     def run(
-        self, nodes, *, n=None, length=None, p=None, q=None, seed=None, weighted=None
+        self,
+        nodes,
+        *,
+        n=None,
+        length=None,
+        p=None,
+        q=None,
+        seed=None,
+        weighted=None,
+        method=None,
+        workers=None,
     ):
 
         """
@@ -395,6 +887,9 @@ class BiasedRandomWalk(RandomWalk):
             q (float, optional): Defines probability, 1/q, for moving to a node away from the source node
             seed (int, optional): Random number generator seed; default is None
             weighted (bool, optional): Indicates whether the walk is unweighted or weighted
+            method (str, optional): ``"exact"`` or ``"rejection"``, see the class documentation
+            workers (int, optional): if specified, generate the walks in parallel with this many
+                processes (see :class:`.RandomWalk`)
 
         Returns:
             List of lists of nodes ids for each of the random walks
@@ -405,15 +900,44 @@ class BiasedRandomWalk(RandomWalk):
         p = _default_if_none(p, self.p, "p")
         q = _default_if_none(q, self.q, "q")
         weighted = _default_if_none(weighted, self.weighted, "weighted")
+        method = _default_if_none(method, self.method, "method")
         self._validate_walk_params(nodes, n, length)
         self._check_weights(p, q, weighted)
-        rs = self._get_random_state(seed)
+        if method not in ("exact", "rejection"):
+            raise ValueError(
+                f"method: expected 'exact' or 'rejection', found {method!r}"
+            )
+
+        if workers is not None and len(nodes) > 0:
+            return _run_root_shards(
+                self,
+                nodes,
+                workers,
+                seed,
+                n=n,
+                length=length,
+                p=p,
+                q=q,
+                weighted=weighted,
+                method=method,
+            )
 
         nodes = self.graph.node_ids_to_ilocs(nodes)
 
         if weighted:
             self._check_weights_valid()
 
+        if method == "rejection":
+            np_rs = self._get_np_random_state(seed)
+            walks = self._run_rejection(
+                np_rs, np.repeat(nodes, n), length, p, q, weighted
+            )
+            return _iloc_walks_to_ids(self.graph, walks)
+
+        rs = self._get_random_state(seed)
+
+        if weighted:
+
             # calculate the appropriate unnormalised transition probability, given the history of
             # the walk
             def transition_probability(nn):
@@ -476,6 +1000,65 @@ class BiasedRandomWalk(RandomWalk):
 
         return walks
 
+    def _walk_parameters(
+        self, n=None, length=None, p=None, q=None, weighted=None, method=None
+    ):
+        return {
+            "n": _default_if_none(n, self.n, "n"),
+            "length": _default_if_none(length, self.length, "length"),
+            "p": _default_if_none(p, self.p, "p"),
+            "q": _default_if_none(q, self.q, "q"),
+            "weighted": _default_if_none(weighted, self.weighted, "weighted"),
+            "method": _default_if_none(method, self.method, "method"),
+        }
+
+    def _run_rejection(self, np_rs, start_nodes, length, p, q, weighted):
+        sampler = self._samplers.get(weighted)
+        if sampler is None:
+            sampler = self._samplers[weighted] = _NeighbourSampler(self.graph, weighted)
+
+        edges = self.graph._edges
+        ip = 1.0 / p
+        iq = 1.0 / q
+        max_bias = max(ip, 1.0, iq)
+
+        def bias_of(previous, proposed):
+            offsets, _ = edges.edge_ilocs_between(previous, proposed, directed=False)
+            bias = np.where(np.diff(offsets) > 0, 1.0, iq)
+            bias[proposed == previous] = ip
+            return bias
+
+        def second_order_step(np_rs, current, previous):
+            following = np.empty_like(current)
+            pending = np.arange(len(current))
+            for _ in range(_MAX_REJECTION_ROUNDS):
+                if len(pending) == 0:
+                    break
+
+                # propose a neighbour by the first order (weighted) distribution, and then accept it
+                # in proportion to the second order bias: 1/p for returning to the previous node, 1
+                # for a neighbour of the previous node, and 1/q otherwise
+                pending_previous = previous[pending]
+                proposed = sampler.sample(np_rs, current[pending])
+                bias = bias_of(pending_previous, proposed)
+
+                accepted = np_rs.random_sample(len(pending)) * max_bias < bias
+                following[pending[accepted]] = proposed[accepted]
+                pending = pending[~accepted]
+
+            # with extreme p or q, a few walks might be rejected many times, so these are finished
+            # off with the exact distribution (which doesn't change the distribution of the walks)
+            for i in pending:
+                neighbours, probs = sampler.edges(current[i])
+                probs = probs * bias_of(
+                    np.full_like(neighbours, previous[i]), neighbours
+                )
+                following[i] = np_rs.choice(neighbours, p=probs / probs.sum())
+
+            return following
+
+        return _walk_ilocs(sampler, np_rs, start_nodes, length, second_order_step)
+
     def _check_weights(self, p, q, weighted):
         """
         Checks that the parameter values are valid or raises ValueError exceptions with a message indicating the
@@ -520,7 +1103,9 @@ class UniformRandomMetaPathWalk(RandomWalk):
         self.length = length
         self.metapaths = metapaths
 
-    def run(self, nodes, *, n=None, length=None, metapaths=None, seed=None):
+    def run(
+        self, nodes, *, n=None, length=None, metapaths=None, seed=None, workers=None
+    ):
         """
         Performs metapath-driven uniform random walks on heterogeneous graphs.
 
@@ -532,6 +1117,8 @@ class UniformRandomMetaPathWalk(RandomWalk):
                 [['Author', 'Paper', 'Author'], ['Author, 'Paper', 'Venue', 'Paper', 'Author']] specifies two metapath
                 schemas of length 3 and 5 respectively.
             seed (int, optional): Random number generator seed; default is None
+            workers (int, optional): if specified, generate the walks in parallel with this many
+                processes (see :class:`.RandomWalk`)
 
         Returns:
             List of lists of nodes ids for each of the random walks generated
@@ -541,10 +1128,19 @@ class UniformRandomMetaPathWalk(RandomWalk):
         metapaths = _default_if_none(metapaths, self.metapaths, "metapaths")
         self._validate_walk_params(nodes, n, length)
         self._check_metapath_values(metapaths)
+        if workers is not None and len(nodes) > 0:
+            return _run_root_shards(
+                self, nodes, workers, seed, n=n, length=length, metapaths=metapaths
+            )
+
         rs = self._get_random_state(seed)
 
         nodes = self.graph.node_ids_to_ilocs(nodes)
 
+        # the neighbours of each node with each node type, via edges of any type in any direction
+        # (in the same order as `neighbors`, so that seeded walks are unchanged)
+        adj = self.graph._typed_adj_indices(ins=True, outs=True, by_relation=False)
+
         walks = []
 
         for node in nodes:
@@ -569,19 +1165,12 @@ class UniformRandomMetaPathWalk(RandomWalk):
                         []
                     )  # holds the walk data for this walk; first node is the starting node
                     current_node = node
+                    current_type = label
                     for d in range(length):
                         walk.append(current_node)
                         # d+1 can also be used to index metapath to retrieve the node type for the next step in the walk
-                        neighbours = self.graph.neighbors(current_node, use_ilocs=True)
-                        # filter these by node type
-                        neighbour_types = self.graph.node_type(
-                            neighbours, use_ilocs=True
-                        )
-                        neighbours = [
-                            neigh
-                            for neigh, neigh_type in zip(neighbours, neighbour_types)
-                            if neigh_type == metapath[d]
-                        ]
+                        index = adj.get((current_type, metapath[d]))
+                        neighbours = [] if index is None else index.lookup(current_node)
 
                         if len(neighbours) == 0:
                             # if no neighbours of the required type as dictated by the metapath exist, then stop.
@@ -590,6 +1179,7 @@ class UniformRandomMetaPathWalk(RandomWalk):
                         current_node = rs.choice(
                             neighbours
                         )  # the next node in the walk
+                        current_type = metapath[d]
 
                     walks.append(
                         list(self.graph.node_ilocs_to_ids(walk))
@@ -751,7 +1341,10 @@ class SampledHeterogeneousBreadthFirstWalk(GraphWalk):
 
                         # Create samples of neigbhours for all edge types
                         for et in current_edge_types:
-                            neigh_et = adj[et][current_node]
+                            index = adj.get(et)
+                            neigh_et = (
+                                [] if index is None else index.lookup(current_node)
+                            )
 
                             # If there are no neighbours of this type then we return None
                             # in the place of the nodes that would have been sampled
@@ -984,6 +1577,7 @@ class TemporalRandomWalk(GraphWalk):
         walk_bias=None,
         p_walk_success_threshold=None,
         seed=None,
+        workers=None,
     ):
         """
         Perform a time respecting random walk starting from randomly selected temporal edges.
@@ -1017,6 +1611,10 @@ class TemporalRandomWalk(GraphWalk):
                 potential situation where too many unsuccessful walks can cause an infinite or very
                 slow loop.
             seed (int, optional): Random number generator seed; default is None.
+            workers (int, optional): if specified, generate the walks in parallel with this many
+                processes. The context windows are split into shards of a fixed size, each
+                generated with its own seed derived from ``seed``, so the walks depend only on the
+                seed and not on the number of workers.
 
         Returns:
             List of lists of node ids for each of the random walks.
@@ -1050,11 +1648,30 @@ class TemporalRandomWalk(GraphWalk):
                 f"max_walk_length: maximum walk length should not be less than the context window size, found {max_walk_length}"
             )
 
+        if workers is not None and num_cw > 0:
+            require_integer_in_range(workers, "workers", min_val=1)
+            starts = range(0, num_cw, _CONTEXT_WINDOWS_PER_SHARD)
+            seeds = _shard_seeds(self._np_random_state, seed, len(starts))
+            shard_kwargs = [
+                dict(
+                    num_cw=min(_CONTEXT_WINDOWS_PER_SHARD, num_cw - start),
+                    cw_size=cw_size,
+                    max_walk_length=max_walk_length,
+                    initial_edge_bias=initial_edge_bias,
+                    walk_bias=walk_bias,
+                    p_walk_success_threshold=p_walk_success_threshold,
+                    seed=shard_seed,
+                )
+                for start, shard_seed in zip(starts, seeds)
+            ]
+            results = _run_shards(self, shard_kwargs, workers)
+            return [walk for walks in results for walk in walks]
+
         np_rs = self._np_random_state if seed is None else np.random.RandomState(seed)
         walks = []
         num_cw_curr = 0
 
-        edges, times = self.graph.edges(include_edge_weight=True)
+        sources, targets, _, times = self.graph.edge_arrays(include_edge_weight=True)
         edge_biases = self._temporal_biases(
             times, None, bias_type=initial_edge_bias, is_forward=False,
         )
@@ -1071,8 +1688,8 @@ class TemporalRandomWalk(GraphWalk):
 
         # loop runs until we have enough context windows in total
         while num_cw_curr < num_cw:
-            first_edge_index = self._sample(len(edges), edge_biases, np_rs)
-            src, dst = edges[first_edge_index]
+            first_edge_index = self._sample(len(sources), edge_biases, np_rs)
+            src, dst = sources[first_edge_index], targets[first_edge_index]
             t = times[first_edge_index]
 
             remaining_length = num_cw - num_cw_curr + cw_size - 1
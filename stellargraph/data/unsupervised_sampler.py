@@ -26,10 +26,10 @@ from stellargraph.data.explorer import UniformRandomWalk
 from stellargraph.random import random_state
 
 
-def _warn_if_ignored(value, default, name):
+def _warn_if_ignored(value, default, name, other="walker"):
     if value != default:
         raise ValueError(
-            f"walker, {name}: cannot specify both 'walker' and '{name}'. Please use one or the other."
+            f"{other}, {name}: cannot specify both '{other}' and '{name}'. Please use one or the other."
         )
 
 
@@ -43,6 +43,8 @@ class UnsupervisedSampler:
 
         By default, a UniformRandomWalk is used, but a custom `walker` can be specified instead. An
         error will be raised if other parameters are specified along with a custom `walker`.
+        Alternatively, previously generated `walks` stored in a :class:`.WalkCorpus` can be used,
+        without walking again.
 
         Args:
             G (StellarGraph): A stellargraph with features.
@@ -55,10 +57,19 @@ class UnsupervisedSampler:
             seed (int, optional): Random seed for the default UniformRandomWalk walker.
             walker (RandomWalk, optional): A RandomWalk object to use instead of the default
                 UniformRandomWalk walker.
+            walks (WalkCorpus, optional): Walks generated from ``G`` to use instead of a walker.
+                The root node of each walk is its first node.
     """
 
     def __init__(
-        self, G, nodes=None, length=2, number_of_walks=1, seed=None, walker=None,
+        self,
+        G,
+        nodes=None,
+        length=2,
+        number_of_walks=1,
+        seed=None,
+        walker=None,
+        walks=None,
     ):
         if not isinstance(G, StellarGraph):
             raise ValueError(
@@ -70,7 +81,19 @@ class UnsupervisedSampler:
             self.graph = G
 
         # Instantiate the walker class used to generate random walks in the graph
-        if walker is not None:
+        self.walks = walks
+        if walks is not None:
+            _warn_if_ignored(walker, None, "walker", other="walks")
+            _warn_if_ignored(nodes, None, "nodes", other="walks")
+            _warn_if_ignored(length, 2, "length", other="walks")
+            _warn_if_ignored(number_of_walks, 1, "number_of_walks", other="walks")
+            walks.check_graph(G)
+            if walks.length < 2:
+                raise ValueError(
+                    f"walks: expected walks of length at least 2, found {walks.length}"
+                )
+            self.walker = None
+        elif walker is not None:
             _warn_if_ignored(length, 2, "length")
             _warn_if_ignored(number_of_walks, 1, "number_of_walks")
             _warn_if_ignored(seed, None, "seed")
@@ -132,33 +155,36 @@ class UnsupervisedSampler:
         """
         self._check_parameter_values(batch_size)
 
-        all_nodes = list(self.graph.nodes(use_ilocs=True))
         # Use the sampling distribution as per node2vec
-        degrees = self.graph.node_degrees(use_ilocs=True)
-        sampling_distribution = np.array([degrees[n] ** 0.75 for n in all_nodes])
+        sampling_distribution = self.graph.node_degree_array() ** 0.75
         sampling_distribution_norm = sampling_distribution / np.sum(
             sampling_distribution
         )
 
-        walks = self.walker.run(nodes=self.nodes)
+        if self.walks is not None:
+            positive_pairs = self._corpus_positive_pairs()
+        else:
+            walks = self.walker.run(nodes=self.nodes)
 
-        # first item in each walk is the target/head node
-        targets = [walk[0] for walk in walks]
+            # first item in each walk is the target/head node
+            targets = [walk[0] for walk in walks]
 
-        positive_pairs = np.array(
-            [
-                (target, positive_context)
-                for target, walk in zip(targets, walks)
-                for positive_context in walk[1:]
-            ]
-        )
+            positive_pairs = np.array(
+                [
+                    (target, positive_context)
+                    for target, walk in zip(targets, walks)
+                    for positive_context in walk[1:]
+                ]
+            )
 
-        positive_pairs = self.graph.node_ids_to_ilocs(positive_pairs.flatten()).reshape(
-            positive_pairs.shape
-        )
+            positive_pairs = self.graph.node_ids_to_ilocs(
+                positive_pairs.flatten()
+            ).reshape(positive_pairs.shape)
 
         negative_samples = self.np_random.choice(
-            all_nodes, size=len(positive_pairs), p=sampling_distribution_norm
+            self.graph.number_of_nodes(),
+            size=len(positive_pairs),
+            p=sampling_distribution_norm,
         )
 
         negative_pairs = np.column_stack((positive_pairs[:, 0], negative_samples))
@@ -176,6 +202,15 @@ class UnsupervisedSampler:
 
         return [(pairs[i], labels[i]) for i in batch_indices]
 
+    def _corpus_positive_pairs(self):
+        # the walks are already ilocs, so the pairs can be formed directly, in the same order as
+        # from a walker: the (target, context) pairs of each walk in turn
+        walks = np.asarray(self.walks.walks)
+        contexts = walks[:, 1:]
+        targets = np.broadcast_to(walks[:, :1], contexts.shape)
+        keep = contexts != -1
+        return np.column_stack((targets[keep], contexts[keep]))
+
     def _check_parameter_values(self, batch_size):
         """
         Checks that the parameter values are valid or raises ValueError exceptions with a message indicating the
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A corpus of random walks stored on disk, so that the same walks can be reused (memory-mapped)
+rather than regenerated.
+"""
+
+__all__ = ["WalkCorpus"]
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ..core.graph import StellarGraph
+
+_FORMAT_VERSION = 1
+
+_WALKS_FILE = "walks.npy"
+_LENGTHS_FILE = "lengths.npy"
+# written last, so that a corpus without it is incomplete (and is regenerated)
+_METADATA_FILE = "metadata.json"
+
+
+def _hash_arrays(*arrays):
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _hash_index(index):
+    return pd.util.hash_pandas_object(index, index=False).to_numpy()
+
+
+def graph_fingerprint(graph):
+    """
+    Compute a hash of the structure of a graph: its nodes, edges, weights, types and direction.
+    This doesn't include the node or edge features, which don't affect random walks.
+
+    Args:
+        graph (StellarGraph): the graph
+
+    Returns:
+        A hex string.
+    """
+    nodes = graph._nodes
+    edges = graph._edges
+    return _hash_arrays(
+        np.array([graph.is_directed()]),
+        _hash_index(nodes.ids.pandas_index),
+        _hash_index(nodes.types.pandas_index),
+        nodes.type_ilocs,
+        _hash_index(edges.types.pandas_index),
+        edges.type_ilocs,
+        edges.sources,
+        edges.targets,
+        edges.weights,
+    )
+
+
+def walk_corpus_metadata(graph, walker_name, parameters, seed, root_ilocs):
+    """
+    Describe a corpus of walks, including a key that identifies everything the walks depend on.
+    """
+    metadata = {
+        "format_version": _FORMAT_VERSION,
+        "graph_fingerprint": graph_fingerprint(graph),
+        "walker": walker_name,
+        # (NumPy scalars can't be stored as JSON)
+        "parameters": {
+            name: value.item() if isinstance(value, np.generic) else value
+            for name, value in parameters.items()
+        },
+        "seed": seed,
+        "roots": _hash_arrays(np.asarray(root_ilocs, dtype=np.int64)),
+    }
+    metadata["key"] = hashlib.sha256(
+        json.dumps(metadata, sort_keys=True).encode()
+    ).hexdigest()
+    return metadata
+
+
+def _read_metadata(path):
+    try:
+        with open(os.path.join(path, _METADATA_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class WalkCorpus:
+    """
+    A corpus of random walks stored on disk, in a directory containing:
+
+    - ``walks.npy``: a matrix of the :ref:`node ilocs <iloc-explanation>` of each walk, with one
+      row per walk, where walks shorter than the maximum length are padded with ``-1``
+    - ``lengths.npy``: the length of each walk
+    - ``metadata.json``: the walker, parameters and seed that generated the walks, and a
+      fingerprint of the graph
+
+    The arrays are memory-mapped, so opening a corpus is fast, and the walks are only read from
+    disk as they're used. A corpus can be consumed by :class:`.UnsupervisedSampler` (for instance,
+    in a Node2Vec pipeline with :class:`.Node2VecLinkGenerator`) or iterated over directly, for
+    instance with gensim's ``Word2Vec`` (see :meth:`as_str`).
+
+    Create a corpus with ``cached_corpus`` on :class:`.UniformRandomWalk` or
+    :class:`.BiasedRandomWalk`, which reuses an existing corpus if it was generated from the same
+    graph, with the same parameters and seed, and otherwise (re)generates it. Open an existing
+    corpus with :meth:`load`.
+    """
+
+    def __init__(self, path, walks, lengths, metadata, as_str=False):
+        self.path = path
+        self.walks = walks
+        self.lengths = lengths
+        self.metadata = metadata
+        self._as_str = as_str
+
+    @staticmethod
+    def load(path, graph=None):
+        """
+        Open the corpus stored in a directory.
+
+        Args:
+            path (str): the directory containing the corpus
+            graph (StellarGraph, optional): if specified, check that the walks were generated from
+                this graph
+
+        Returns:
+            A :class:`.WalkCorpus` with memory-mapped walks.
+        """
+        metadata = _read_metadata(path)
+        if metadata is None:
+            raise ValueError(
+                f"path: expected a directory containing a complete walk corpus, found {path!r}"
+            )
+
+        corpus = WalkCorpus(
+            path,
+            np.load(os.path.join(path, _WALKS_FILE), mmap_mode="r"),
+            np.load(os.path.join(path, _LENGTHS_FILE), mmap_mode="r"),
+            metadata,
+        )
+        if graph is not None:
+            corpus.check_graph(graph)
+        return corpus
+
+    @staticmethod
+    def _load_if_matching(path, metadata):
+        existing = _read_metadata(path)
+        if existing is None or existing.get("key") != metadata["key"]:
+            return None
+        return WalkCorpus.load(path)
+
+    @staticmethod
+    def _write(path, chunks, num_walks, length, metadata):
+        """
+        Write the walks from ``chunks``, an iterable of iloc matrices (like
+        :meth:`.RandomWalkStream.chunks`), incrementally so that only one chunk is in memory.
+        """
+        os.makedirs(path, exist_ok=True)
+        # any existing corpus is stale, so make sure it can't be read while it's being replaced
+        metadata_path = os.path.join(path, _METADATA_FILE)
+        if os.path.exists(metadata_path):
+            os.remove(metadata_path)
+
+        walks = np.lib.format.open_memmap(
+            os.path.join(path, _WALKS_FILE),
+            mode="w+",
+            dtype=np.int64,
+            shape=(num_walks, length),
+        )
+        lengths = np.lib.format.open_memmap(
+            os.path.join(path, _LENGTHS_FILE),
+            mode="w+",
+            dtype=np.int64,
+            shape=(num_walks,),
+        )
+
+        start = 0
+        for chunk in chunks:
+            end = start + len(chunk)
+            # chunks may be narrower than the corpus, if all of their walks stop early
+            walks[start:end, : chunk.shape[1]] = chunk
+            walks[start:end, chunk.shape[1] :] = -1
+            lengths[start:end] = (chunk != -1).sum(axis=1)
+            start = end
+
+        if start != num_walks:
+            raise ValueError(
+                f"chunks: expected {num_walks} walks in total, found {start}"
+            )
+
+        walks.flush()
+        lengths.flush()
+        del walks, lengths
+
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f, indent=2, sort_keys=True)
+
+        return WalkCorpus.load(path)
+
+    @property
+    def length(self):
+        """
+        The maximum length of the walks.
+        """
+        return self.walks.shape[1]
+
+    def check_graph(self, graph):
+        """
+        Check that the walks in this corpus were generated from ``graph``, raising a ``ValueError``
+        if they weren't (for instance, if the graph has changed since the corpus was written).
+
+        Args:
+            graph (StellarGraph): the graph
+        """
+        if not isinstance(graph, StellarGraph):
+            raise TypeError(
+                f"graph: expected StellarGraph, found {type(graph).__name__}"
+            )
+        if graph_fingerprint(graph) != self.metadata["graph_fingerprint"]:
+            raise ValueError(
+                f"graph: expected the graph used to generate the walk corpus at {self.path!r}, found a different graph (the corpus is stale)"
+            )
+
+    def as_str(self):
+        """
+        Returns:
+            A view of this corpus where iterating yields each walk as a list of strings of the node
+            ilocs, as used for the tokens of gensim's ``Word2Vec``.
+        """
+        return WalkCorpus(self.path, self.walks, self.lengths, self.metadata, True)
+
+    def __len__(self):
+        return len(self.walks)
+
+    def __iter__(self):
+        # (this reads the memory-mapped walks a row at a time)
+        for walk, length in zip(self.walks, self.lengths):
+            walk = walk[:length]
+            if self._as_str:
+                yield [str(node) for node in walk]
+            else:
+                yield np.asarray(walk)
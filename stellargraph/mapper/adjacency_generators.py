@@ -42,7 +42,7 @@ class AdjacencyPowerGenerator(Generator):
 
         require_integer_in_range(num_powers, "num_powers", min_val=1)
 
-        Aadj = G.to_adjacency_matrix().tocoo()
+        Aadj = G._adjacency_matrix().tocoo()
         indices = np.column_stack((Aadj.col, Aadj.row))
 
         self.Aadj_T = tf.sparse.SparseTensor(
@@ -17,6 +17,12 @@
 import abc
 
 
+def _sampler_with_seed(sampler_class, graph, graph_schema, seed):
+    # used (with functools.partial) instead of a lambda, so that it can be pickled when sequences
+    # are sent to worker processes
+    return sampler_class(graph, graph_schema=graph_schema, seed=seed)
+
+
 class Generator(abc.ABC):
     """
     A generator supports creating sequences for input into graph machine learning algorithms via the `flow` method.
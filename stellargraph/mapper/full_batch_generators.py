@@ -89,7 +89,9 @@ class FullBatchGenerator(Generator):
         # Create sparse adjacency matrix:
         # Use the node orderings the same as in the graph features
         self.node_list = G.nodes()
-        self.Aadj = G.to_adjacency_matrix()
+        # this is shared with the graph's adjacency cache and so is read-only, but none of the
+        # transformations below modify it in place
+        self.Aadj = G._adjacency_matrix()
 
         # Power-user feature: make the generator yield dense adjacency matrix instead
         # of the default sparse one.
@@ -109,8 +111,9 @@ class FullBatchGenerator(Generator):
 
         if transform is not None:
             if callable(transform):
+                # user-provided transforms might modify the matrix in place
                 self.features, self.Aadj = transform(
-                    features=self.features, A=self.Aadj
+                    features=self.features, A=self.Aadj.copy()
                 )
             else:
                 raise ValueError("argument 'transform' must be a callable.")
@@ -121,9 +124,7 @@ class FullBatchGenerator(Generator):
             )
 
         elif self.method in ["gat", "self_loops"]:
-            self.Aadj = self.Aadj + sps.diags(
-                np.ones(self.Aadj.shape[0]) - self.Aadj.diagonal()
-            )
+            self.Aadj = G._adjacency_matrix(normalization="self_loops")
 
         elif self.method in ["ppnp"]:
             if self.use_sparse:
@@ -425,7 +426,7 @@ class RelationalFullBatchNodeGenerator(Generator):
         for edge_type in G.edge_types:
             # note that A is the transpose of the standard adjacency matrix
             # this is to aggregate features from incoming nodes
-            A = G.to_adjacency_matrix(edge_type=edge_type).transpose()
+            A = G._adjacency_matrix(edge_type=edge_type).transpose()
 
             if transform is None:
                 # normalize here and replace zero row sums with 1
@@ -436,7 +437,7 @@ class RelationalFullBatchNodeGenerator(Generator):
                 A = d.dot(A)
 
             else:
-                self.features, A = transform(self.features, A)
+                self.features, A = transform(self.features, A.copy())
 
             A = A.tocoo()
             self.As.append(A)
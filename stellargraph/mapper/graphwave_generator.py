@@ -60,7 +60,7 @@ class GraphWaveGenerator(Generator):
         require_integer_in_range(degree, "degree", min_val=1)
 
         # Create sparse adjacency matrix:
-        adj = G.to_adjacency_matrix().tocoo()
+        adj = G._adjacency_matrix().tocoo()
 
         # Function to map node IDs to indices for quicker node index lookups
         self._node_lookup = G.node_ids_to_ilocs
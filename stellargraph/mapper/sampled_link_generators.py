@@ -35,7 +35,7 @@ import operator
 import collections
 import abc
 import warnings
-from functools import reduce
+from functools import reduce, partial
 from tensorflow import keras
 from ..core.graph import StellarGraph, GraphSchema
 from ..data import (
@@ -48,7 +48,7 @@ from ..data import (
 from ..core.utils import is_real_iterable
 from . import LinkSequence, OnDemandLinkSequence
 from ..random import SeededPerBatch
-from .base import Generator
+from .base import Generator, _sampler_with_seed
 
 
 class BatchedLinkGenerator(Generator):
@@ -241,8 +241,8 @@ class GraphSAGELinkGenerator(BatchedLinkGenerator):
 
         self._graph = G
         self._samplers = SeededPerBatch(
-            lambda s: SampledBreadthFirstWalk(
-                self._graph, graph_schema=self.schema, seed=s
+            partial(
+                _sampler_with_seed, SampledBreadthFirstWalk, self._graph, self.schema
             ),
             seed=seed,
         )
@@ -604,8 +604,11 @@ class DirectedGraphSAGELinkGenerator(BatchedLinkGenerator):
         self._graph = G
 
         self._samplers = SeededPerBatch(
-            lambda s: DirectedBreadthFirstNeighbours(
-                self._graph, graph_schema=self.schema, seed=s
+            partial(
+                _sampler_with_seed,
+                DirectedBreadthFirstNeighbours,
+                self._graph,
+                self.schema,
             ),
             seed=seed,
         )
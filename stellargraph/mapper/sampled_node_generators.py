@@ -36,7 +36,7 @@ import itertools as it
 import networkx as nx
 import scipy.sparse as sps
 from tensorflow.keras import backend as K
-from functools import reduce
+from functools import reduce, partial
 from tensorflow.keras.utils import Sequence
 from collections import defaultdict
 
@@ -50,6 +50,7 @@ from ..core.utils import is_real_iterable
 from ..core.validation import comma_sep
 from . import NodeSequence, Generator
 from ..random import SeededPerBatch
+from .base import _sampler_with_seed
 
 
 class BatchedNodeGenerator(Generator):
@@ -219,7 +220,7 @@ class GraphSAGENodeGenerator(BatchedNodeGenerator):
 
         # Create sampler for GraphSAGE
         self._samplers = SeededPerBatch(
-            lambda s: SampledBreadthFirstWalk(G, graph_schema=self.schema, seed=s),
+            partial(_sampler_with_seed, SampledBreadthFirstWalk, G, self.schema),
             seed=seed,
         )
 
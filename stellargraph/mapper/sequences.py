@@ -40,8 +40,8 @@ from tensorflow.keras import backend as K
 from functools import reduce
 from tensorflow.keras.utils import Sequence
 from ..data.unsupervised_sampler import UnsupervisedSampler
-from ..core.utils import is_real_iterable, normalize_adj
-from ..random import random_state
+from ..core.utils import is_real_iterable
+from ..random import random_state, picklable_state, restore_picklable_state
 from scipy import sparse
 from ..core.experimental import experimental
 
@@ -108,6 +108,13 @@ class NodeSequence(Sequence):
         """Denotes the number of batches per epoch"""
         return int(np.ceil(self.data_size / self.batch_size))
 
+    def __getstate__(self):
+        # the random state may be a global module, which can't be pickled directly
+        return picklable_state(self)
+
+    def __setstate__(self, state):
+        restore_picklable_state(self, state)
+
     def __getitem__(self, batch_num):
         """
         Generate one batch of data
@@ -212,6 +219,13 @@ class LinkSequence(Sequence):
         """Denotes the number of batches per epoch"""
         return int(np.ceil(self.data_size / self.batch_size))
 
+    def __getstate__(self):
+        # the random state may be a global module, which can't be pickled directly
+        return picklable_state(self)
+
+    def __setstate__(self, state):
+        restore_picklable_state(self, state)
+
     def __getitem__(self, batch_num):
         """
         Generate one batch of data
@@ -585,16 +599,14 @@ class PaddedGraphSequence(Sequence):
             self.targets = np.asanyarray(targets)
 
         if self.normalize_adj:
+            normalization = (
+                "symmetric_self_loops" if symmetric_normalization else "left_self_loops"
+            )
             self.normalized_adjs = [
-                normalize_adj(
-                    graph.to_adjacency_matrix(),
-                    symmetric=symmetric_normalization,
-                    add_self_loops=True,
-                )
-                for graph in graphs
+                graph._adjacency_matrix(normalization=normalization) for graph in graphs
             ]
         else:
-            self.normalize_adjs = [graph.to_adjacency_matrix() for graph in graphs]
+            self.normalize_adjs = [graph._adjacency_matrix() for graph in graphs]
 
         self.normalized_adjs = np.asanyarray(self.normalized_adjs)
         _, self._np_rs = random_state(seed)
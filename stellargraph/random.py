@@ -21,6 +21,7 @@
 # `random_state` is not user-facing
 __all__ = ["set_seed"]
 
+import importlib
 import random as rn
 import numpy.random as np_rn
 import threading
@@ -57,6 +58,43 @@ def random_state(seed):
         return _seeded_state(seed)
 
 
+class _GlobalModule:
+    """
+    A picklable stand-in for one of the global random modules (``random`` or ``numpy.random``),
+    which are used as the random state when no seed is specified.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+
+def picklable_state(obj):
+    """
+    Return the attributes of ``obj``, for pickling, with the global random modules replaced by
+    stand-ins, because modules can't be pickled (see :func:`restore_picklable_state`).
+    """
+    return {
+        name: _GlobalModule(value.__name__) if value is rn or value is np_rn else value
+        for name, value in obj.__dict__.items()
+    }
+
+
+def restore_picklable_state(obj, state):
+    """
+    Set the attributes of ``obj`` from the result of :func:`picklable_state`, using the global
+    random modules of this process.
+    """
+    obj.__dict__.update(
+        (
+            name,
+            importlib.import_module(value.name)
+            if isinstance(value, _GlobalModule)
+            else value,
+        )
+        for name, value in state.items()
+    )
+
+
 def set_seed(seed):
     """
     Create a new global RandomState using the provided seed. If seed is None, StellarGraph's global
@@ -83,6 +121,8 @@ class SeededPerBatch:
     Internal utility class for managing a random state per batch number in a multi-threaded
     environment.
 
+    This can be pickled (for instance, to send a Keras Sequence to worker processes) if
+    ``create_with_seed`` and the objects it creates can be.
     """
 
     def __init__(self, create_with_seed, seed):
@@ -105,3 +145,13 @@ class SeededPerBatch:
             return self._walkers[batch_num]
         finally:
             self._lock.release()
+
+    def __getstate__(self):
+        state = picklable_state(self)
+        # locks can't be pickled, so each unpickled copy gets a new one
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        restore_picklable_state(self, state)
+        self._lock = threading.Lock()
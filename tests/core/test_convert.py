@@ -24,6 +24,8 @@ from stellargraph.core.convert import (
     convert_nodes,
     convert_edges,
     from_networkx,
+    GraphBuilder,
+    _GrowableArray,
 )
 
 _EMPTY_DF = pd.DataFrame([], index=[1, 2])
@@ -548,3 +550,111 @@ def test_from_networkx_errors():
         ValueError, match="of type 'a' to have feature dimension 1, found dimension 2"
     ):
         from_networkx_for_testing(attrs, node_features="f")
+
+
+def test_growable_array():
+    arr = _GrowableArray(row_shape=(2,))
+    assert arr.finish().shape == (0, 2)
+
+    arr = _GrowableArray(row_shape=(2,))
+    expected = []
+    for i in range(300):
+        chunk = np.full((i % 7, 2), i, dtype=np.uint8 if i < 100 else np.int32)
+        arr.append(chunk)
+        expected.append(chunk)
+
+    result = arr.finish()
+    assert result.dtype == np.int32
+    np.testing.assert_array_equal(result, np.concatenate(expected))
+
+    with pytest.raises(
+        ValueError, match=r"expected rows of shape \(2,\), found shape \(3,\)"
+    ):
+        _GrowableArray(row_shape=(2,)).append(np.zeros((1, 3)))
+
+
+def _builder():
+    return GraphBuilder(node_type_default="n", edge_type_default="e", dtype="float32")
+
+
+def test_graph_builder():
+    builder = _builder()
+    builder.add_nodes(["b0"], [[1.0, 2.0]], node_type="b")
+    builder.add_nodes(["a0", "a1"])
+    builder.add_nodes(["b1", "b2"], [[3.0, 4.0], [5.0, 6.0]], node_type="b")
+
+    builder.add_edges(["a0", "b1"], ["b0", "b2"], edge_types=["y", "x"])
+    builder.add_edges(["a1"], ["a0"], weights=[2.5], edge_types="x")
+
+    with pytest.raises(ValueError, match="expected all nodes to be added before"):
+        builder.add_nodes(["c"])
+
+    nodes, edges = builder.build()
+
+    assert nodes.type_starts == [("b", 0), ("n", 3)]
+    np.testing.assert_array_equal(
+        nodes.ids.from_iloc(range(5)), ["b0", "b1", "b2", "a0", "a1"]
+    )
+    np.testing.assert_array_equal(
+        nodes.features_of_type("b"), [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    )
+    assert nodes.features_of_type("n").shape == (2, 0)
+
+    assert edges.type_starts == [("x", 0), ("y", 2)]
+    np.testing.assert_array_equal(edges.sources, [1, 4, 3])
+    np.testing.assert_array_equal(edges.targets, [2, 3, 0])
+    np.testing.assert_array_equal(edges.weights, [1, 2.5, 1])
+    assert edges.sources.dtype == np.uint8
+    # the default IDs are the position of the edges when added
+    np.testing.assert_array_equal(edges.ids.pandas_index, [1, 2, 0])
+
+
+def test_graph_builder_infer_nodes():
+    builder = _builder()
+    builder.add_edges([10, 20], [20, 30], ids=["p", "q"])
+    builder.add_edges([40], [10], ids=["r"])
+
+    with pytest.raises(ValueError, match="expected edge IDs for every chunk"):
+        builder.add_edges([10], [10])
+
+    nodes, edges = builder.build()
+    assert list(nodes.ids.pandas_index) == [10, 20, 30, 40]
+    assert nodes.type_starts == [("n", 0)]
+    np.testing.assert_array_equal(edges.sources, [0, 1, 3])
+    np.testing.assert_array_equal(edges.targets, [1, 2, 0])
+    assert list(edges.ids.pandas_index) == ["p", "q", "r"]
+    assert nodes.ids.pandas_index.dtype == np.int64
+
+
+@pytest.mark.parametrize("missing", [np.nan, None])
+def test_graph_builder_infer_nodes_missing_ids(missing):
+    builder = _builder()
+    builder.add_edges(["a"], ["b"])
+
+    with pytest.raises(
+        ValueError, match="targets: expected a node ID for every edge, found 1 missing"
+    ):
+        builder.add_edges(
+            np.array(["b", "c"], dtype=object), np.array(["a", missing], dtype=object)
+        )
+
+
+def test_graph_builder_invalid():
+    builder = _builder()
+    builder.add_nodes([0, 1], [[1.0], [2.0]])
+
+    with pytest.raises(ValueError, match="features: expected one row per ID"):
+        builder.add_nodes([2], [[1.0], [2.0]])
+
+    with pytest.raises(ValueError, match="features: expected the same feature shape"):
+        builder.add_nodes([2], [[1.0, 2.0]])
+
+    with pytest.raises(ValueError, match="sources: expected all source .*: 5"):
+        builder.add_edges([5], [0])
+
+    with pytest.raises(TypeError, match="weights: expected a numeric array"):
+        builder.add_edges([0], [1], weights=["x"])
+
+    empty_nodes, empty_edges = _builder().build()
+    assert len(empty_nodes) == 0
+    assert len(empty_edges) == 0
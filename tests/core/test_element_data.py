@@ -16,7 +16,15 @@
 
 import pytest
 import numpy as np
-from stellargraph.core.element_data import ExternalIdIndex
+import pandas as pd
+from stellargraph import StellarGraph
+from stellargraph.core.element_data import (
+    ExternalIdIndex,
+    AdjacencyIndex,
+    EdgeData,
+    NodeData,
+)
+from stellargraph.core.feature_store import ChunkedFeatureStore, StackedFeatureStore
 
 
 @pytest.mark.parametrize(
@@ -52,3 +60,431 @@ def test_benchmark_external_id_index_from_iloc(benchmark):
         idx.from_iloc(x)
 
     benchmark(f)
+
+
+def _integer_ids(kind, count):
+    if kind == "range":
+        return pd.RangeIndex(count)
+    if kind == "offset_range":
+        return np.arange(count) + 1000
+    if kind == "dense":
+        # a shuffled subset of a range
+        return np.random.RandomState(0).permutation(count * 2)[:count]
+    if kind == "sparse":
+        # widely spaced, in a random order
+        return np.random.RandomState(0).permutation(count) * 2 ** 30 + 7
+
+    assert kind == "str"
+    return [f"id{x}" for x in range(count)]
+
+
+@pytest.mark.parametrize("kind", ["range", "offset_range", "dense", "sparse"])
+def test_external_id_index_integer(kind):
+    values = _integer_ids(kind, 100)
+    idx = ExternalIdIndex(values)
+    values = np.asarray(values)
+
+    np.testing.assert_array_equal(idx.to_iloc(values), np.arange(100))
+    np.testing.assert_array_equal(idx.to_iloc(values[::-1]), np.arange(100)[::-1])
+    np.testing.assert_array_equal(idx.to_iloc(list(values[:3])), [0, 1, 2])
+    np.testing.assert_array_equal(idx.from_iloc([5, 0]), values[[5, 0]])
+
+    missing = [values.min() - 1, values.max() + 1, -(2 ** 62), 2 ** 63 + 1]
+    missing = [x for x in missing if x not in values]
+    np.testing.assert_array_equal(idx.to_iloc(missing), 255)
+    np.testing.assert_array_equal(idx.to_iloc(missing, smaller_type=False), -1)
+
+    with pytest.raises(KeyError):
+        idx.to_iloc(missing[:1], strict=True)
+
+    # non-integer queries fall back to the general path
+    assert idx.to_iloc(["A"]) == 255
+    np.testing.assert_array_equal(idx.to_iloc(values[:2].astype(float)), [0, 1])
+
+
+def test_external_id_index_integer_duplicates():
+    with pytest.raises(
+        ValueError, match="expected IDs to appear once, found some.*: 3"
+    ):
+        ExternalIdIndex([1, 3, 2, 3])
+
+    with pytest.raises(
+        ValueError, match="expected IDs to appear once, found some.*: 0"
+    ):
+        ExternalIdIndex([0, 1, 2, 3, 0])
+
+    with pytest.raises(
+        ValueError, match="expected IDs to appear once, found some.*: 7"
+    ):
+        ExternalIdIndex([7, 2 ** 40, 7])
+
+    # duplicates in something that otherwise looks like a contiguous range
+    with pytest.raises(
+        ValueError, match="expected IDs to appear once, found some.*: 0"
+    ):
+        ExternalIdIndex([0, 0, 2])
+
+    with pytest.raises(
+        ValueError, match="expected IDs to appear once, found some.*: 0"
+    ):
+        StellarGraph(pd.DataFrame(index=[0, 0, 2]))
+
+
+@pytest.mark.parametrize("ids", [[0, 2, 3], [3, 0, 2], [0, 3, 5, 2], [10, 12]])
+def test_external_id_index_integer_missing_in_range(ids):
+    idx = ExternalIdIndex(ids)
+    missing = sorted(set(range(min(ids), max(ids) + 1)) - set(ids))
+
+    np.testing.assert_array_equal(idx.to_iloc(ids), np.arange(len(ids)))
+    np.testing.assert_array_equal(idx.to_iloc(missing, smaller_type=False), -1)
+    with pytest.raises(KeyError):
+        idx.to_iloc(missing, strict=True)
+
+
+@pytest.mark.parametrize(
+    "ids,kind",
+    [(["a", "bc"], "U"), ([], "U"), ([1, 2], "i"), (range(3), "i"), (["a", 1], "O")],
+)
+def test_external_id_index_to_array(ids, kind):
+    array = ExternalIdIndex(ids).to_array()
+    assert array.dtype.kind == kind
+    np.testing.assert_array_equal(array, np.array(ids, dtype=array.dtype))
+
+
+@pytest.mark.benchmark(group="ExternalIdIndex.to_iloc")
+@pytest.mark.parametrize("kind", ["range", "dense", "sparse", "str"])
+def test_benchmark_external_id_index_to_iloc(benchmark, kind):
+    N = 100000
+    SIZE = 10000
+    values = _integer_ids(kind, N)
+    idx = ExternalIdIndex(values)
+    x = np.asarray(values)[np.random.randint(0, N, size=SIZE)]
+
+    benchmark(idx.to_iloc, x)
+
+
+def test_adjacency_index():
+    keys = np.array([3, 1, 0, 1, 3, 3], dtype=np.uint8)
+    values = np.arange(len(keys))
+    index = AdjacencyIndex.from_keys(keys, values)
+
+    assert len(index) == 4
+    np.testing.assert_array_equal(index.offsets, [0, 1, 3, 3, 6])
+    np.testing.assert_array_equal(index.degrees(), [1, 2, 0, 3])
+    # small offsets are stored compactly, but degrees support arithmetic without wrapping around
+    assert index.offsets.dtype == np.uint8
+    assert index.degrees().dtype == np.int64
+    np.testing.assert_array_equal(index.degrees() - 1, [0, 1, -1, 2])
+
+    # values are grouped by key, retaining their relative order
+    np.testing.assert_array_equal(index.lookup(0), [2])
+    np.testing.assert_array_equal(index.lookup(1), [1, 3])
+    np.testing.assert_array_equal(index.lookup(3), [0, 4, 5])
+
+    # no values, or unknown keys
+    assert len(index.lookup(2)) == 0
+    assert len(index.lookup(4)) == 0
+    assert len(index.lookup(-1)) == 0
+
+
+def test_adjacency_index_size():
+    index = AdjacencyIndex.from_keys(np.array([0, 0]), np.array([10, 20]), size=3)
+    assert len(index) == 3
+    np.testing.assert_array_equal(index.degrees(), [2, 0, 0])
+
+    empty = AdjacencyIndex.from_keys(np.array([], dtype=np.uint8), np.array([]))
+    assert len(empty) == 0
+    assert len(empty.lookup(0)) == 0
+
+
+def test_adjacency_index_lookup_many():
+    keys = np.array([3, 1, 0, 1, 3, 3], dtype=np.uint8)
+    index = AdjacencyIndex.from_keys(keys, np.arange(len(keys)))
+
+    offsets, values = index.lookup_many(np.array([1, 2, 3, -1, 4, 1]))
+    np.testing.assert_array_equal(offsets, [0, 2, 2, 5, 5, 5, 7])
+    np.testing.assert_array_equal(values, [1, 3, 0, 4, 5, 1, 3])
+
+    offsets, values = index.lookup_many([])
+    np.testing.assert_array_equal(offsets, [0])
+    assert len(values) == 0
+
+
+def _edge_data(sources, targets):
+    columns = {"source": sources, "target": targets, "weight": np.ones(len(sources))}
+    return EdgeData(np.arange(len(sources)), columns, [("e", 0)])
+
+
+def test_edge_data_compact_endpoints():
+    sources = np.array([0, 1, 299], dtype=np.int64)
+    targets = np.array([2, 3, 4], dtype=np.uint64)
+    edges = _edge_data(sources, targets)
+
+    # both columns use the smallest unsigned type for the largest iloc in either
+    assert edges.sources.dtype == np.uint16
+    assert edges.targets.dtype == np.uint16
+    np.testing.assert_array_equal(edges.sources, sources)
+    np.testing.assert_array_equal(edges.targets, targets)
+
+    # already compact columns are used directly
+    compact = np.array([0, 1, 2], dtype=np.uint8)
+    assert _edge_data(compact, compact).sources is compact
+
+    with pytest.raises(ValueError, match="expected non-negative source and target"):
+        _edge_data(np.array([0, -1]), np.array([0, 1]))
+
+    with pytest.raises(TypeError, match="expected integer source and target ilocs"):
+        _edge_data(np.array([0.0, 1.0]), np.array([0, 1]))
+
+
+def test_edge_data_memory_usage():
+    edges = _edge_data(np.array([0, 1, 2], dtype=np.uint8), np.array([1, 2, 0]))
+    usage = edges.memory_usage()
+    assert usage["source"] == 3
+    assert usage["target"] == 3
+    assert usage["weight"] == 3 * 8
+    # a contiguous range of edge IDs is converted without a lookup table
+    assert usage["ids"] == edges.ids.pandas_index.memory_usage()
+
+    assert edges.adj_index_memory_usage() == {
+        "ins and outs": 0,
+        "ins": 0,
+        "outs": 0,
+        "typed": 0,
+        "degrees": 0,
+        "pairs": 0,
+    }
+    index = edges.adj_index(ins=True, outs=True)
+    assert edges.adj_index_memory_usage()["ins and outs"] == (
+        index.offsets.nbytes + index.values.nbytes
+    )
+
+
+def test_edge_data_typed_adj_indices():
+    edges = _edge_data(np.array([0, 1, 2, 2]), np.array([1, 2, 0, 2]))
+    # nodes 0 and 1 have type 0, node 2 has type 1
+    node_type_ilocs = np.array([0, 0, 1])
+
+    def as_lists(indices):
+        return {
+            triple: [list(index.lookup(i)) for i in range(len(index))]
+            for triple, index in indices.items()
+        }
+
+    assert as_lists(edges.typed_adj_indices(node_type_ilocs, ins=False, outs=True)) == {
+        (0, 0, 0): [[1], [], []],
+        (0, 0, 1): [[], [2], []],
+        (1, 0, 0): [[], [], [0]],
+        (1, 0, 1): [[], [], [2]],
+    }
+    assert as_lists(edges.typed_adj_indices(node_type_ilocs, ins=True, outs=True)) == {
+        (0, 0, 0): [[1], [0], []],
+        (0, 0, 1): [[2], [2], []],
+        (1, 0, 0): [[], [], [0, 1]],
+        (1, 0, 1): [[], [], [2]],
+    }
+
+    usage = edges.adj_index_memory_usage()["typed"]
+    assert usage > 0
+
+    with pytest.raises(ValueError, match="at least one of 'ins' or 'outs'"):
+        edges.typed_adj_indices(node_type_ilocs, ins=False, outs=False)
+
+
+def test_edge_data_typed_adj_indices_order():
+    # node 0 (type 0) has neighbours 11, 2, 10 and 3 (type 1), via edges of two relations
+    sources = np.array([0, 0, 0, 3])
+    targets = np.array([11, 2, 10, 0])
+    columns = {"source": sources, "target": targets, "weight": np.ones(4)}
+    edges = EdgeData(np.arange(4), columns, [("r", 0), ("s", 2)])
+    node_type_ilocs = np.array([0] + [1] * 11)
+
+    # sorted as strings within each relation, like the `key=str` sort of earlier versions
+    by_relation = edges.typed_adj_indices(node_type_ilocs, ins=True, outs=True)
+    assert list(by_relation[0, 0, 1].lookup(0)) == [11, 2]
+    assert list(by_relation[0, 1, 1].lookup(0)) == [10, 3]
+
+    # in edge order across relations, like `edge_ilocs`
+    combined = edges.typed_adj_indices(
+        node_type_ilocs, ins=True, outs=True, by_relation=False
+    )
+    assert list(combined) == [(0, 1), (1, 0)]
+    assert list(combined[0, 1].lookup(0)) == [11, 2, 10, 3]
+    assert list(combined[1, 0].lookup(3)) == [0]
+
+
+def test_edge_data_degrees():
+    edges = _edge_data(np.array([0, 1, 2, 2]), np.array([1, 2, 0, 2]))
+
+    np.testing.assert_array_equal(edges.degrees(), [2, 2, 3])
+    np.testing.assert_array_equal(edges.degrees(ins=False), [1, 1, 2])
+    np.testing.assert_array_equal(edges.degrees(outs=False, size=5), [1, 1, 2, 0, 0])
+
+    # cached and read-only
+    degrees = edges.degrees()
+    assert edges.degrees() is degrees
+    assert not degrees.flags.writeable
+    assert edges.adj_index_memory_usage()["degrees"] == 3 * 8 + 3 * 8 + 5 * 8
+
+
+def test_edge_data_edge_ilocs_between():
+    edges = _edge_data(np.array([0, 1, 2, 0]), np.array([1, 2, 2, 1]))
+
+    sources = np.array([0, 1, 2, 2, -1, 0, 5])
+    targets = np.array([1, 0, 2, 1, 0, 2, 0])
+
+    offsets, ilocs = edges.edge_ilocs_between(sources, targets, directed=True)
+    np.testing.assert_array_equal(offsets, [0, 2, 2, 3, 3, 3, 3, 3])
+    np.testing.assert_array_equal(ilocs, [0, 3, 2])
+
+    offsets, ilocs = edges.edge_ilocs_between(sources, targets, directed=False)
+    np.testing.assert_array_equal(offsets, [0, 2, 4, 5, 6, 6, 6, 6])
+    np.testing.assert_array_equal(ilocs, [0, 3, 0, 3, 2, 1])
+
+    assert edges.adj_index_memory_usage()["pairs"] > 0
+
+    with pytest.raises(ValueError, match="targets: expected the same number"):
+        edges.edge_ilocs_between(sources, targets[:2], directed=True)
+
+
+def test_adjacency_index_merge():
+    keys = np.array([2, 0, 2, 1, 0])
+    index = AdjacencyIndex.from_keys(keys, np.arange(len(keys)))
+
+    new_keys = np.array([0, 4, 2, 2])
+    new_values = np.array([3, 10, 0, 9])
+    merged = index.merge(new_keys, new_values)
+
+    # the same as building from scratch, and then sorting each group
+    expected = AdjacencyIndex.from_keys(
+        np.concatenate([keys, new_keys]), np.concatenate([np.arange(5), new_values]),
+    )
+    assert len(merged) == 5
+    np.testing.assert_array_equal(merged.offsets, expected.offsets)
+    for i in range(5):
+        np.testing.assert_array_equal(merged.lookup(i), np.sort(expected.lookup(i)))
+
+    assert len(index.merge([], np.array([], dtype=int), size=7)) == 7
+
+
+def test_adjacency_index_with_keys():
+    index = AdjacencyIndex.from_keys(np.array([2, 0, 2, 1]), np.arange(4))
+    moved = index.with_keys(np.array([0, 2, 3]), 5)
+
+    assert len(moved) == 5
+    assert moved.values is index.values
+    for old_key, new_key in [(0, 0), (1, 2), (2, 3)]:
+        np.testing.assert_array_equal(moved.lookup(new_key), index.lookup(old_key))
+    assert len(moved.lookup(1)) == len(moved.lookup(4)) == 0
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        # large values that aren't exactly representable as floats
+        np.array([2 ** 53 + 1, 2 ** 53 + 3, 2 ** 53 + 5], dtype=np.uint64),
+        # large enough that (key, value) doesn't fit in a single 64-bit integer
+        np.array([2 ** 62, 2 ** 62 + 2, 2 ** 63 + 4], dtype=np.uint64),
+    ],
+)
+def test_adjacency_index_merge_large_values(values):
+    keys = np.array([1, 3, 3])
+    index = AdjacencyIndex.from_keys(keys, values)
+
+    new_keys = np.array([3, 1, 3, 0, 4])
+    new_values = values[[0, 2, 1, 2, 0]] + np.uint64(1)
+    merged = index.merge(new_keys, new_values)
+
+    expected = AdjacencyIndex.from_keys(
+        np.concatenate([keys, new_keys]), np.concatenate([values, new_values])
+    )
+    np.testing.assert_array_equal(merged.offsets, expected.offsets)
+    assert merged.values.dtype == np.uint64
+    for i in range(5):
+        np.testing.assert_array_equal(merged.lookup(i), np.sort(expected.lookup(i)))
+
+
+def test_edge_data_merge():
+    edges = _edge_data(np.array([0, 1, 2]), np.array([1, 2, 2]))
+    added = EdgeData(
+        np.array([10, 11]),
+        {"source": np.array([3, 0]), "target": np.array([0, 0]), "weight": np.ones(2)},
+        [("e", 0), ("f", 1)],
+    )
+    for ins, outs in [(True, True), (True, False), (False, True)]:
+        edges.adj_index(ins=ins, outs=outs)
+
+    merged = edges.merge(added)
+    assert merged.type_starts == [("e", 0), ("f", 4)]
+    np.testing.assert_array_equal(merged.ids.pandas_index, [0, 1, 2, 10, 11])
+    np.testing.assert_array_equal(merged.sources, [0, 1, 2, 3, 0])
+    np.testing.assert_array_equal(merged.targets, [1, 2, 2, 0, 0])
+
+    fresh = EdgeData(merged.ids.pandas_index, dict(merged._columns), merged.type_starts)
+    for ins, outs in [(True, True), (True, False), (False, True)]:
+        index = merged.adj_index(ins=ins, outs=outs)
+        expected = fresh.adj_index(ins=ins, outs=outs)
+        np.testing.assert_array_equal(index.offsets, expected.offsets)
+        np.testing.assert_array_equal(index.values, expected.values)
+
+    with pytest.raises(ValueError, match="expected IDs to appear once"):
+        edges.merge(edges)
+
+
+def test_edge_data_merge_node_ilocs():
+    edges = _edge_data(np.array([0, 1, 2]), np.array([1, 2, 2]))
+    for ins, outs in [(True, True), (True, False), (False, True)]:
+        edges.adj_index(ins=ins, outs=outs)
+
+    # a node is inserted before the existing node 2
+    node_ilocs = np.array([0, 1, 3])
+    added = EdgeData(
+        np.array([10]),
+        {"source": np.array([2]), "target": np.array([3]), "weight": np.ones(1)},
+        [("e", 0)],
+    )
+    merged = edges.merge(added, node_ilocs=node_ilocs)
+    np.testing.assert_array_equal(merged.sources, [0, 1, 3, 2])
+    np.testing.assert_array_equal(merged.targets, [1, 3, 3, 3])
+
+    fresh = EdgeData(merged.ids.pandas_index, dict(merged._columns), merged.type_starts)
+    for ins, outs in [(True, True), (True, False), (False, True)]:
+        index = merged.adj_index(ins=ins, outs=outs)
+        expected = fresh.adj_index(ins=ins, outs=outs)
+        np.testing.assert_array_equal(index.offsets, expected.offsets)
+        np.testing.assert_array_equal(index.values, expected.values)
+
+
+def test_node_data_merge():
+    nodes = NodeData(
+        np.array([0, 1, 2]),
+        {},
+        [("a", 0), ("b", 2)],
+        {
+            "a": np.zeros((2, 2), dtype=np.float32),
+            "b": ChunkedFeatureStore(np.ones((1, 3))),
+        },
+    )
+    added = NodeData(
+        np.array([10, 11, 12]),
+        {},
+        [("b", 0), ("c", 1)],
+        {"b": np.full((1, 3), 2.0), "c": np.full((2, 1), 3.0)},
+    )
+
+    merged = nodes.merge(added)
+    assert merged.type_starts == [("a", 0), ("b", 2), ("c", 4)]
+    np.testing.assert_array_equal(merged.ids.pandas_index, [0, 1, 2, 10, 11, 12])
+
+    # the out-of-core features aren't loaded into memory
+    b_features = merged.feature_store("b")
+    assert isinstance(b_features, StackedFeatureStore)
+    np.testing.assert_array_equal(b_features.to_array(), [[1, 1, 1], [2, 2, 2]])
+    assert merged.feature_store("a") is nodes.feature_store("a")
+    assert merged.feature_store("c") is added.feature_store("c")
+
+    wrong_size = NodeData(np.array([20]), {}, [("a", 0)], {"a": np.zeros((1, 3))})
+    with pytest.raises(
+        ValueError, match="other: expected 2 features for nodes of type 'a', found 3"
+    ):
+        nodes.merge(wrong_size)
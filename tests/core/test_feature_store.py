@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import scipy.sparse as sps
+
+from stellargraph import StellarGraph
+from stellargraph.core import storage
+from stellargraph.core.element_data import NodeData
+from stellargraph.core.feature_store import (
+    ArrayFeatureStore,
+    ChunkedFeatureStore,
+    StackedFeatureStore,
+    stack_feature_stores,
+    to_feature_store,
+)
+
+
+class RecordingChunkedArray:
+    """
+    A minimal stand-in for a chunked on-disk array (like h5py.Dataset), that records each read.
+    """
+
+    def __init__(self, data, chunks):
+        self._data = data
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.chunks = chunks
+        self.reads = []
+
+    def __getitem__(self, selector):
+        assert isinstance(selector, slice)
+        self.reads.append((selector.start, selector.stop))
+        return self._data[selector]
+
+
+def _features(rows=20, columns=3):
+    return np.arange(rows * columns, dtype=np.float32).reshape(rows, columns)
+
+
+@pytest.mark.parametrize("sorted_reads", [False, True])
+def test_array_feature_store(sorted_reads):
+    features = _features()
+    store = ArrayFeatureStore(features, sorted_reads=sorted_reads)
+
+    assert store.shape == (20, 3)
+    assert store.dtype == np.float32
+    assert len(store) == 20
+    assert store.to_array() is features
+    assert store.memory_usage() == features.nbytes
+
+    rows = np.array([5, 0, 19, 5, 3])
+    np.testing.assert_array_equal(store.gather(rows), features[rows])
+
+    rows_2d = np.array([[1, 2], [2, 7]])
+    np.testing.assert_array_equal(store.gather(rows_2d), features[rows_2d])
+
+    assert store.gather(np.array([], dtype=int)).shape == (0, 3)
+
+    with pytest.raises(IndexError):
+        store.gather(np.array([20]))
+
+
+def test_array_feature_store_memmap(tmp_path):
+    features = _features()
+    path = tmp_path / "features.npy"
+    np.save(path, features)
+    mmapped = np.load(path, mmap_mode="r")
+
+    store = to_feature_store(mmapped)
+    assert isinstance(store, ArrayFeatureStore)
+
+    sampled = store.gather(np.array([7, 1, 7]))
+    np.testing.assert_array_equal(sampled, features[[7, 1, 7]])
+    assert not isinstance(sampled, np.memmap)
+
+    # memory-mapped data (including views of it) is paged in by the OS, rather than held in memory
+    assert store.memory_usage() == 0
+    assert ArrayFeatureStore(np.asarray(mmapped)[1:]).memory_usage() == 0
+
+
+def test_array_feature_store_sparse():
+    features = sps.csr_matrix(_features())
+    store = ArrayFeatureStore(features)
+    np.testing.assert_array_equal(
+        store.gather(np.array([2, 1])).todense(), features[[2, 1]].todense()
+    )
+    assert store.memory_usage() == (
+        features.data.nbytes + features.indices.nbytes + features.indptr.nbytes
+    )
+
+    with pytest.raises(ValueError, match="sorted_reads: expected False"):
+        ArrayFeatureStore(features, sorted_reads=True)
+
+
+def test_array_feature_store_invalid():
+    with pytest.raises(TypeError, match="data: expected numpy or scipy array"):
+        ArrayFeatureStore([[1, 2]])
+
+
+def test_chunked_feature_store():
+    features = _features(rows=100)
+    chunked = RecordingChunkedArray(features, chunks=(10, 3))
+    store = ChunkedFeatureStore(chunked)
+
+    assert store.shape == (100, 3)
+    assert store.dtype == np.float32
+
+    rows = np.array([55, 3, 98, 7, 51, 3, 90])
+    np.testing.assert_array_equal(store.gather(rows), features[rows])
+
+    # one contiguous read per chunk, in order, covering only the requested rows
+    assert chunked.reads == [(3, 8), (51, 56), (90, 99)]
+
+    rows_2d = np.array([[0, 99], [99, 0]])
+    np.testing.assert_array_equal(store.gather(rows_2d), features[rows_2d])
+
+    assert store.gather(np.array([], dtype=int)).shape == (0, 3)
+
+    with pytest.raises(IndexError):
+        store.gather(np.array([100]))
+
+    np.testing.assert_array_equal(store.to_array(), features)
+    # the data is out-of-core
+    assert store.memory_usage() == 0
+
+
+def test_chunked_feature_store_chunk_rows():
+    features = _features(rows=10)
+    chunked = RecordingChunkedArray(features, chunks=None)
+    store = ChunkedFeatureStore(chunked, chunk_rows=2)
+    np.testing.assert_array_equal(
+        store.gather(np.array([0, 1, 5])), features[[0, 1, 5]]
+    )
+    assert chunked.reads == [(0, 2), (5, 6)]
+
+    with pytest.raises(ValueError, match="chunk_rows: expected a positive integer"):
+        ChunkedFeatureStore(chunked, chunk_rows=0)
+
+
+def test_node_data_feature_store():
+    a_features = _features(rows=2)
+    b_features = _features(rows=3, columns=4)
+    nodes = NodeData(
+        ["a0", "a1", "b0", "b1", "b2"],
+        {},
+        [("a", 0), ("b", 2)],
+        {
+            "a": a_features,
+            "b": ChunkedFeatureStore(RecordingChunkedArray(b_features, chunks=(2, 4))),
+        },
+    )
+
+    assert nodes.feature_info() == {
+        "a": (3, np.dtype(np.float32)),
+        "b": (4, np.dtype(np.float32)),
+    }
+    np.testing.assert_array_equal(
+        nodes.features("a", np.array([1, 0])), a_features[[1, 0]]
+    )
+    np.testing.assert_array_equal(
+        nodes.features("b", np.array([4, 2, 4])), b_features[[2, 0, 2]]
+    )
+    np.testing.assert_array_equal(nodes.features_of_type("b"), b_features)
+
+    with pytest.raises(ValueError, match="unknown IDs"):
+        nodes.features("b", np.array([5]))
+
+
+def test_save_chunked_feature_store(tmp_path, monkeypatch):
+    features = _features(rows=20, columns=4)
+    chunked = RecordingChunkedArray(features, chunks=(2, 4))
+    g = StellarGraph.from_arrays(
+        np.arange(20), ChunkedFeatureStore(chunked), sources=[0], targets=[1]
+    )
+
+    # save 6 rows (of 4 float32 features) at a time
+    monkeypatch.setattr(storage, "_SAVE_CHUNK_BYTES", 6 * 4 * 4)
+    g.save(tmp_path)
+
+    # the features are read a few rows at a time, never all at once
+    assert chunked.reads
+    assert all(stop - start <= 6 for start, stop in chunked.reads)
+
+    loaded = StellarGraph.load(tmp_path)
+    np.testing.assert_array_equal(loaded.node_features(), features)
+
+
+def test_stacked_feature_store():
+    features = _features()
+    chunked = RecordingChunkedArray(features[:12], chunks=(4, 3))
+    store = StackedFeatureStore(
+        [
+            ChunkedFeatureStore(chunked),
+            ArrayFeatureStore(features[12:12]),
+            ArrayFeatureStore(sps.csr_matrix(features[12:].astype(np.float64))),
+        ]
+    )
+
+    assert store.shape == (20, 3)
+    assert store.dtype == np.float32
+    assert store.memory_usage() > 0
+
+    rows = np.array([[19, 0], [11, 12]])
+    sampled = store.gather(rows)
+    assert sampled.dtype == np.float32
+    np.testing.assert_array_equal(sampled, features[rows])
+    np.testing.assert_array_equal(store.to_array(), features)
+
+    with pytest.raises(IndexError):
+        store.gather(np.array([20]))
+
+    with pytest.raises(ValueError, match="expected at least one store"):
+        StackedFeatureStore([])
+
+    with pytest.raises(ValueError, match=r"same number of columns, found \[2, 3\]"):
+        StackedFeatureStore(
+            [ArrayFeatureStore(features), ArrayFeatureStore(features[:, :2])]
+        )
+
+
+def test_stack_feature_stores(tmp_path):
+    features = _features()
+    in_memory = [ArrayFeatureStore(features[:5]), ArrayFeatureStore(features[5:8])]
+
+    # in-memory arrays are concatenated, and converted to the dtype
+    stacked = stack_feature_stores(in_memory, np.float64)
+    assert isinstance(stacked, ArrayFeatureStore)
+    assert stacked.dtype == np.float64
+    np.testing.assert_array_equal(stacked.to_array(), features[:8])
+
+    sparse = stack_feature_stores(
+        [in_memory[0], ArrayFeatureStore(sps.csr_matrix(features[5:8]))]
+    )
+    assert sps.issparse(sparse.to_array())
+    np.testing.assert_array_equal(sparse.to_array().toarray(), features[:8])
+
+    # memory-mapped arrays are read in place, with adjacent in-memory ones concatenated
+    path = tmp_path / "features.npy"
+    np.save(path, features[8:])
+    memmap = ArrayFeatureStore(np.load(path, mmap_mode="r"))
+    stacked = stack_feature_stores(in_memory + [memmap])
+    assert isinstance(stacked, StackedFeatureStore)
+    assert len(stacked._stores) == 2
+    np.testing.assert_array_equal(stacked.to_array(), features)
+
+    # stacking again flattens the existing stacked store
+    restacked = stack_feature_stores([stacked, ArrayFeatureStore(features[:1])])
+    assert len(restacked._stores) == 3
+    np.testing.assert_array_equal(
+        restacked.to_array(), np.concatenate([features, features[:1]])
+    )
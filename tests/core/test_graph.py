@@ -18,9 +18,14 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 import pytest
+import gc
+import os
+import copy
+import pickle
 import random
 from stellargraph.core.graph import *
 from stellargraph.core.experimental import ExperimentalWarning
+from stellargraph.core.utils import normalize_adj
 from ..test_utils.alloc import snapshot, allocation_benchmark
 from ..test_utils.graphs import (
     example_graph_nx,
@@ -30,6 +35,7 @@ from ..test_utils.graphs import (
     line_graph,
     weighted_hin,
     example_graph_random,
+    example_graph_local,
 )
 
 from .. import test_utils
@@ -558,6 +564,59 @@ def test_edges_include_edge_type(use_ilocs):
     )
 
 
+@pytest.mark.parametrize("use_ilocs", [True, False])
+@pytest.mark.parametrize("include_edge_type", [True, False])
+@pytest.mark.parametrize("include_edge_weight", [True, False])
+def test_edge_arrays(use_ilocs, include_edge_type, include_edge_weight):
+    g = example_weighted_hin()
+    sources, targets, types, weights = g.edge_arrays(
+        include_edge_type=include_edge_type,
+        include_edge_weight=include_edge_weight,
+        use_ilocs=use_ilocs,
+    )
+
+    expected_sources = g._edges.sources
+    expected_targets = g._edges.targets
+    if not use_ilocs:
+        expected_sources = g.node_ilocs_to_ids(expected_sources)
+        expected_targets = g.node_ilocs_to_ids(expected_targets)
+
+    np.testing.assert_array_equal(sources, expected_sources)
+    np.testing.assert_array_equal(targets, expected_targets)
+    arrays = [sources, targets]
+
+    if include_edge_type:
+        names = g._edges.type_of_iloc(slice(None))
+        if use_ilocs:
+            np.testing.assert_array_equal(g._edges.types.from_iloc(types), names)
+            # a view of the internal storage, not a copy
+            assert np.shares_memory(types, g._edges.type_ilocs)
+        else:
+            np.testing.assert_array_equal(types, names)
+        arrays.append(types)
+    else:
+        assert types is None
+
+    if include_edge_weight:
+        np.testing.assert_array_equal(weights, g._edges.weights)
+        assert np.shares_memory(weights, g._edges.weights)
+        arrays.append(weights)
+    else:
+        assert weights is None
+
+    if use_ilocs:
+        assert np.shares_memory(sources, g._edges.sources)
+
+    for array in arrays:
+        assert len(array) == g.number_of_edges()
+        assert not array.flags.writeable
+        with pytest.raises(ValueError, match="read-only"):
+            array[0] = array[1]
+
+    # the graph itself is unaffected
+    assert g._edges.weights.flags.writeable
+
+
 def numpy_to_list(x):
     if isinstance(x, np.ndarray):
         return list(x)
@@ -659,6 +718,140 @@ def test_to_networkx_deprecation(line_graph):
     assert "feature_name" in str(record.pop(DeprecationWarning).message)
 
 
+def test_to_coo():
+    g = example_weighted_hin()
+    matrix, types = g.to_coo()
+
+    assert matrix.shape == (g.number_of_nodes(), g.number_of_nodes())
+    # one entry per edge, without summing parallel edges
+    assert matrix.nnz == g.number_of_edges()
+
+    sources, targets, type_ilocs, weights = g.edge_arrays(
+        include_edge_type=True, include_edge_weight=True, use_ilocs=True
+    )
+    np.testing.assert_array_equal(matrix.row, sources)
+    np.testing.assert_array_equal(matrix.col, targets)
+    np.testing.assert_array_equal(matrix.data, weights)
+    np.testing.assert_array_equal(types, type_ilocs)
+
+    np.testing.assert_array_equal(
+        matrix.toarray(), g.to_adjacency_matrix(weighted=True).toarray()
+    )
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+@pytest.mark.parametrize("string_ids", [False, True])
+def test_to_npz(tmp_path, compressed, string_ids):
+    g = example_weighted_hin(is_directed=False)
+    if string_ids:
+        sources, targets, types, weights = g.edge_arrays(True, True)
+        g = StellarGraph(
+            {
+                type_: pd.DataFrame(index=g.nodes(node_type=type_).astype(str))
+                for type_ in g.node_types
+            },
+            pd.DataFrame(
+                {
+                    "source": sources.astype(str),
+                    "target": targets.astype(str),
+                    "weight": weights,
+                    "type": types,
+                },
+                index=[f"e{i}" for i in range(len(sources))],
+            ),
+            edge_type_column="type",
+        )
+
+    path = tmp_path / "edges.npz"
+    g.to_npz(path, compressed=compressed)
+
+    # strings are saved without pickling, so the default `allow_pickle=False` works
+    with np.load(path) as data:
+        assert data["node_types"].dtype.kind == "U"
+        assert data["edge_types"].dtype.kind == "U"
+        if string_ids:
+            assert data["node_ids"].dtype.kind == "U"
+            assert data["edge_ids"].dtype.kind == "U"
+
+        np.testing.assert_array_equal(data["node_ids"], g.nodes())
+        np.testing.assert_array_equal(
+            data["node_types"][data["node_type_ilocs"]], g.node_type(g.nodes())
+        )
+        np.testing.assert_array_equal(data["edge_ids"], g._edges.ids.pandas_index)
+
+        sources, targets, types, weights = g.edge_arrays(
+            include_edge_type=True, include_edge_weight=True
+        )
+        np.testing.assert_array_equal(data["node_ids"][data["sources"]], sources)
+        np.testing.assert_array_equal(data["node_ids"][data["targets"]], targets)
+        np.testing.assert_array_equal(
+            data["edge_types"][data["edge_type_ilocs"]], types
+        )
+        np.testing.assert_array_equal(data["weights"], weights)
+        assert not data["is_directed"]
+
+
+@pytest.mark.parametrize("use_ilocs", [False, True])
+def test_to_arrow(use_ilocs):
+    pytest.importorskip("pyarrow")
+
+    g = example_weighted_hin()
+    nodes, edges = g.to_arrow(use_ilocs=use_ilocs)
+
+    assert nodes.column_names == ["id", "type"]
+    assert edges.column_names == ["id", "source", "target", "type", "weight"]
+
+    expected_ids = np.arange(g.number_of_nodes()) if use_ilocs else g.nodes()
+    np.testing.assert_array_equal(nodes["id"].to_numpy(), expected_ids)
+    assert nodes["type"].to_pylist() == list(g.node_type(g.nodes()))
+
+    sources, targets, types, weights = g.edge_arrays(
+        include_edge_type=True, include_edge_weight=True, use_ilocs=use_ilocs
+    )
+    np.testing.assert_array_equal(edges["source"].to_numpy(), sources)
+    np.testing.assert_array_equal(edges["target"].to_numpy(), targets)
+    assert edges["type"].to_pylist() == list(g._edges.type_of_iloc(slice(None)))
+    np.testing.assert_array_equal(edges["weight"].to_numpy(), weights)
+
+
+@pytest.mark.parametrize("uniform", [False, True])
+def test_to_arrow_features(uniform):
+    pytest.importorskip("pyarrow")
+
+    g = example_hin_1(
+        feature_sizes={"A": 3, "B": 3 if uniform else 2}, reverse_order=True
+    )
+    nodes, _ = g.to_arrow(include_features=True)
+
+    features = nodes["features"].to_pylist()
+    for node, feature in zip(g.nodes(), features):
+        np.testing.assert_array_equal(feature, g.node_features([node])[0])
+
+
+def test_to_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    g = example_weighted_hin()
+    nodes_path = tmp_path / "nodes.parquet"
+    edges_path = tmp_path / "edges.parquet"
+    g.to_parquet(nodes_path, edges_path)
+
+    loaded = StellarGraph.from_files(
+        edges=edges_path, edge_type_column="type", edge_id_column="id"
+    )
+    assert loaded.number_of_edges() == g.number_of_edges()
+    assert normalize_edges(
+        loaded.edges(include_edge_type=True), directed=False
+    ) == normalize_edges(g.edges(include_edge_type=True), directed=False)
+    np.testing.assert_array_equal(
+        loaded.edge_arrays(include_edge_weight=True)[3],
+        g.edge_arrays(include_edge_weight=True)[3],
+    )
+
+    read_nodes = pd.read_parquet(nodes_path)
+    np.testing.assert_array_equal(read_nodes["id"], g.nodes())
+
+
 def test_networkx_attribute_message():
     ug = StellarGraph()
     dg = StellarDiGraph()
@@ -707,6 +900,20 @@ def test_benchmark_get_neighbours(benchmark, use_ilocs):
     benchmark(f)
 
 
+@pytest.mark.benchmark(group="StellarGraph neighbours")
+@pytest.mark.parametrize("use_ilocs", [False, True])
+def test_benchmark_get_neighbours_batch(benchmark, use_ilocs):
+    nodes, edges = example_benchmark_graph()
+    sg = StellarGraph(nodes=nodes, edges=edges)
+    all_nodes = sg.nodes(use_ilocs=use_ilocs)
+
+    # get the neigbours of every node in the graph
+    def f():
+        sg.neighbors_batch(all_nodes, use_ilocs=use_ilocs)
+
+    benchmark(f)
+
+
 @pytest.mark.benchmark(group="StellarGraph node features")
 @pytest.mark.parametrize("use_ilocs", [None, False, True])
 @pytest.mark.parametrize("num_types", [1, 4])
@@ -813,6 +1020,24 @@ def test_allocation_benchmark_creation(
     allocation_benchmark(f)
 
 
+@pytest.mark.benchmark(group="StellarGraph creation (time)")
+@pytest.mark.parametrize("num_nodes,num_edges", [(0, 0), (100, 200), (1000, 5000)])
+@pytest.mark.parametrize("feature_size", [None, 100])
+@pytest.mark.parametrize("use_ilocs", [False, True])
+def test_benchmark_creation_from_arrays(
+    benchmark, feature_size, num_nodes, num_edges, use_ilocs
+):
+    node_ids = np.arange(num_nodes)
+    features = None if feature_size is None else np.ones((num_nodes, feature_size))
+    sources, targets = np.random.randint(0, max(num_nodes, 1), size=(2, num_edges))
+
+    benchmark(
+        lambda: StellarGraph.from_arrays(
+            node_ids, features, sources, targets, use_ilocs=use_ilocs
+        )
+    )
+
+
 def example_weighted_hin(is_directed=True):
     edge_cols = ["source", "target", "weight"]
     cls = StellarDiGraph if is_directed else StellarGraph
@@ -997,6 +1222,51 @@ def test_isolated_node_neighbor_methods(is_directed, use_ilocs):
     assert graph.out_nodes(node, use_ilocs=use_ilocs) == []
 
 
+@pytest.mark.parametrize("use_ilocs", [True, False])
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("edge_types", [None, ["AB"], ["AA", "AB"]])
+@pytest.mark.parametrize("method", ["neighbors", "in_nodes", "out_nodes"])
+def test_neighbors_batch(method, edge_types, is_directed, use_ilocs):
+    graph = example_weighted_hin(is_directed=is_directed)
+    single = getattr(graph, method)
+    batch = getattr(graph, f"{method}_batch")
+
+    # include repeated nodes and a node with no edges of some types
+    nodes = [1, 0, 3, 1, 2]
+    if use_ilocs:
+        nodes = graph.node_ids_to_ilocs(nodes)
+
+    offsets, neighbours = batch(nodes, edge_types=edge_types, use_ilocs=use_ilocs)
+    offsets_w, neighbours_w, weights = batch(
+        nodes, include_edge_weight=True, edge_types=edge_types, use_ilocs=use_ilocs
+    )
+    np.testing.assert_array_equal(offsets, offsets_w)
+    np.testing.assert_array_equal(neighbours, neighbours_w)
+
+    assert len(offsets) == len(nodes) + 1
+    for i, node in enumerate(nodes):
+        start, stop = offsets[i], offsets[i + 1]
+        expected = single(
+            node, include_edge_weight=True, edge_types=edge_types, use_ilocs=use_ilocs
+        )
+        assert list(zip(neighbours[start:stop], weights[start:stop])) == expected
+
+
+def test_neighbors_batch_empty():
+    graph = example_weighted_hin(is_directed=False)
+    offsets, neighbours = graph.neighbors_batch([], use_ilocs=True)
+    np.testing.assert_array_equal(offsets, [0])
+    assert len(neighbours) == 0
+
+    # isolated node
+    graph = StellarGraph(
+        nodes=pd.DataFrame(index=[1]), edges=pd.DataFrame(columns=["source", "target"])
+    )
+    offsets, neighbours = graph.neighbors_batch([1, 1])
+    np.testing.assert_array_equal(offsets, [0, 0, 0])
+    assert len(neighbours) == 0
+
+
 @pytest.mark.parametrize("is_directed", [False, True])
 def test_info_homogeneous(is_directed):
 
@@ -1421,58 +1691,79 @@ def test_edges_include_weights():
         )
 
 
-@pytest.mark.parametrize("use_ilocs", [True, False])
-def test_adjacency_types_undirected(use_ilocs):
-    g = example_hin_1(is_directed=False, reverse_order=True)
-    adj = g._adjacency_types(g.create_graph_schema(), use_ilocs=use_ilocs)
+def _typed_adjacency_by_id(g, edge_type):
+    offsets, neighbours = g.typed_adjacency(edge_type)
+    assert len(offsets) == g.number_of_nodes() + 1
 
-    expected = {
-        ("A", "R", "B"): {0: [4], 1: [4, 5], 2: [4], 3: [5]},
-        ("B", "R", "A"): {4: [0, 1, 2], 5: [1, 3]},
-        ("B", "F", "B"): {4: [5], 5: [4]},
+    node_ids = g.node_ilocs_to_ids(np.arange(g.number_of_nodes()))
+    return {
+        node_id: list(g.node_ilocs_to_ids(neighbours[start:stop]))
+        for node_id, start, stop in zip(node_ids, offsets[:-1], offsets[1:])
+        if stop > start
     }
 
-    if use_ilocs:
-        for key in expected.keys():
-            expected[key] = dict(
-                (g.node_ids_to_ilocs([subkey])[0], list(g.node_ids_to_ilocs(subvalue)),)
-                for subkey, subvalue in expected[key].items()
-            )
 
-    _assert_dict_equal(adj, expected)
+def _assert_typed_adjacency(g, expected):
+    assert set(g.create_graph_schema().edge_types) == set(expected.keys())
+    for edge_type, expected_neighbours in expected.items():
+        actual = _typed_adjacency_by_id(g, edge_type)
+        # neighbours are sorted by iloc, so compare as multisets
+        assert actual.keys() == expected_neighbours.keys()
+        for node_id, neighbours in expected_neighbours.items():
+            assert_items_equal(actual[node_id], neighbours)
 
 
-def _assert_dict_equal(d1, d2):
+def test_typed_adjacency_undirected():
+    g = example_hin_1(is_directed=False, reverse_order=True)
 
-    assert sorted(d1.keys()) == sorted(d2.keys())
-    _comp_func = (
-        _assert_dict_equal
-        if isinstance(next(iter(d1.values())), dict)
-        else assert_items_equal
+    _assert_typed_adjacency(
+        g,
+        {
+            ("A", "R", "B"): {0: [4], 1: [4, 5], 2: [4], 3: [5]},
+            ("B", "R", "A"): {4: [0, 1, 2], 5: [1, 3]},
+            ("B", "F", "B"): {4: [5], 5: [4]},
+        },
     )
-    for key in d1.keys():
-        _comp_func(d1[key], d2[key])
 
+    offsets, neighbours = g.typed_adjacency(("B", "F", "B"))
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+        assert list(neighbours[start:stop]) == sorted(neighbours[start:stop])
 
-@pytest.mark.parametrize("use_ilocs", [True, False])
-def test_adjacency_types_directed(use_ilocs):
+
+def test_typed_adjacency_directed():
     g = example_hin_1(is_directed=True, reverse_order=True)
-    adj = g._adjacency_types(g.create_graph_schema(), use_ilocs=use_ilocs)
 
-    expected = {
-        ("A", "R", "B"): {1: [4, 5], 2: [4]},
-        ("B", "R", "A"): {4: [0], 5: [3]},
-        ("B", "F", "B"): {4: [5]},
-    }
+    _assert_typed_adjacency(
+        g,
+        {
+            ("A", "R", "B"): {1: [4, 5], 2: [4]},
+            ("B", "R", "A"): {4: [0], 5: [3]},
+            ("B", "F", "B"): {4: [5]},
+        },
+    )
 
-    if use_ilocs:
-        for key in expected.keys():
-            expected[key] = dict(
-                (g.node_ids_to_ilocs([subkey])[0], list(g.node_ids_to_ilocs(subvalue)),)
-                for subkey, subvalue in expected[key].items()
-            )
 
-    _assert_dict_equal(adj, expected)
+def test_typed_adjacency_self_loops():
+    g = example_hin_1(is_directed=False, self_loop=True)
+
+    # self loops are only included once for each edge
+    assert _typed_adjacency_by_id(g, ("B", "F", "B")) == {4: [5], 5: [4, 5, 5]}
+    assert _typed_adjacency_by_id(g, ("B", "R", "B")) == {5: [5]}
+
+
+def test_typed_adjacency_missing():
+    g = example_hin_1(is_directed=True)
+
+    # valid types without any edges
+    offsets, neighbours = g.typed_adjacency(("A", "F", "A"))
+    np.testing.assert_array_equal(offsets, np.zeros(g.number_of_nodes() + 1))
+    assert len(neighbours) == 0
+
+    with pytest.raises(KeyError, match="C"):
+        g.typed_adjacency(("A", "R", "C"))
+
+    with pytest.raises(KeyError, match="X"):
+        g.typed_adjacency(("A", "X", "B"))
 
 
 def test_to_adjacency_matrix_weighted_undirected():
@@ -1599,12 +1890,175 @@ def test_to_adjacency_matrix_empty(is_directed):
 
 @pytest.mark.benchmark(group="StellarGraph to_adjacency_matrix")
 @pytest.mark.parametrize("is_directed", [False, True])
-def test_benchmark_to_adjacency_matrix(is_directed, benchmark):
+@pytest.mark.parametrize("cached", [False, True])
+def test_benchmark_to_adjacency_matrix(is_directed, cached, benchmark):
     nodes, edges = example_benchmark_graph(n_nodes=1000, n_edges=5000)
     cls = StellarDiGraph if is_directed else StellarGraph
     g = cls(nodes, edges)
 
-    benchmark(lambda: g.to_adjacency_matrix())
+    def f():
+        if not cached:
+            g.adjacency_cache_clear()
+        return g.to_adjacency_matrix()
+
+    benchmark(f)
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_adjacency_cache(is_directed):
+    g = example_hin_1(is_directed=is_directed, self_loop=True)
+    assert g.adjacency_cache_info() == (0, 0, [], 0, 2 ** 30)
+
+    first = g.to_adjacency_matrix()
+    # the public method returns a copy, which can be modified without affecting the cache
+    first[0, 0] = 123
+    second = g.to_adjacency_matrix()
+    assert second[0, 0] == 0
+
+    info = g.adjacency_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert info.keys == [(False, None, None)]
+    assert info.nbytes > 0
+
+    cached = g._adjacency_matrix()
+    assert g._adjacency_matrix() is cached
+    assert not cached.data.flags.writeable
+    with pytest.raises(ValueError, match="read-only"):
+        cached.data[0] = 123
+
+    np.testing.assert_array_equal(cached.todense(), second.todense())
+
+    # the normalized matrices are computed from the cached unnormalized ones
+    weighted = g.to_adjacency_matrix(weighted=True, edge_type="R")
+    symmetric = g._adjacency_matrix(
+        weighted=True, edge_type="R", normalization="symmetric_self_loops"
+    )
+    np.testing.assert_allclose(
+        symmetric.todense(),
+        normalize_adj(weighted, symmetric=True, add_self_loops=True).todense(),
+    )
+    assert g.adjacency_cache_info().keys == [
+        (False, None, None),
+        (True, "R", None),
+        (True, "R", "symmetric_self_loops"),
+    ]
+
+    with pytest.raises(
+        ValueError, match="normalization: expected one of .*found 'foo'"
+    ):
+        g._adjacency_matrix(normalization="foo")
+
+    with pytest.raises(KeyError):
+        g._adjacency_matrix(edge_type="X")
+
+    g.adjacency_cache_clear()
+    assert g.adjacency_cache_info() == (0, 0, [], 0, 2 ** 30)
+
+
+def test_adjacency_cache_bounded():
+    g = example_hin_1()
+    g._adjacency_matrix()
+    g._adjacency_matrix(edge_type="R")
+    # room for exactly these two matrices
+    max_bytes = g.adjacency_cache_info().nbytes
+    g.adjacency_cache_clear()
+    g._adjacency_cache.max_bytes = max_bytes
+
+    for edge_type in ["R", "F"]:
+        g._adjacency_matrix(edge_type=edge_type)
+    g._adjacency_matrix(edge_type="R")
+
+    whole = g._adjacency_matrix()
+    info = g.adjacency_cache_info()
+    assert info.nbytes <= info.max_bytes
+    assert info.keys == [(False, "R", None), (False, None, None)]
+    # the least recently used ones are evicted first
+    assert info.keys[-1] == (False, None, None)
+    assert (False, "F", None) not in info.keys
+
+    # a matrix that's too large for the cache is still returned
+    g._adjacency_cache.max_bytes = 1
+    assert g._adjacency_matrix(weighted=True).shape == whole.shape
+    assert (True, None, None) not in g.adjacency_cache_info().keys
+
+
+def test_memory_usage():
+    nodes = pd.DataFrame(np.ones((300, 2)), index=[f"n{i}" for i in range(300)])
+    edges = pd.DataFrame(
+        {"source": ["n0", "n1", "n299"], "target": ["n1", "n2", "n0"]},
+        index=[10, 20, 30],
+    )
+    g = StellarGraph(nodes, edges, dtype="float16")
+
+    usage = g.memory_usage()
+    assert usage.name == "bytes"
+    assert usage["node features", "default"] == 300 * 2 * 2
+    assert usage["edges", "source"] == usage["edges", "target"] == 3 * 2
+    assert usage["edges", "weight"] == 3 * 4
+    assert usage["adjacency index", "ins and outs"] == 0
+    assert usage["adjacency cache", "matrices"] == 0
+
+    # string IDs only count the pointers to each object, unless the memory is computed deeply
+    deep = g.memory_usage(deep=True)
+    assert deep["nodes", "ids"] > usage["nodes", "ids"] >= 300 * 8
+    assert deep.sum() > usage.sum()
+
+    g.neighbors("n0")
+    g.to_adjacency_matrix()
+    usage = g.memory_usage()
+    assert usage["adjacency index", "ins and outs"] > 0
+    assert usage["adjacency cache", "matrices"] == g.adjacency_cache_info().nbytes
+
+
+def test_memory_usage_mmap(tmp_path):
+    g = example_hin_1(feature_sizes={"A": 3, "B": 0})
+    g.save(tmp_path)
+
+    loaded = StellarGraph.load(tmp_path, mmap=True).memory_usage()
+    # everything loaded from disk is memory-mapped, except for the ID and type indices
+    assert loaded["node features"].sum() == 0
+    assert loaded["edges"].drop(["ids", "types"]).sum() == 0
+    assert loaded["adjacency index"].sum() == 0
+
+    in_memory = StellarGraph.load(tmp_path, mmap=False).memory_usage()
+    assert in_memory["node features", "A"] == 4 * 3 * 4
+    assert in_memory["adjacency index", "ins and outs"] > 0
+
+
+@pytest.mark.parametrize("edge_weight_dtype", [None, "float16"])
+def test_edge_weight_dtype(edge_weight_dtype):
+    edges = pd.DataFrame(
+        {"source": [0, 1], "target": [1, 2], "weight": [0.5, 2.0]}, dtype=np.float64
+    ).astype({"source": int, "target": int})
+    expected = np.float64 if edge_weight_dtype is None else np.float16
+
+    g = StellarGraph(edges=edges, edge_weight_dtype=edge_weight_dtype)
+    assert g._edges.weights.dtype == expected
+    assert g.edges(include_edge_weight=True)[1].tolist() == [0.5, 2.0]
+    assert g._edges.sources.dtype == np.uint8
+
+    g = StellarGraph.from_arrays(
+        sources=np.array([0, 1]),
+        targets=np.array([1, 2]),
+        weights=np.array([0.5, 2.0]),
+        edge_weight_dtype=edge_weight_dtype,
+    )
+    assert g._edges.weights.dtype == expected
+
+    with pytest.raises(TypeError, match="weight_dtype: expected a numeric data-type"):
+        StellarGraph(edges=edges, edge_weight_dtype=str)
+
+
+@pytest.mark.benchmark(group="StellarGraph subgraph")
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_benchmark_subgraph(is_directed, benchmark):
+    nodes, edges = example_benchmark_graph(n_nodes=10000, n_edges=50000)
+    cls = StellarDiGraph if is_directed else StellarGraph
+    g = cls(nodes, edges)
+    # a small ego network
+    ego = g.neighbors(1234) + [1234]
+
+    benchmark(lambda: g.subgraph(ego))
 
 
 @pytest.mark.parametrize("use_ilocs", [True, False])
@@ -1635,6 +2089,50 @@ def test_edge_weights_directed(use_ilocs):
         assert g._edge_weights(*edge, use_ilocs=use_ilocs) == weight
 
 
+@pytest.mark.parametrize("use_ilocs", [True, False])
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_has_edges_edge_weights(use_ilocs, is_directed):
+    g = example_hin_1(is_directed=is_directed, self_loop=True, reverse_order=True)
+
+    sources = np.array([5, 4, 5, 0, 4, 0, 6])
+    targets = np.array([5, 5, 4, 4, 0, 1, 6])
+    if use_ilocs:
+        sources = g.node_ids_to_ilocs(sources)
+        targets = g.node_ids_to_ilocs(targets)
+
+    if is_directed:
+        expected = [[11.0, 12.0, 1.0], [10.0], [], [], [1.0], [], []]
+    else:
+        expected = [[11.0, 12.0, 1.0], [10.0], [10.0], [1.0], [1.0], [], []]
+
+    has = g.has_edges(sources, targets, use_ilocs=use_ilocs)
+    np.testing.assert_array_equal(has, [len(w) > 0 for w in expected])
+
+    offsets, weights = g.edge_weights(sources, targets, use_ilocs=use_ilocs)
+    actual = [list(weights[start:stop]) for start, stop in zip(offsets, offsets[1:])]
+    assert actual == expected
+
+    for source, target, weight in zip(sources, targets, expected):
+        assert g._edge_weights(source, target, use_ilocs=use_ilocs) == weight
+
+    # only the "R" self loop on node 5, and the "F" edge between 4 and 5
+    has_r = g.has_edges(sources, targets, edge_types=["R"], use_ilocs=use_ilocs)
+    assert has_r[0] and not has_r[1]
+    offsets, weights = g.edge_weights(
+        sources[:2], targets[:2], edge_types=["F"], use_ilocs=use_ilocs
+    )
+    np.testing.assert_array_equal(offsets, [0, 2, 3])
+    np.testing.assert_array_equal(weights, [11.0, 12.0, 10.0])
+
+
+def test_has_edges_unknown_nodes():
+    g = example_hin_1()
+    np.testing.assert_array_equal(
+        g.has_edges([0, "unknown", 0], [4, 0, "unknown"]), [True, False, False]
+    )
+    np.testing.assert_array_equal(g.has_edges([], []), [])
+
+
 def test_node_type():
     g = example_hin_1()
     assert g.node_type(0) == "A"
@@ -1765,12 +2263,356 @@ def test_subgraph(is_directed, nodes):
         )
 
 
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_subgraph_order(is_directed):
+    g = example_hin_1(is_directed=is_directed, self_loop=True, reverse_order=True)
+    # nodes are grouped by type, but otherwise keep the order of the argument
+    sub = g.subgraph([5, 1, 4, 0])
+
+    assert list(sub.nodes()) == [1, 0, 5, 4]
+    assert sub.node_types == {"A", "B"}
+    for node_type in ["A", "B"]:
+        np.testing.assert_array_equal(
+            sub.node_features(node_type=node_type),
+            g.node_features(sub.nodes(node_type=node_type)),
+        )
+
+    # edges keep their relative order from the original graph
+    all_edges = g.edges(include_edge_type=True)
+    sub_nodes = {0, 1, 4, 5}
+    expected = [
+        (s, t, ty) for s, t, ty in all_edges if s in sub_nodes and t in sub_nodes
+    ]
+    assert sub.edges(include_edge_type=True) == expected
+
+    # the edge types only include those with edges
+    assert list(g.subgraph([0, 1]).edge_types) == []
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("edge_type", [None, 0, 2])
+def test_to_adjacency_matrix_nodes_random(is_directed, edge_type):
+    nodes, edges = example_benchmark_graph(n_nodes=50, n_edges=300)
+    edges["weight"] = np.random.random(len(edges))
+    edges["type"] = np.random.randint(3, size=len(edges))
+    cls = StellarDiGraph if is_directed else StellarGraph
+    g = cls(nodes, edges, edge_type_column="type")
+
+    full = g.to_adjacency_matrix(weighted=True, edge_type=edge_type).todense()
+
+    subset = np.random.choice(50, size=20, replace=False)
+    # the node IDs are 0, ..., 49, but the ilocs are in a different order (grouped by type)
+    subset_ilocs = g.node_ids_to_ilocs(subset)
+    sub = g.to_adjacency_matrix(subset, weighted=True, edge_type=edge_type)
+    np.testing.assert_allclose(sub.todense(), full[np.ix_(subset_ilocs, subset_ilocs)])
+
+
 def test_subgraph_missing_node():
     g = example_hin_1()
     with pytest.raises(KeyError, match="12345"):
         sub = g.subgraph([0, 1, 12345])
 
 
+@pytest.mark.parametrize("method", ["degree", "rcm", "bfs", "partition"])
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_reorder(method, is_directed):
+    g = example_hin_1(
+        feature_sizes={"A": 2, "B": 3}, is_directed=is_directed, self_loop=True
+    )
+    reordered = g.reorder(method, seed=123)
+
+    assert type(reordered) == type(g)
+    assert set(reordered.nodes()) == set(g.nodes())
+    assert reordered.node_types == g.node_types
+
+    for node in g.nodes():
+        assert reordered.node_type(node) == g.node_type(node)
+        np.testing.assert_array_equal(
+            reordered.node_features([node]), g.node_features([node])
+        )
+        assert sorted(reordered.neighbors(node, include_edge_weight=True)) == sorted(
+            g.neighbors(node, include_edge_weight=True)
+        )
+        assert sorted(reordered.out_nodes(node)) == sorted(g.out_nodes(node))
+
+    def edges_by_id(graph):
+        edges = graph.edges(include_edge_type=True, include_edge_weight=True)
+        ids = graph._edges.ids.pandas_index
+        return dict(zip(ids, zip(*edges)))
+
+    assert edges_by_id(reordered) == edges_by_id(g)
+
+
+def test_reorder_locality():
+    g = example_graph_local(1, 1000)
+
+    def bandwidth(graph):
+        adj = graph.to_adjacency_matrix().tocoo()
+        return np.abs(adj.row - adj.col).mean()
+
+    for method in ["rcm", "bfs", "partition"]:
+        assert bandwidth(g.reorder(method, seed=0)) < bandwidth(g) / 5
+
+
+def test_reorder_invalid():
+    with pytest.raises(
+        ValueError,
+        match="method: expected one of 'degree', 'rcm', 'bfs', 'partition', found 'foo'",
+    ):
+        example_graph().reorder("foo")
+
+    assert StellarGraph().reorder().number_of_nodes() == 0
+
+
+@pytest.mark.benchmark(group="StellarGraph reorder matmul")
+@pytest.mark.parametrize("method", [None, "degree", "rcm", "bfs", "partition"])
+def test_benchmark_reorder_matmul(benchmark, method):
+    g = example_graph_local(64, 100000)
+    if method is not None:
+        g = g.reorder(method, seed=123)
+
+    adj = g.to_adjacency_matrix()
+    features = g.node_features()
+
+    benchmark(lambda: adj @ features)
+
+
+def _compacted(graph):
+    # (copying or pickling the graph would merge its pending additions)
+    compacted = StellarGraph._from_delta(graph._delta, graph.is_directed())
+    compacted.compact()
+    return compacted
+
+
+def _assert_same_queries(graph, expected):
+    assert graph.number_of_nodes() == expected.number_of_nodes()
+    assert graph.number_of_edges() == expected.number_of_edges()
+    assert graph.node_types == expected.node_types
+    pd.testing.assert_index_equal(graph.edge_types, expected.edge_types)
+    pd.testing.assert_index_equal(graph.nodes(), expected.nodes())
+
+    for node_type in expected.node_types:
+        np.testing.assert_array_equal(
+            graph.nodes(node_type=node_type), expected.nodes(node_type=node_type)
+        )
+        assert graph.nodes(node_type=node_type, use_ilocs=True) == expected.nodes(
+            node_type=node_type, use_ilocs=True
+        )
+
+    for use_ilocs in [False, True]:
+        for actual_array, expected_array in zip(
+            graph.edge_arrays(True, True, use_ilocs=use_ilocs),
+            expected.edge_arrays(True, True, use_ilocs=use_ilocs),
+        ):
+            np.testing.assert_array_equal(actual_array, expected_array)
+        edges, weights = graph.edges(True, True, use_ilocs=use_ilocs)
+        expected_edges, expected_weights = expected.edges(
+            True, True, use_ilocs=use_ilocs
+        )
+        assert edges == expected_edges
+        np.testing.assert_array_equal(weights, expected_weights)
+
+    nodes = list(expected.nodes())
+    ilocs = np.arange(len(nodes))
+    np.testing.assert_array_equal(
+        graph.node_ids_to_ilocs(nodes), expected.node_ids_to_ilocs(nodes)
+    )
+    np.testing.assert_array_equal(
+        graph.node_ilocs_to_ids(ilocs), expected.node_ilocs_to_ids(ilocs)
+    )
+    np.testing.assert_array_equal(graph.node_type(nodes), expected.node_type(nodes))
+    np.testing.assert_array_equal(
+        graph.node_type(ilocs, use_ilocs=True),
+        expected.node_type(ilocs, use_ilocs=True),
+    )
+
+    for iloc, node in enumerate(nodes + ["unknown"]):
+        assert graph.has_node(node) == expected.has_node(node)
+        for method in ["neighbors", "in_nodes", "out_nodes"]:
+            for edge_types in [None, ["R"], ["F", "S"]]:
+                actual = getattr(graph, method)
+                wanted = getattr(expected, method)
+                assert actual(
+                    node, include_edge_weight=True, edge_types=edge_types
+                ) == wanted(node, include_edge_weight=True, edge_types=edge_types)
+                assert actual(iloc, edge_types=edge_types, use_ilocs=True) == wanted(
+                    iloc, edge_types=edge_types, use_ilocs=True
+                )
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_with_added_edges(is_directed):
+    g = example_hin_1(is_directed=is_directed, reverse_order=True)
+    # compute some indices, so that they're merged rather than rebuilt
+    g.neighbors(0)
+    g.in_nodes(0)
+    g.out_nodes(0)
+
+    new_a = pd.DataFrame(index=[10])
+    new_c = pd.DataFrame(index=["c"])
+    new_r = pd.DataFrame(
+        {"source": [0, 6, 10], "target": [6, 6, "c"]}, index=[200, 201, 202]
+    )
+    new_s = pd.DataFrame({"source": [3], "target": [2], "w": [3.5]}, index=[300])
+    added = g.with_added_edges(
+        {"R": new_r, "S": new_s},
+        {"A": new_a, "C": new_c},
+        edge_weight_column="w",
+        compact_threshold=None,
+    )
+
+    assert type(added) == type(g)
+    # the original is unchanged
+    assert g.number_of_nodes() == 7
+    assert g.number_of_edges() == 6
+    assert added.number_of_nodes() == 9
+    assert added.number_of_edges() == 10
+    assert list(added.edge_types) == ["F", "R", "S"]
+    assert added.node_type(10) == "A"
+    assert added.node_ids_to_ilocs([10, "c", 4]).tolist() == [4, 8, 7]
+    assert added._edge_weights(3, 2) == [3.5]
+
+    # the same as a graph constructed from all of the edges
+    sources, targets, types, weights = added.edge_arrays(True, True)
+    edges = pd.DataFrame(
+        {"source": sources, "target": targets, "type": types, "weight": weights},
+        index=added._edges.ids.pandas_index,
+    )
+    nodes = {
+        type_: pd.DataFrame(index=added.nodes(node_type=type_))
+        for type_ in added.node_types
+    }
+    cls = StellarDiGraph if is_directed else StellarGraph
+    expected = cls(nodes, edges, edge_type_column="type")
+    assert set(added.edges(include_edge_type=True)) == set(
+        expected.edges(include_edge_type=True)
+    )
+    for node in added.nodes():
+        assert added.neighbors(node) == expected.neighbors(node)
+        assert added.in_nodes(node) == expected.in_nodes(node)
+        assert added.out_nodes(node) == expected.out_nodes(node)
+
+    # (accessing `_edges` merges the pending additions)
+    assert added._delta is None
+    assert added._edges.weights.dtype == g._edges.weights.dtype
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("compute_indices", [False, True])
+def test_with_added_edges_pending(is_directed, compute_indices):
+    rng = np.random.default_rng(123)
+    g = example_hin_1(is_directed=is_directed, self_loop=True)
+    if compute_indices:
+        g.neighbors(0)
+        g.in_nodes(0)
+        g.out_nodes(0)
+
+    nodes = list(g.nodes())
+    next_edge = 1000
+    for step in range(6):
+        new_nodes = {
+            type_: pd.DataFrame(index=[f"{type_}{step}-{i}" for i in range(2)])
+            for type_ in rng.choice(["A", "B", "C"], size=2, replace=False)
+        }
+        nodes.extend(id_ for df in new_nodes.values() for id_ in df.index)
+
+        count = int(rng.integers(0, 8))
+        new_edges = pd.DataFrame(
+            {
+                "source": rng.choice(np.array(nodes, dtype=object), count),
+                "target": rng.choice(np.array(nodes, dtype=object), count),
+                "weight": rng.random(count),
+                "type": rng.choice(["R", "F", "S"], count),
+            },
+            index=range(next_edge, next_edge + count),
+        )
+        next_edge += count
+
+        g = g.with_added_edges(
+            new_edges, new_nodes, edge_type_column="type", compact_threshold=None
+        )
+
+        # the queries read through the pending additions, without merging them
+        _assert_same_queries(g, _compacted(g))
+        assert "_edges" not in g.__dict__
+
+    assert len(g._delta.batches) > 1
+
+
+def test_with_added_edges_features():
+    g = example_hin_1(feature_sizes={"A": 2, "B": 3})
+    new_a = pd.DataFrame([[7, 8]], index=[10])
+    new_c = pd.DataFrame([[1, 2, 3, 4]], index=[11])
+    edges = pd.DataFrame({"source": [10], "target": [11]}, index=[200])
+
+    added = g.with_added_edges(edges, {"A": new_a, "C": new_c}, compact_threshold=None)
+    np.testing.assert_array_equal(added.node_features([10], node_type="A"), [[7, 8]])
+    np.testing.assert_array_equal(added.node_features([11]), [[1, 2, 3, 4]])
+    np.testing.assert_array_equal(added.node_features([4]), g.node_features([4]))
+    np.testing.assert_array_equal(
+        added.node_features(node_type="A"),
+        np.vstack([g.node_features([0, 1, 2, 3]), [[7, 8]]]),
+    )
+    assert added.node_features(node_type="A").dtype == g.node_features([0]).dtype
+
+    with pytest.raises(
+        ValueError,
+        match=r"nodes: expected 2 features for nodes of type 'A' \(as for the existing nodes of that type\), found 1",
+    ):
+        g.with_added_edges(nodes={"A": pd.DataFrame([[1]], index=[12])})
+
+
+def test_with_added_edges_compaction():
+    g = example_hin_1()
+    new_edges = pd.DataFrame({"source": [0], "target": [1]}, index=[200])
+
+    # 1 new edge is less than 10% of the 13 nodes and edges
+    pending = g.with_added_edges(new_edges)
+    assert pending._delta is not None
+    compacted = g.with_added_edges(new_edges, compact_threshold=0.05)
+    assert compacted._delta is None
+
+    # pending additions are merged when pickling, or explicitly
+    unpickled = pickle.loads(pickle.dumps(pending))
+    assert unpickled._delta is None
+    assert unpickled.edges() == compacted.edges()
+
+    assert pending.number_of_edges() == 7
+    pending.compact()
+    assert pending._delta is None
+    assert pending.edges() == compacted.edges()
+
+    assert g.with_added_edges() is not g
+    assert g.with_added_edges().edges() == g.edges()
+
+
+def test_with_added_edges_invalid():
+    g = example_hin_1().with_added_edges(
+        pd.DataFrame({"source": [0], "target": [7]}, index=[200]),
+        pd.DataFrame(index=[7]),
+        compact_threshold=None,
+    )
+
+    for existing in [100, 200]:
+        with pytest.raises(
+            ValueError,
+            match=f"edges: expected IDs to appear once, found some that appeared more: {existing}",
+        ):
+            g.with_added_edges(
+                pd.DataFrame({"source": [0], "target": [4]}, index=[existing])
+            )
+
+    with pytest.raises(ValueError, match="found some missing: 123"):
+        g.with_added_edges(pd.DataFrame({"source": [0], "target": [123]}, index=[1000]))
+
+    for existing in [3, 7]:
+        with pytest.raises(
+            ValueError,
+            match=f"nodes: expected IDs to appear once, found some that appeared more: {existing}",
+        ):
+            g.with_added_edges(nodes=pd.DataFrame(index=[existing]))
+
+
 @pytest.mark.parametrize("is_directed", [False, True])
 def test_connected_components(is_directed):
     nodes = pd.DataFrame(index=range(6))
@@ -1838,6 +2680,74 @@ def test_node_degrees(use_ilocs):
         assert expected == degrees
 
 
+def test_node_degree_array():
+    g = example_hin_1(is_directed=True, self_loop=True, reverse_order=True)
+
+    def by_id(degrees):
+        assert len(degrees) == g.number_of_nodes()
+        return dict(zip(g.nodes(), degrees))
+
+    # the self loops on node 5 are only counted once each for "both"
+    assert by_id(g.node_degree_array()) == {
+        0: 1,
+        1: 2,
+        2: 1,
+        3: 1,
+        4: 4,
+        5: 6,
+        6: 0,
+    }
+    assert by_id(g.node_degree_array("in")) == {
+        0: 1,
+        1: 0,
+        2: 0,
+        3: 1,
+        4: 2,
+        5: 5,
+        6: 0,
+    }
+    assert by_id(g.node_degree_array("out")) == {
+        0: 0,
+        1: 2,
+        2: 1,
+        3: 0,
+        4: 2,
+        5: 4,
+        6: 0,
+    }
+    assert by_id(g.node_degree_array(edge_types=["F"])) == {
+        0: 0,
+        1: 0,
+        2: 0,
+        3: 0,
+        4: 1,
+        5: 3,
+        6: 0,
+    }
+    # F edges have weights 10, 11, 12, and R edges have the default weight 1
+    weighted = by_id(g.node_degree_array("out", weighted=True))
+    assert weighted[4] == 1 + 10
+    assert weighted[5] == 2 + 11 + 12
+
+    degrees = g.node_degree_array()
+    assert g.node_degree_array() is degrees
+    assert not degrees.flags.writeable
+
+    with pytest.raises(
+        ValueError, match="direction: expected 'in', 'out' or 'both', found 'all'"
+    ):
+        g.node_degree_array("all")
+
+
+def test_node_degree_array_undirected():
+    g = example_hin_1(reverse_order=True)
+    degrees = g.node_degree_array()
+    np.testing.assert_array_equal(g.node_degree_array("in"), degrees)
+
+    expected = g.node_degrees()
+    assert dict(zip(g.nodes(), degrees)) == {node: expected[node] for node in g.nodes()}
+
+
 def test_unique_node_type():
     one_type = example_graph_random(node_types=1, edge_types=10)
 
@@ -1866,3 +2776,464 @@ def test_bulk_node_types():
     node_types = sg.node_type(node_ilocs, use_ilocs=True)
     assert (node_types[:4] == "A").all()
     assert (node_types[4:] == "B").all()
+
+
+def assert_graphs_equal(actual, expected):
+    assert type(actual) == type(expected)
+    assert actual.is_directed() == expected.is_directed()
+
+    assert list(actual.nodes()) == list(expected.nodes())
+    assert actual.node_types == expected.node_types
+    for node_type in expected.node_types:
+        assert list(actual.nodes(node_type=node_type)) == list(
+            expected.nodes(node_type=node_type)
+        )
+        np.testing.assert_array_equal(
+            actual.node_features(node_type=node_type),
+            expected.node_features(node_type=node_type),
+        )
+
+    assert list(actual.edge_types) == list(expected.edge_types)
+    act_edges, act_weights = actual.edges(
+        include_edge_type=True, include_edge_weight=True
+    )
+    exp_edges, exp_weights = expected.edges(
+        include_edge_type=True, include_edge_weight=True
+    )
+    assert act_edges == exp_edges
+    np.testing.assert_array_equal(act_weights, exp_weights)
+
+    for node in expected.nodes():
+        assert actual.neighbors(node, include_edge_weight=True) == expected.neighbors(
+            node, include_edge_weight=True
+        )
+        assert actual.in_nodes(node) == expected.in_nodes(node)
+        assert actual.out_nodes(node) == expected.out_nodes(node)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_save_load(tmp_path, is_directed, mmap):
+    g = example_hin_1(
+        feature_sizes={"A": 3, "B": 0}, is_directed=is_directed, self_loop=True
+    )
+    path = tmp_path / "graph"
+    g.save(path)
+
+    loaded = StellarGraph.load(path, mmap=mmap)
+    assert_graphs_equal(loaded, g)
+    assert isinstance(loaded.node_features(node_type="A"), np.memmap) == mmap
+
+
+def test_save_load_string_ids(tmp_path):
+    nodes = pd.DataFrame(np.arange(6).reshape(3, 2), index=["a", "bb", "ccc"])
+    edges = pd.DataFrame(
+        {"source": ["a", "bb"], "target": ["bb", "ccc"], "weight": [0.5, 2.0]},
+        index=["x", "y"],
+    )
+    g = StellarDiGraph(nodes, edges)
+    g.save(tmp_path)
+
+    loaded = StellarGraph.load(tmp_path)
+    assert_graphs_equal(loaded, g)
+    assert loaded.node_ids_to_ilocs(["ccc", "a"]).tolist() == [2, 0]
+
+
+def test_save_load_object_ids(tmp_path):
+    # IDs of mixed types are saved as Python objects, which need unpickling
+    g = StellarGraph(
+        pd.DataFrame(index=[1, "a"]), pd.DataFrame({"source": [1], "target": ["a"]})
+    )
+    g.save(tmp_path)
+
+    with pytest.raises(
+        ValueError, match="allow_pickle: the array in .* contains Python objects"
+    ):
+        StellarGraph.load(tmp_path)
+
+    loaded = StellarGraph.load(tmp_path, allow_pickle=True)
+    assert_graphs_equal(loaded, g)
+
+
+def test_save_interrupted(tmp_path, monkeypatch):
+    g = example_hin_1()
+    g.save(tmp_path)
+
+    # an interrupted save over an existing graph leaves no loadable (inconsistent) graph
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt()
+
+    with monkeypatch.context() as m:
+        m.setattr(np, "save", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            example_hin_1(is_directed=True).save(tmp_path)
+
+    with pytest.raises(
+        ValueError, match="expected a directory containing a saved graph"
+    ):
+        StellarGraph.load(tmp_path)
+
+
+def test_save_load_empty(tmp_path):
+    g = StellarGraph()
+    g.save(tmp_path)
+    loaded = StellarGraph.load(tmp_path)
+
+    assert loaded.number_of_nodes() == 0
+    assert loaded.number_of_edges() == 0
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_to_shared(is_directed):
+    g = example_hin_1(feature_sizes={"A": 3, "B": 2}, is_directed=is_directed)
+    shared = g.to_shared()
+    path = shared._shared_path
+
+    assert_graphs_equal(shared, g)
+    # the arrays are all memory-mapped, including the edge indices, which are computed before
+    # sharing
+    usage = shared.memory_usage()
+    assert usage["node features"].sum() == 0
+    assert usage["edges"].drop(["ids", "types"]).sum() == 0
+    assert usage["adjacency index", "ins and outs"] == 0
+    assert shared._edges._edges_index is not None
+
+    # pickling only includes the location of the saved graph, not the arrays
+    pickled = pickle.dumps(shared)
+    assert len(pickled) < 1000
+    unpickled = pickle.loads(pickled)
+    assert type(unpickled) is type(g)
+    assert_graphs_equal(unpickled, g)
+    assert isinstance(unpickled.node_features(node_type="A"), np.memmap)
+
+    # only the graph returned by `to_shared` owns the directory
+    del unpickled
+    gc.collect()
+    assert os.path.isdir(path)
+    del shared
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_to_shared_path(tmp_path):
+    g = example_hin_1()
+    shared = g.to_shared(tmp_path / "graph")
+    assert_graphs_equal(pickle.loads(pickle.dumps(shared)), g)
+
+    del shared
+    gc.collect()
+    assert (tmp_path / "graph").is_dir()
+
+    # graphs that aren't shared are pickled in full, as before
+    assert_graphs_equal(pickle.loads(pickle.dumps(g)), g)
+
+
+def _unpickle_old(obj, removed=(), **replaced):
+    state = {name: value for name, value in obj.__dict__.items() if name not in removed}
+    state.update(replaced)
+    unpickled = type(obj).__new__(type(obj))
+    unpickled.__setstate__(state)
+    return unpickled
+
+
+def test_unpickle_old_version():
+    # graphs pickled by older versions don't have any of the lazily-initialised attributes, store
+    # features as plain arrays, and have adjacency dicts rather than indices
+    g = example_hin_1(feature_sizes={"A": 2, "B": 3}, is_directed=True)
+    old_ids = _unpickle_old(g._nodes._id_index, ["_ids", "_min_id", "_lookup"])
+    nodes = _unpickle_old(
+        g._nodes,
+        _id_index=old_ids,
+        _features={
+            type_name: store.to_array()
+            for type_name, store in g._nodes._features.items()
+        },
+    )
+    edges = _unpickle_old(
+        g._edges,
+        [
+            "_edges_index",
+            "_edges_in_index",
+            "_edges_out_index",
+            "_typed_indices",
+            "_degrees",
+            "_pair_indices",
+        ],
+        _edges_dict={},
+        _edges_in_dict={},
+        _edges_out_dict={},
+        _empty_ilocs=np.array([], dtype=np.uint8),
+    )
+    assert not hasattr(edges, "_edges_dict")
+
+    old = type(g).__new__(type(g))
+    old.__setstate__({"_nodes": nodes, "_edges": edges, "_is_directed": g._is_directed})
+
+    assert_graphs_equal(old, g)
+    np.testing.assert_array_equal(old.node_ids_to_ilocs([6, 0, 3]), [6, 0, 3])
+    np.testing.assert_array_equal(old.node_features([3, 1]), g.node_features([3, 1]))
+    np.testing.assert_array_equal(
+        old.node_features(node_type="B"), g.node_features(node_type="B")
+    )
+    assert old.node_degrees() == g.node_degrees()
+    for node in g.nodes():
+        assert old.out_nodes(node, edge_types=["R"]) == g.out_nodes(
+            node, edge_types=["R"]
+        )
+        assert old.in_nodes(node) == g.in_nodes(node)
+    np.testing.assert_array_equal(
+        old.to_adjacency_matrix().todense(), g.to_adjacency_matrix().todense()
+    )
+    assert_graphs_equal(pickle.loads(pickle.dumps(old)), g)
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_from_arrays(is_directed):
+    a_features = np.arange(6, dtype=np.float32).reshape(3, 2)
+    edge_types = np.array(["y", "x", "y", "x", "x"])
+    weights = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    sources = np.array(["a0", "a1", "b0", "a2", "b1"])
+    targets = np.array(["b0", "b1", "a0", "a2", "b0"])
+
+    g = StellarGraph.from_arrays(
+        node_ids={"b": np.array(["b0", "b1"]), "a": np.array(["a0", "a1", "a2"])},
+        node_features_by_type={"a": a_features},
+        sources=sources,
+        targets=targets,
+        weights=weights,
+        edge_types=edge_types,
+        is_directed=is_directed,
+    )
+
+    edges = pd.DataFrame(
+        {"source": sources, "target": targets, "weight": weights, "type": edge_types}
+    )
+    cls = StellarDiGraph if is_directed else StellarGraph
+    expected = cls(
+        {
+            "a": pd.DataFrame(a_features, index=["a0", "a1", "a2"]),
+            "b": pd.DataFrame(index=["b0", "b1"]),
+        },
+        edges,
+        edge_type_column="type",
+    )
+    assert_graphs_equal(g, expected)
+    # edges are grouped by type, and the default IDs are their positions in the input
+    assert list(g._edges.ids.pandas_index) == [1, 3, 4, 0, 2]
+
+    # the same graph, from ilocs
+    from_ilocs = StellarGraph.from_arrays(
+        node_ids={"b": np.array(["b0", "b1"]), "a": np.array(["a0", "a1", "a2"])},
+        node_features_by_type={"a": a_features},
+        sources=g.node_ids_to_ilocs(sources),
+        targets=g.node_ids_to_ilocs(targets),
+        weights=weights,
+        edge_types=edge_types,
+        is_directed=is_directed,
+        use_ilocs=True,
+    )
+    assert_graphs_equal(from_ilocs, expected)
+
+
+def test_from_arrays_homogeneous():
+    features = np.random.random((4, 3)).astype(np.float32)
+    sources = np.array([0, 1, 2], dtype=np.uint8)
+    targets = np.array([1, 2, 3], dtype=np.uint8)
+    weights = np.array([0.5, 0.25, 2.0])
+    edge_ids = np.array([10, 20, 30])
+
+    g = StellarGraph.from_arrays(
+        np.arange(4),
+        features,
+        sources,
+        targets,
+        weights,
+        edge_ids=edge_ids,
+        use_ilocs=True,
+    )
+
+    expected = StellarGraph(
+        pd.DataFrame(features),
+        pd.DataFrame(
+            {"source": sources, "target": targets, "weight": weights}, index=edge_ids
+        ),
+    )
+    assert_graphs_equal(g, expected)
+    assert list(g.edges(include_edge_weight=True)[1]) == [0.5, 0.25, 2.0]
+    assert list(g._edges.ids.pandas_index) == [10, 20, 30]
+
+    # arrays with the right type and order are used directly
+    assert g._nodes.features_of_type("default") is features
+    assert g._edges.sources is sources
+    assert g._edges.targets is targets
+    assert g._edges.weights is weights
+
+
+def test_from_arrays_infer_nodes():
+    g = StellarGraph.from_arrays(
+        sources=np.array(["a", "b", "c"]), targets=np.array(["b", "d", "a"])
+    )
+    assert list(g.nodes()) == ["a", "b", "c", "d"]
+    assert g.edges() == [("a", "b"), ("b", "d"), ("c", "a")]
+    assert g.node_feature_sizes() == {"default": 0}
+
+    empty = StellarGraph.from_arrays()
+    assert empty.number_of_nodes() == 0
+    assert empty.number_of_edges() == 0
+
+
+def test_from_arrays_invalid():
+    node_ids = np.array([0, 1, 2])
+    sources = np.array([0, 1])
+    targets = np.array([1, 2])
+
+    with pytest.raises(
+        ValueError, match="targets: expected all source and target .*: 3"
+    ):
+        StellarGraph.from_arrays(node_ids, None, sources, np.array([1, 3]))
+
+    with pytest.raises(ValueError, match="targets: expected one value per edge"):
+        StellarGraph.from_arrays(node_ids, None, sources, np.array([1]))
+
+    with pytest.raises(ValueError, match="weights: expected one value per edge"):
+        StellarGraph.from_arrays(node_ids, None, sources, targets, np.array([1.0]))
+
+    with pytest.raises(TypeError, match="weights: expected a numeric array"):
+        StellarGraph.from_arrays(node_ids, None, sources, targets, np.array(["x", "y"]))
+
+    with pytest.raises(ValueError, match="sources: expected a 1D array"):
+        StellarGraph.from_arrays(node_ids, None, sources.reshape(1, 2), targets)
+
+    with pytest.raises(ValueError, match="sources, targets: expected both or neither"):
+        StellarGraph.from_arrays(node_ids, None, sources)
+
+    with pytest.raises(
+        ValueError, match=r"sources: expected ilocs in the range \[0, 3\)"
+    ):
+        StellarGraph.from_arrays(
+            node_ids, None, np.array([0, 3]), targets, use_ilocs=True
+        )
+
+    with pytest.raises(TypeError, match="sources: expected an integer array of ilocs"):
+        StellarGraph.from_arrays(
+            node_ids, None, np.array([0.0, 1.0]), targets, use_ilocs=True
+        )
+
+    with pytest.raises(ValueError, match="node_ids: expected node IDs when"):
+        StellarGraph.from_arrays(None, None, sources, targets, use_ilocs=True)
+
+    with pytest.raises(
+        ValueError, match="node_features: expected feature types .*: 'x'"
+    ):
+        StellarGraph.from_arrays({"a": node_ids}, {"x": np.zeros((3, 1))})
+
+    with pytest.raises(
+        ValueError, match="features\\['default'\\]: expected one feature per ID"
+    ):
+        StellarGraph.from_arrays(node_ids, np.zeros((2, 1)))
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_from_files(tmp_path, is_directed, chunk_size):
+    a_nodes = pd.DataFrame(
+        {"x": [1.0, 2.0, 3.0], "y": [4.0, 5.0, 6.0]}, index=[0, 1, 2]
+    )
+    b_nodes = pd.DataFrame(index=[3, 4])
+    edges = pd.DataFrame(
+        {
+            "source": [0, 1, 3, 2, 4],
+            "target": [3, 4, 0, 2, 1],
+            "weight": [0.5, 1.5, 2.5, 3.5, 4.5],
+            "type": ["y", "x", "y", "x", "x"],
+            "extra": ["ignored"] * 5,
+        }
+    )
+
+    a_nodes.to_csv(tmp_path / "a.csv", index_label="id", sep="\t")
+    b_nodes.to_csv(tmp_path / "b.csv", index_label="id", sep="\t")
+    edges.iloc[:2].to_csv(tmp_path / "edges-0.csv", index=False, sep="\t")
+    edges.iloc[2:].to_csv(tmp_path / "edges-1.csv", index=False, sep="\t")
+
+    g = StellarGraph.from_files(
+        nodes={"a": tmp_path / "a.csv", "b": str(tmp_path / "b.csv")},
+        edges=[tmp_path / "edges-0.csv", tmp_path / "edges-1.csv"],
+        is_directed=is_directed,
+        edge_type_column="type",
+        chunk_size=chunk_size,
+        csv_options={"sep": "\t"},
+    )
+
+    cls = StellarDiGraph if is_directed else StellarGraph
+    expected = cls(
+        {"a": a_nodes, "b": b_nodes},
+        edges.drop(columns="extra"),
+        edge_type_column="type",
+    )
+    assert_graphs_equal(g, expected)
+    assert g.node_features(node_type="a").dtype == np.float32
+
+
+def test_from_files_infer_nodes(tmp_path):
+    edges = pd.DataFrame(
+        {"src": ["a", "b", "c"], "tgt": ["b", "d", "a"], "name": ["p", "q", "r"]}
+    )
+    edges.to_csv(tmp_path / "edges.csv", index=False)
+
+    g = StellarGraph.from_files(
+        edges={"t": tmp_path / "edges.csv"},
+        source_column="src",
+        target_column="tgt",
+        edge_id_column="name",
+        chunk_size=2,
+    )
+    # in order of first appearance, with sources before targets in each chunk
+    assert list(g.nodes()) == ["a", "b", "d", "c"]
+    assert g.edges(include_edge_type=True) == [
+        ("a", "b", "t"),
+        ("b", "d", "t"),
+        ("c", "a", "t"),
+    ]
+    assert list(g._edges.ids.pandas_index) == ["p", "q", "r"]
+    np.testing.assert_array_equal(g.edges(include_edge_weight=True)[1], 1)
+
+
+def test_from_files_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    nodes = pd.DataFrame({"id": [0, 1, 2], "f": [1.0, 2.0, 3.0]})
+    edges = pd.DataFrame({"source": [0, 1], "target": [1, 2], "weight": [2.0, 3.0]})
+    nodes.to_parquet(tmp_path / "nodes.parquet")
+    edges.to_parquet(tmp_path / "edges.pq")
+
+    g = StellarGraph.from_files(
+        tmp_path / "nodes.parquet", tmp_path / "edges.pq", chunk_size=1
+    )
+    expected = StellarGraph(nodes.set_index("id"), edges)
+    assert_graphs_equal(g, expected)
+
+
+def test_from_files_invalid(tmp_path):
+    pd.DataFrame({"source": [0], "other": [1]}).to_csv(
+        tmp_path / "edges.csv", index=False
+    )
+
+    with pytest.raises(
+        ValueError, match="edges \\(.*edges.csv\\): expected 'source', 'target' columns"
+    ):
+        StellarGraph.from_files(edges=tmp_path / "edges.csv")
+
+    with pytest.raises(ValueError, match="edges: expected a path or list of paths"):
+        StellarGraph.from_files(
+            edges={"x": tmp_path / "edges.csv"}, edge_type_column="type"
+        )
+
+    with pytest.raises(ValueError, match="chunk_size: expected integer"):
+        StellarGraph.from_files(edges=tmp_path / "edges.csv", chunk_size=0)
+
+
+def test_load_missing(tmp_path):
+    with pytest.raises(
+        ValueError, match="expected a directory containing a saved graph"
+    ):
+        StellarGraph.load(tmp_path)
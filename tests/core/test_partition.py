@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from stellargraph.core.partition import edge_cut, partition_nodes
+from ..test_utils.graphs import example_graph, example_graph_local
+
+
+@pytest.mark.parametrize("method", ["label_propagation", "random"])
+@pytest.mark.parametrize("num_parts", [1, 3, 7])
+def test_partition_nodes_balanced(method, num_parts):
+    g = example_graph_local(feature_size=1, n_nodes=500)
+    parts = partition_nodes(g, num_parts, method=method, seed=0)
+
+    assert parts.shape == (500,)
+    sizes = np.bincount(parts)
+    assert len(sizes) == num_parts
+    # within the default 5% imbalance, rounded
+    ideal = 500 / num_parts
+    assert sizes.min() >= np.floor(ideal * 0.95)
+    assert sizes.max() <= np.ceil(ideal * 1.05)
+
+    # deterministic with a seed
+    np.testing.assert_array_equal(
+        partition_nodes(g, num_parts, method=method, seed=0), parts
+    )
+
+
+def test_partition_nodes_exact_sizes():
+    g = example_graph()
+    # too small for any imbalance, so the sizes are exact
+    for num_parts in range(1, g.number_of_nodes() + 1):
+        parts = partition_nodes(g, num_parts, seed=0)
+        sizes = np.bincount(parts, minlength=num_parts)
+        assert sizes.max() - sizes.min() <= 1
+
+
+def test_partition_nodes_edge_cut():
+    g = example_graph_local(feature_size=1, n_nodes=2000)
+    lp = partition_nodes(g, 10, method="label_propagation", seed=0)
+    rand = partition_nodes(g, 10, method="random", seed=0)
+
+    # random parts cut about 90% of the edges, while the ring structure can be cut much less
+    assert edge_cut(g, rand) > 0.8
+    assert edge_cut(g, lp) < 0.1
+
+    assert edge_cut(g, np.zeros(g.number_of_nodes(), dtype=int)) == 0
+
+
+def test_partition_nodes_invalid():
+    g = example_graph()
+
+    with pytest.raises(
+        ValueError,
+        match="method: expected one of 'label_propagation', 'random', found 'metis'",
+    ):
+        partition_nodes(g, 2, method="metis")
+
+    with pytest.raises(
+        ValueError, match=r"num_parts: expected .* number of nodes \(4\), found 5"
+    ):
+        partition_nodes(g, 5)
+
+    with pytest.raises(ValueError, match="num_parts: .* found 0"):
+        partition_nodes(g, 0)
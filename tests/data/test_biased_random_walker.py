@@ -18,6 +18,7 @@ import numpy as np
 import pandas as pd
 import pytest
 import networkx as nx
+from stellargraph.data import explorer
 from stellargraph.data.explorer import BiasedRandomWalk
 from stellargraph.core.graph import StellarGraph
 from ..test_utils.graphs import create_test_graph, example_graph_random
@@ -464,7 +465,8 @@ class TestBiasedRandomWalk(object):
             for node in subgraph:
                 assert node == "self loner"  # all nodes should be the same node
 
-    def test_walk_biases(self):
+    @pytest.mark.parametrize("method", ["exact", "rejection"])
+    def test_walk_biases(self, method):
         # a square with a triangle:
         #   0-3
         #  /| |
@@ -475,7 +477,7 @@ class TestBiasedRandomWalk(object):
             columns=["source", "target"],
         )
         graph = StellarGraph(nodes, edges)
-        biasedrw = BiasedRandomWalk(graph)
+        biasedrw = BiasedRandomWalk(graph, method=method)
 
         # there's 18 total walks of length 4 starting at 0 in `graph`,
         # and the non-tiny transition probabilities are always equal
@@ -546,3 +548,98 @@ class TestBiasedRandomWalk(object):
         length = 5
 
         benchmark(lambda: biasedrw.run(nodes=nodes, n=n, p=p, q=q, length=length))
+
+    @pytest.mark.parametrize("method", ["exact", "rejection"])
+    def test_workers(self, monkeypatch, method):
+        monkeypatch.setattr(explorer, "_ROOTS_PER_SHARD", 7)
+        g = example_graph_random(n_nodes=30, n_edges=60)
+        nodes = list(g.nodes())
+        biasedrw = BiasedRandomWalk(g, n=2, length=5, p=0.5, q=2.0, method=method)
+
+        walks = biasedrw.run(nodes, seed=3, workers=1)
+        assert [w[0] for w in walks] == list(np.repeat(nodes, 2))
+        assert biasedrw.run(nodes, seed=3, workers=3) == walks
+
+    def test_iter_walks(self):
+        g = create_test_graph()
+        nodes = list(g.nodes())
+        biasedrw = BiasedRandomWalk(g, n=2, length=4, p=0.5, q=2.0, seed=3)
+
+        stream = biasedrw.iter_walks(nodes, chunk_size=5)
+        walks = list(stream)
+        assert len(walks) == 2 * len(nodes)
+        assert list(stream) == walks
+
+        # the walks are converted to ilocs, with the (short) walks padded in each chunk
+        iloc_biasedrw = BiasedRandomWalk(g, n=2, length=4, p=0.5, q=2.0, seed=3)
+        iloc_stream = iloc_biasedrw.iter_walks(
+            g.node_ids_to_ilocs(nodes), chunk_size=5, use_ilocs=True
+        )
+        assert [list(g.node_ilocs_to_ids(w)) for w in iloc_stream] == walks
+        for chunk in iloc_stream.chunks():
+            assert chunk.dtype == np.int64
+            assert (chunk[:, 0] != -1).all()
+
+    def test_method_invalid(self):
+        g = create_test_graph()
+        with pytest.raises(
+            ValueError, match="method: expected 'exact' or 'rejection', found 'alias'"
+        ):
+            BiasedRandomWalk(g).run(["0"], n=1, length=2, method="alias")
+
+    @pytest.mark.parametrize("weighted", [False, True])
+    @pytest.mark.parametrize("p, q", [(0.25, 4.0), (4.0, 0.25), (0.5, 0.5)])
+    def test_rejection_distribution(self, weighted, p, q):
+        # the square with a triangle from test_walk_biases, with a multi-edge and a self loop
+        nodes = pd.DataFrame(index=range(5))
+        edges = pd.DataFrame(
+            [(0, 1, 1), (0, 2, 2), (0, 3, 3), (1, 2, 1), (2, 4, 4), (3, 4, 1)]
+            + [(0, 2, 1), (4, 4, 2)],
+            columns=["source", "target", "weight"],
+        )
+        graph = StellarGraph(nodes, edges)
+
+        def weight(a, b):
+            ab = (edges.source == a) & (edges.target == b)
+            ba = (edges.source == b) & (edges.target == a)
+            matching = edges.weight[ab | (ba & (a != b))]
+            return matching.sum() if weighted else len(matching)
+
+        # the exact probability of each (second, third) node of the walks from 0
+        expected = {}
+        for second in range(5):
+            first_step = weight(0, second) / sum(weight(0, x) for x in range(5))
+            unnormalised = {}
+            for third in range(5):
+                if third == 0:
+                    bias = 1 / p
+                elif weight(0, third) > 0:
+                    bias = 1
+                else:
+                    bias = 1 / q
+                unnormalised[third] = weight(second, third) * bias
+
+            total = sum(unnormalised.values())
+            for third, value in unnormalised.items():
+                if first_step > 0 and value > 0:
+                    expected[second, third] = first_step * value / total
+
+        n = 20000
+        walks = BiasedRandomWalk(graph, p=p, q=q, weighted=weighted, seed=42).run(
+            [0], n=n, length=3, method="rejection"
+        )
+        assert all(len(w) == 3 for w in walks)
+        observed = pd.Series([tuple(w[1:]) for w in walks]).value_counts() / n
+
+        assert set(observed.index) == set(expected)
+        for key, probability in expected.items():
+            assert observed[key] == pytest.approx(probability, abs=0.015)
+
+    @pytest.mark.benchmark(group="BiasedRandomWalk large")
+    @pytest.mark.parametrize("method", ["exact", "rejection"])
+    def test_benchmark_biasedrandomwalk_large(self, benchmark, method):
+        g = example_graph_random(n_nodes=1000, n_edges=20000)
+        biasedrw = BiasedRandomWalk(g, p=0.5, q=2.0, method=method)
+        nodes = g.nodes()
+
+        benchmark(lambda: biasedrw.run(nodes=nodes, n=1, length=20, seed=0))
@@ -17,6 +17,7 @@
 import pandas as pd
 import numpy as np
 import pytest
+from stellargraph.data import explorer
 from stellargraph.data.explorer import UniformRandomMetaPathWalk
 from stellargraph.core.graph import StellarGraph
 from ..test_utils.graphs import example_graph_random
@@ -316,6 +317,20 @@ class TestMetaPathWalk(object):
         assert len(run_1) == len(run_2)
         assert all(np.array_equal(w1, w2) for w1, w2 in zip(run_1, run_2))
 
+    def test_workers(self, monkeypatch):
+        monkeypatch.setattr(explorer, "_ROOTS_PER_SHARD", 3)
+        g = create_test_graph()
+        mrw = UniformRandomMetaPathWalk(g)
+        nodes = list(g.nodes())
+        metapaths = [["s", "n", "n", "s"], ["n", "s", "n"], ["n", "n"]]
+
+        walks = mrw.run(nodes, n=2, length=6, metapaths=metapaths, seed=1, workers=1)
+        assert len(walks) > 0
+        assert (
+            mrw.run(nodes, n=2, length=6, metapaths=metapaths, seed=1, workers=2)
+            == walks
+        )
+
     def test_benchmark_uniformrandommetapathwalk(self, benchmark):
         g = example_graph_random(n_nodes=50, n_edges=500, node_types=2)
         mrw = UniformRandomMetaPathWalk(g)
@@ -18,6 +18,7 @@ import pandas as pd
 import pytest
 import numpy as np
 import networkx as nx
+from stellargraph.data import explorer
 from stellargraph.data.explorer import TemporalRandomWalk
 from stellargraph.core.graph import StellarGraph
 
@@ -53,6 +54,15 @@ def test_temporal_walks(temporal_graph):
         assert tuple(walk) in expected
 
 
+def test_workers(temporal_graph, monkeypatch):
+    monkeypatch.setattr(explorer, "_CONTEXT_WINDOWS_PER_SHARD", 4)
+    rw = TemporalRandomWalk(temporal_graph, cw_size=3, max_walk_length=4)
+
+    walks = rw.run(num_cw=19, seed=1, workers=1)
+    assert sum(len(w) - 3 + 1 for w in walks) == 19
+    assert rw.run(num_cw=19, seed=1, workers=2) == walks
+
+
 def test_not_progressing_enough(temporal_graph):
 
     rw = TemporalRandomWalk(temporal_graph)
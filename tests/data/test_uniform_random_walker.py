@@ -16,6 +16,9 @@
 
 import pytest
 import numpy as np
+import pandas as pd
+from stellargraph import StellarGraph
+from stellargraph.data import explorer
 from stellargraph.data.explorer import UniformRandomWalk
 from ..test_utils.graphs import create_test_graph, example_graph_random
 
@@ -238,6 +241,118 @@ class TestUniformRandomWalk(object):
         run_2 = urw_no_params.run(nodes=nodes, n=n, length=length, seed=seed)
         assert np.array_equal(run_1, run_2)
 
+    @pytest.mark.parametrize("is_directed", [False, True])
+    def test_walks_follow_edges(self, is_directed):
+        g = example_graph_random(n_nodes=30, n_edges=60, is_directed=is_directed)
+        urw = UniformRandomWalk(g, n=3, length=10, seed=0)
+
+        nodes = list(g.nodes())
+        walks = urw.run(nodes)
+        assert len(walks) == 3 * len(nodes)
+
+        # edges are followed in either direction, as with neighbors
+        for root, walk in zip(np.repeat(nodes, 3), walks):
+            assert walk[0] == root
+            assert len(walk) in (1, 10)
+            for src, dst in zip(walk, walk[1:]):
+                assert dst in g.neighbors(src)
+
+    def test_use_ilocs(self):
+        g = create_test_graph()
+        urw = UniformRandomWalk(g)
+
+        nodes = ["0", "loner", "self loner", 2]
+        ilocs = g.node_ids_to_ilocs(nodes)
+        walks = urw.run(ilocs, n=2, length=4, seed=1, use_ilocs=True)
+
+        assert isinstance(walks, np.ndarray)
+        assert walks.shape == (8, 4)
+        np.testing.assert_array_equal(walks[:, 0], np.repeat(ilocs, 2))
+
+        # the loner has no edges, so its walks are padded
+        np.testing.assert_array_equal(walks[2:4, 1:], -1)
+        # the self loner only has a self loop
+        np.testing.assert_array_equal(walks[4:6], ilocs[2])
+        assert (walks[[0, 1, 6, 7]] != -1).all()
+
+        # the same as the ID walks, with the padding removed
+        id_walks = urw.run(nodes, n=2, length=4, seed=1)
+        expected = [list(g.node_ilocs_to_ids(w[w != -1])) for w in walks]
+        assert id_walks == expected
+
+    def test_uniform(self):
+        # a star: the walk from the centre chooses each leaf equally often
+        g = StellarGraph(
+            nodes=pd.DataFrame(index=range(5)),
+            edges=pd.DataFrame({"source": [0, 0, 0, 0], "target": [1, 2, 3, 4]}),
+        )
+        urw = UniformRandomWalk(g)
+        walks = urw.run([0], n=4000, length=2, seed=0, use_ilocs=True)
+        counts = np.bincount(walks[:, 1], minlength=5)
+        assert counts[0] == 0
+        np.testing.assert_allclose(counts[1:], 1000, rtol=0.1)
+
+    def test_workers(self, monkeypatch):
+        # use several shards, even for a small graph
+        monkeypatch.setattr(explorer, "_ROOTS_PER_SHARD", 7)
+        g = example_graph_random(n_nodes=30, n_edges=60)
+        nodes = list(g.nodes())
+        urw = UniformRandomWalk(g, n=2, length=5)
+
+        walks = urw.run(nodes, seed=3, workers=1)
+        assert len(walks) == 2 * len(nodes)
+        assert [w[0] for w in walks] == list(np.repeat(nodes, 2))
+
+        # the same regardless of the number of workers
+        for workers in [2, 3]:
+            assert urw.run(nodes, seed=3, workers=workers) == walks
+
+        ilocs = g.node_ids_to_ilocs(nodes)
+        iloc_walks = urw.run(ilocs, seed=3, workers=2, use_ilocs=True)
+        assert [list(g.node_ilocs_to_ids(w[w != -1])) for w in iloc_walks] == walks
+
+        # seeding at construction is enough for reproducibility
+        def run_seeded():
+            return UniformRandomWalk(g, n=2, length=5, seed=4).run(nodes, workers=2)
+
+        assert run_seeded() == run_seeded()
+
+        with pytest.raises(ValueError, match="workers"):
+            urw.run(nodes, workers=0)
+
+    def test_iter_walks(self):
+        g = example_graph_random(n_nodes=30, n_edges=60)
+        nodes = list(g.nodes())
+        urw = UniformRandomWalk(g, n=2, length=5)
+
+        stream = urw.iter_walks(nodes, chunk_size=7, seed=1)
+        walks = list(stream)
+        assert len(walks) == 2 * len(nodes)
+        assert [w[0] for w in walks] == list(np.repeat(nodes, 2))
+        for walk in walks:
+            for src, dst in zip(walk, walk[1:]):
+                assert dst in g.neighbors(src)
+
+        # restartable, with the same walks each pass, generated a chunk at a time
+        assert list(stream) == walks
+        chunks = list(stream.chunks())
+        assert [len(c) for c in chunks] == [14, 14, 14, 14, 4]
+
+        assert list(urw.iter_walks(nodes, chunk_size=7, seed=1, as_str=True)) == [
+            [str(node) for node in walk] for walk in walks
+        ]
+
+        iloc_stream = urw.iter_walks(
+            g.node_ids_to_ilocs(nodes), chunk_size=7, seed=1, use_ilocs=True
+        )
+        iloc_walks = list(iloc_stream)
+        assert all(isinstance(w, np.ndarray) for w in iloc_walks)
+        assert [list(g.node_ilocs_to_ids(w)) for w in iloc_walks] == walks
+        assert all(c.shape == (len(c), 5) for c in iloc_stream.chunks())
+
+        with pytest.raises(ValueError, match="chunk_size"):
+            urw.iter_walks(nodes, chunk_size=0)
+
     def test_benchmark_uniformrandomwalk(self, benchmark):
         g = example_graph_random(n_nodes=100, n_edges=500)
         urw = UniformRandomWalk(g)
@@ -248,3 +363,12 @@ class TestUniformRandomWalk(object):
         length = 5
 
         benchmark(lambda: urw.run(nodes=nodes, n=n, length=length))
+
+    @pytest.mark.benchmark(group="UniformRandomWalk large")
+    @pytest.mark.parametrize("use_ilocs", [False, True])
+    def test_benchmark_uniformrandomwalk_large(self, benchmark, use_ilocs):
+        g = example_graph_random(n_nodes=10000, n_edges=50000)
+        urw = UniformRandomWalk(g)
+
+        nodes = np.arange(10000) if use_ilocs else g.nodes()
+        benchmark(lambda: urw.run(nodes=nodes, n=2, length=20, use_ilocs=use_ilocs))
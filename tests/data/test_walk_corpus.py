@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stellargraph import StellarGraph
+from stellargraph.data import (
+    BiasedRandomWalk,
+    UniformRandomMetaPathWalk,
+    UniformRandomWalk,
+    UnsupervisedSampler,
+    WalkCorpus,
+)
+from stellargraph.mapper import Node2VecLinkGenerator
+from ..test_utils.graphs import example_graph_random
+
+
+def random_graph():
+    # (with some nodes without edges, so that some walks stop early)
+    return example_graph_random(n_nodes=40, n_edges=50)
+
+
+def as_iloc_lists(graph, walks):
+    return [list(graph.node_ids_to_ilocs(walk)) for walk in walks]
+
+
+@pytest.mark.parametrize("walker_cls", [UniformRandomWalk, BiasedRandomWalk])
+def test_cached_corpus(tmp_path, walker_cls):
+    g = random_graph()
+    nodes = list(g.nodes())
+    walker = walker_cls(g, n=2, length=6)
+
+    corpus = walker.cached_corpus(tmp_path, nodes, seed=1)
+    assert isinstance(corpus.walks, np.memmap)
+    assert corpus.walks.shape == (2 * len(nodes), 6)
+    assert len(corpus) == 2 * len(nodes)
+    assert corpus.length == 6
+    assert corpus.metadata["walker"] == walker_cls.__name__
+    assert corpus.metadata["parameters"]["n"] == 2
+    assert corpus.metadata["seed"] == 1
+
+    # the same walks as a run with the same seed
+    expected = as_iloc_lists(g, walker.run(nodes, seed=1, workers=1))
+    assert [list(w) for w in corpus] == expected
+    np.testing.assert_array_equal(corpus.lengths, [len(w) for w in expected])
+    assert (corpus.walks[corpus.lengths < 6, -1] == -1).all()
+
+    assert list(corpus.as_str()) == [[str(i) for i in w] for w in expected]
+
+    loaded = WalkCorpus.load(tmp_path, graph=g)
+    np.testing.assert_array_equal(loaded.walks, corpus.walks)
+    assert loaded.metadata == corpus.metadata
+
+
+def test_cached_corpus_reuse(tmp_path, monkeypatch):
+    g = random_graph()
+    nodes = list(g.nodes())
+    walker = UniformRandomWalk(g, n=2, length=6)
+    corpus = walker.cached_corpus(tmp_path, nodes, seed=1)
+
+    # the same graph, parameters and seed reuse the walks on disk, without walking
+    def fail(*args, **kwargs):
+        raise AssertionError("walked again")
+
+    with monkeypatch.context() as m:
+        m.setattr(walker, "iter_walks", fail)
+        reused = walker.cached_corpus(tmp_path, nodes, seed=1)
+        assert reused.metadata == corpus.metadata
+
+    # (the parameters are compared after resolving the defaults)
+    other_walker = UniformRandomWalk(g, n=3)
+    with monkeypatch.context() as m:
+        m.setattr(other_walker, "iter_walks", fail)
+        reused = other_walker.cached_corpus(tmp_path, nodes, n=2, length=6, seed=1)
+        assert reused.metadata == corpus.metadata
+
+    # anything different makes the cache stale, and so it's regenerated
+    keys = {corpus.metadata["key"]}
+    for roots, kwargs in [
+        (nodes, dict(seed=2)),
+        (nodes, dict(length=5, seed=1)),
+        (nodes[:10], dict(seed=1)),
+    ]:
+        stale = walker.cached_corpus(tmp_path, roots, **kwargs)
+        assert stale.metadata["key"] not in keys
+        keys.add(stale.metadata["key"])
+        assert WalkCorpus.load(tmp_path).metadata == stale.metadata
+        assert len(stale) == 2 * len(roots)
+
+    edges = pd.DataFrame(g.edge_arrays()[:2], index=["source", "target"]).T
+    changed = StellarGraph(pd.DataFrame(index=g.nodes()), edges.iloc[1:])
+    with pytest.raises(ValueError, match="the corpus is stale"):
+        WalkCorpus.load(tmp_path, graph=changed)
+
+    regenerated = UniformRandomWalk(changed, n=2, length=6).cached_corpus(
+        tmp_path, nodes[:10], seed=1
+    )
+    assert (
+        regenerated.metadata["graph_fingerprint"] != stale.metadata["graph_fingerprint"]
+    )
+    WalkCorpus.load(tmp_path, graph=changed)
+
+
+def test_cached_corpus_invalid(tmp_path):
+    g = random_graph()
+    with pytest.raises(ValueError, match="seed"):
+        UniformRandomWalk(g, n=1, length=2).cached_corpus(tmp_path, g.nodes(), seed=-1)
+
+    # only walkers whose walks are described by their parameters can store a corpus
+    assert not hasattr(UniformRandomMetaPathWalk(g), "cached_corpus")
+
+    with pytest.raises(ValueError, match="path: expected a directory"):
+        WalkCorpus.load(tmp_path / "missing")
+
+
+def test_unsupervised_sampler(tmp_path):
+    g = random_graph()
+    corpus = UniformRandomWalk(g, n=2, length=4).cached_corpus(
+        tmp_path, g.nodes(), seed=1
+    )
+    sampler = UnsupervisedSampler(g, walks=corpus, seed=2)
+    batches = sampler.run(batch_size=4)
+
+    pairs = np.concatenate([ids for ids, _ in batches])
+    labels = np.concatenate([labels for _, labels in batches])
+    positive = {tuple(pair) for pair in pairs[labels == 1]}
+    expected = {(w[0], context) for w in corpus for context in w[1:]}
+    assert positive == expected
+    assert len(pairs) == 2 * sum(len(w) - 1 for w in corpus)
+
+    # usable for Node2Vec without walking again
+    flow = Node2VecLinkGenerator(g, batch_size=4).flow(sampler)
+    assert len(flow) == len(batches)
+
+    with pytest.raises(ValueError, match="cannot specify both 'walks' and 'nodes'"):
+        UnsupervisedSampler(g, nodes=list(g.nodes()), walks=corpus)
+
+    with pytest.raises(ValueError, match="cannot specify both 'walks' and 'length'"):
+        UnsupervisedSampler(g, length=4, walks=corpus)
+
+    other = example_graph_random(n_nodes=40, n_edges=51)
+    with pytest.raises(ValueError, match="the corpus is stale"):
+        UnsupervisedSampler(other, walks=corpus)
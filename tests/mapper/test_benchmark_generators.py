@@ -23,7 +23,7 @@ import numpy as np
 import networkx as nx
 import pytest
 
-from ..test_utils.graphs import example_graph_random
+from ..test_utils.graphs import example_graph_random, example_graph_local
 
 
 def example_Graph_2(feature_size=None, n_nodes=100, n_edges=200):
@@ -166,3 +166,25 @@ def test_benchmark_node_generator_large(benchmark):
         return xf, xl
 
     benchmark(read_generator)
+
+
+@pytest.mark.benchmark(group="generator reordered")
+@pytest.mark.parametrize("method", [None, "degree", "rcm", "bfs", "partition"])
+def test_benchmark_node_generator_reordered(benchmark, method):
+    # the input order of this graph has poor locality, so this measures whether reordering it
+    # makes sampling and gathering the features of the sampled nodes faster
+    G = example_graph_local(256, 100000)
+    if method is not None:
+        G = G.reorder(method, seed=123)
+
+    nodes_to_sample = np.random.RandomState(0).choice(G.nodes(), size=2000)
+    generator = GraphSAGENodeGenerator(G, batch_size=100, num_samples=[10, 5], seed=1)
+
+    def read_generator():
+        gen = generator.flow(nodes_to_sample)
+
+        for ii in range(len(gen)):
+            xf, xl = gen[ii]
+        return xf, xl
+
+    benchmark(read_generator)
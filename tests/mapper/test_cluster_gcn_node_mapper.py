@@ -20,7 +20,7 @@ import pandas as pd
 import numpy as np
 import pytest
 
-from ..test_utils.graphs import example_graph_random
+from ..test_utils.graphs import example_graph_local, example_graph_random
 
 
 # FIXME (#535): Consider using graph fixtures
@@ -205,3 +205,28 @@ def test_benchmark_ClusterGCN_generator(benchmark, q):
 
     # iterate over all the batches
     benchmark(lambda: list(seq))
+
+
+@pytest.mark.parametrize("partition", ["random", "label_propagation"])
+def test_ClusterNodeGenerator_partition(partition):
+    G = example_graph_random(feature_size=2, n_nodes=100, n_edges=300)
+
+    generator = ClusterNodeGenerator(G, clusters=4, partition=partition, seed=0)
+    assert len(generator.clusters) == 4
+    # balanced, within the imbalance allowed by label propagation
+    assert all(23 <= len(c) <= 27 for c in generator.clusters)
+    assert sorted(n for c in generator.clusters for n in c) == sorted(G.nodes())
+
+    with pytest.raises(ValueError, match="method: expected one of"):
+        ClusterNodeGenerator(G, clusters=4, partition="metis")
+
+
+@pytest.mark.benchmark(group="ClusterGCN partition")
+@pytest.mark.parametrize("partition", ["random", "label_propagation"])
+def test_benchmark_ClusterGCN_partition(benchmark, partition):
+    G = example_graph_local(feature_size=1, n_nodes=20000)
+
+    generator = benchmark(
+        lambda: ClusterNodeGenerator(G, clusters=20, partition=partition, seed=0)
+    )
+    assert generator.k == 20
@@ -24,6 +24,7 @@ from stellargraph.mapper import *
 
 import networkx as nx
 import numpy as np
+import pickle
 import random
 import pytest
 import pandas as pd
@@ -225,6 +226,30 @@ def test_nodemapper_shuffle(shuffle):
         assert False in comparison_results
 
 
+@pytest.mark.parametrize("seed", [None, 123])
+def test_nodemapper_pickle(seed):
+    G = example_graph_random(n_nodes=50, n_edges=200, feature_size=4).to_shared()
+    seq = GraphSAGENodeGenerator(G, batch_size=5, num_samples=[2, 2], seed=seed).flow(
+        G.nodes(), shuffle=True, seed=seed
+    )
+    # create some samplers before pickling
+    seq[0]
+
+    pickled = pickle.dumps(seq)
+    # the shared graph is only referenced, not copied
+    assert len(pickled) < 20000
+    unpickled = pickle.loads(pickled)
+
+    assert len(unpickled) == len(seq)
+    for i in range(len(seq)):
+        expected, _ = seq[i]
+        actual, _ = unpickled[i]
+        if seed is not None:
+            # the random states are copied, so the samples match
+            for e, a in zip(expected, actual):
+                np.testing.assert_array_equal(e, a)
+
+
 def test_nodemapper_with_labels():
     n_feat = 4
     n_batch = 2
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from stellargraph import StellarGraph, StellarDiGraph, analytics
+from .test_utils.graphs import example_graph_random, petersen_graph, weighted_hin
+
+
+def random_graph(is_directed=False):
+    return example_graph_random(
+        feature_size=1, n_nodes=60, n_edges=200, is_directed=is_directed
+    )
+
+
+def simple_nx(graph):
+    # the simple undirected graph, as used by the NetworkX structural functions
+    nxg = nx.Graph(graph.to_networkx())
+    nxg.remove_edges_from(list(nx.selfloop_edges(nxg)))
+    return nxg
+
+
+def by_iloc(graph, values):
+    return np.array([values[node] for node in graph.nodes()])
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_pagerank(is_directed, weighted):
+    g = random_graph(is_directed)
+    if weighted:
+        sources, targets, _, _ = g.edge_arrays()
+        edges = pd.DataFrame({"source": sources, "target": targets})
+        edges["weight"] = np.random.RandomState(0).uniform(0.1, 2, size=len(edges))
+        cls = StellarDiGraph if is_directed else StellarGraph
+        g = cls(pd.DataFrame(index=g.nodes()), edges)
+
+    ranks = analytics.pagerank(g, weighted=weighted, tol=1e-10)
+    assert ranks.sum() == pytest.approx(1)
+
+    # NetworkX sums the weights of multiple edges, as here
+    expected = nx.pagerank(
+        g.to_networkx(), weight="weight" if weighted else None, tol=1e-10
+    )
+    np.testing.assert_allclose(ranks, by_iloc(g, expected), rtol=1e-6)
+
+
+def test_pagerank_invalid(petersen_graph):
+    with pytest.raises(TypeError, match="graph: expected StellarGraph, found Graph"):
+        analytics.pagerank(nx.Graph())
+
+    with pytest.raises(
+        ValueError, match=r"damping: expected a value in \[0, 1\], found 2"
+    ):
+        analytics.pagerank(petersen_graph, damping=2)
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_structural(is_directed):
+    g = random_graph(is_directed)
+    nxg = simple_nx(g)
+
+    np.testing.assert_array_equal(
+        analytics.core_number(g), by_iloc(g, nx.core_number(nxg))
+    )
+    np.testing.assert_array_equal(analytics.triangles(g), by_iloc(g, nx.triangles(nxg)))
+    np.testing.assert_allclose(analytics.clustering(g), by_iloc(g, nx.clustering(nxg)))
+
+
+def test_structural_petersen(petersen_graph):
+    g = petersen_graph
+    # every node is in the 3-core, and there are no triangles
+    np.testing.assert_array_equal(analytics.core_number(g), 3)
+    np.testing.assert_array_equal(analytics.triangles(g), 0)
+    np.testing.assert_array_equal(analytics.clustering(g), 0)
+
+
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_bfs_distances(is_directed):
+    g = random_graph(is_directed)
+    nxg = g.to_networkx()
+    sources = list(g.nodes()[:3])
+
+    distances = analytics.bfs_distances(g, sources)
+    assert distances.shape == (3, g.number_of_nodes())
+
+    for source, row in zip(sources, distances):
+        lengths = nx.single_source_shortest_path_length(nxg, source)
+        expected = by_iloc(g, {n: lengths.get(n, np.inf) for n in g.nodes()})
+        np.testing.assert_array_equal(row, expected)
+
+    np.testing.assert_array_equal(
+        analytics.bfs_distances(g, g.node_ids_to_ilocs(sources), use_ilocs=True),
+        distances,
+    )
+
+
+def test_weighted_degree(weighted_hin):
+    g = weighted_hin
+    np.testing.assert_array_equal(
+        analytics.weighted_degree(g), g.node_degree_array(weighted=True)
+    )
+
+
+def test_as_node_features(petersen_graph):
+    g = petersen_graph
+    features = analytics.as_node_features(
+        g, pagerank=analytics.pagerank(g), core=analytics.core_number(g)
+    )
+    assert list(features.columns) == ["pagerank", "core"]
+    pd.testing.assert_index_equal(features.index, g.nodes())
+
+    # usable directly as node features
+    edges = pd.DataFrame(g.edge_arrays()[:2], index=["source", "target"]).T
+    with_features = StellarGraph(features, edges)
+    np.testing.assert_allclose(with_features.node_features(), features.to_numpy())
+
+    with pytest.raises(
+        ValueError, match=r"core: expected one value per node \(10\), found 2"
+    ):
+        analytics.as_node_features(g, core=[1, 2])
+
+
+@pytest.mark.benchmark(group="analytics")
+@pytest.mark.parametrize(
+    "function", ["pagerank", "core_number", "triangles", "clustering"]
+)
+def test_benchmark_analytics(benchmark, function):
+    g = example_graph_random(feature_size=1, n_nodes=10000, n_edges=100000)
+    benchmark(lambda: getattr(analytics, function)(g))
@@ -16,6 +16,8 @@
 
 from stellargraph.random import SeededPerBatch
 import numpy as np
+import pickle
+import pytest
 
 
 def test_seeded_per_batch():
@@ -36,3 +38,16 @@ def test_seeded_per_batch():
         return tuple(batches)
 
     assert len({get_batches(batch_nums) for batch_nums in batch_nums_perms}) == 1
+
+
+@pytest.mark.parametrize("seed", [None, 0])
+def test_seeded_per_batch_pickle(seed):
+    s = SeededPerBatch(create_with_seed=np.random.RandomState, seed=seed)
+    s[0]
+
+    unpickled = pickle.loads(pickle.dumps(s))
+    # existing batches are copied, and new ones can still be created
+    assert unpickled[0].randint(1000) == s[0].randint(1000)
+    new_batch = unpickled[2].randint(1000)
+    if seed is not None:
+        assert new_batch == s[2].randint(1000)
@@ -349,3 +349,20 @@ def weighted_hin():
     )
 
     return StellarGraph(nodes={"A": a, "B": b}, edges={"R": r, "S": s, "T": t, "U": u})
+
+
+def example_graph_local(feature_size, n_nodes, degree=10, seed=0):
+    # nodes are connected to nearby nodes on a ring, but stored in a random order, so that the
+    # input order has poor locality
+    rs = np.random.RandomState(seed)
+    ring_sources = np.arange(n_nodes).repeat(degree // 2)
+    ring_targets = (
+        ring_sources + rs.randint(1, degree, size=len(ring_sources))
+    ) % n_nodes
+    position = rs.permutation(n_nodes)
+    return StellarGraph.from_arrays(
+        np.arange(n_nodes),
+        rs.rand(n_nodes, feature_size),
+        sources=position[ring_sources],
+        targets=position[ring_targets],
+    )